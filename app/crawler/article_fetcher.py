@@ -0,0 +1,188 @@
+# app/crawler/article_fetcher.py
+
+import codecs
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.crawler.http_client import http_client, read_limited
+from app.crawler.politeness import politeness
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import counter, histogram, dropped
+
+# 워커가 기사 원본 HTML을 받을지 여부 (false면 제목 / 요약만 저장)
+FETCH_ARTICLE_HTML = os.getenv("FETCH_ARTICLE_HTML", "true").lower() == "true"
+
+# 기사 1건에서 받을 최대 크기 (압축 해제 후 bytes, 넘으면 여기까지만 저장)
+MAX_ARTICLE_BYTES = int(os.getenv("MAX_ARTICLE_BYTES", 2 * 1024 * 1024))
+
+# 기사 1건 전체 다운로드 제한 시간 (초, 조금씩 보내는 서버 대비)
+ARTICLE_DEADLINE = 15
+
+# 도메인 요청 간격 때문에 워커가 기다릴 최대 시간 (초, 넘으면 본문 없이 저장)
+MAX_ARTICLE_WAIT = 5
+
+# HTML로 취급하는 Content-Type (없으면 HTML로 간주)
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# <meta charset>을 찾을 앞부분 크기
+META_SNIFF_BYTES = 4096
+FALLBACK_CHARSET = "utf-8"
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# requests가 설치한 charset_normalizer가 있으면 마지막 단계 추정에 사용
+try:
+    from charset_normalizer import from_bytes as _detect_charset
+except ImportError:
+    _detect_charset = None
+
+log = get_logger("article_fetcher")
+
+article_fetch_seconds = histogram("crawler_article_fetch_seconds", "기사 원본 다운로드 시간 (초)")
+article_downloads = counter(
+    "crawler_article_downloads_total",
+    "기사 원본 다운로드 결과 (result: ok / truncated / not_html / failed / skipped / reused)",
+    ("result",),
+)
+
+
+@dataclass
+class ArticleDownload:
+    url: str
+    html: str
+    charset: str  # 감지한 원본 문자셋
+    content_type: str
+    size: int  # 받은 bytes (압축 해제 후)
+    truncated: bool  # MAX_ARTICLE_BYTES에서 잘림
+
+
+def _lookup(charset: Optional[str]) -> Optional[str]:
+    """파이썬 코덱 이름 (모르는 문자셋이면 None)"""
+    if not charset:
+        return None
+    try:
+        return codecs.lookup(charset.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+def header_charset(content_type: str) -> Optional[str]:
+    """Content-Type 헤더의 charset 파라미터"""
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset":
+            return _lookup(value)
+    return None
+
+
+def detect_charset(content: bytes, content_type: str = "") -> str:
+    """
+    문자셋 감지: Content-Type charset → BOM → <meta charset> → UTF-8 디코딩 가능 여부 → charset_normalizer → FALLBACK_CHARSET
+    """
+    charset = header_charset(content_type)
+    if charset:
+        return charset
+
+    for bom, name in _BOMS:
+        if content.startswith(bom):
+            return name
+
+    match = _META_CHARSET.search(content[:META_SNIFF_BYTES])
+    charset = _lookup(match.group(1).decode("ascii", "ignore")) if match else None
+    if charset:
+        return charset
+
+    try:
+        content.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # 최대 크기에서 잘리면서 마지막 멀티바이트 문자만 깨진 경우
+        if e.start >= len(content) - 3:
+            return "utf-8"
+
+    if _detect_charset is not None:
+        best = _detect_charset(content[:64 * 1024]).best()
+        if best is not None and _lookup(best.encoding):
+            return _lookup(best.encoding)
+    return FALLBACK_CHARSET
+
+
+def is_html(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return not media_type or media_type in HTML_CONTENT_TYPES
+
+
+def fetch_article(url: str, max_bytes: int = MAX_ARTICLE_BYTES) -> Optional[ArticleDownload]:
+    """
+    기사 원본 HTML 스트리밍 다운로드
+    - robots.txt 금지 / 도메인 대기가 MAX_ARTICLE_WAIT보다 길면 요청하지 않음
+    - 도메인 토큰을 실제로 받을 때까지 ready_in() 반복 (대기 후에도 토큰 없이 요청하지 않음)
+    - HTML이 아닌 Content-Type이면 본문을 받기 전에 연결 종료
+    - max_bytes까지만 받고 나머지는 버림 (truncated=True)
+    - 응답 상태는 도메인 정책에 반영 (429 / 503 → backoff)
+
+    :return: ArticleDownload / 받지 못하면 None
+    """
+    if not politeness.allowed(url):
+        article_downloads.inc(result="skipped")
+        dropped.inc(reason="robots_disallowed")
+        return None
+    waited = 0.0
+    delay = politeness.ready_in(url)
+    while delay:
+        if waited + delay > MAX_ARTICLE_WAIT:
+            article_downloads.inc(result="skipped")
+            dropped.inc(reason="domain_backoff")
+            log.debug("[🐢 본문 건너뜀] {url} - 도메인 대기 {delay:.0f}초", url=url, delay=waited + delay)
+            return None
+        time.sleep(delay)
+        waited += delay
+        delay = politeness.ready_in(url)
+
+    started = time.perf_counter()
+    try:
+        with http_client.session.get(url, stream=True, timeout=http_client.timeout) as response:
+            politeness.record(url, response.status_code, response.headers)
+            if response.status_code != 200:
+                article_downloads.inc(result="failed")
+                dropped.inc(reason="article_fetch_failed")
+                log.warning("❌ 기사 다운로드 실패: {url} - 상태코드 {status}", url=url, status=response.status_code)
+                return None
+
+            content_type = response.headers.get("Content-Type", "")
+            if not is_html(content_type):
+                article_downloads.inc(result="not_html")
+                dropped.inc(reason="article_not_html")
+                log.debug("[⏭️ HTML 아님] {url} - {content_type}", url=url, content_type=content_type)
+                return None
+
+            # iter_content는 gzip / br을 풀어서 주므로 압축 해제 후 크기 기준으로 제한
+            content, truncated = read_limited(response, max_bytes, started + ARTICLE_DEADLINE)
+    except Exception as e:
+        article_downloads.inc(result="failed")
+        dropped.inc(reason="article_fetch_failed")
+        log.warning("❌ 기사 다운로드 예외: {url} - {error}", url=url, error=e)
+        return None
+    finally:
+        article_fetch_seconds.observe(time.perf_counter() - started)
+
+    charset = detect_charset(content, content_type)
+    article_downloads.inc(result="truncated" if truncated else "ok")
+    if truncated:
+        log.debug("[✂️ 최대 크기 도달] {url} - {size} bytes까지만 저장", url=url, size=len(content))
+    return ArticleDownload(
+        url=url,
+        html=content.decode(charset, errors="replace"),
+        charset=charset,
+        content_type=content_type,
+        size=len(content),
+        truncated=truncated,
+    )
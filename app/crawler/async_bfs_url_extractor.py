@@ -0,0 +1,178 @@
+# app/crawler/async_bfs_url_extractor.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from app.crawler.bfs_url_extractor import (
+    MAX_DEPTH,
+    MAX_URLS_PER_SYMBOL,
+    fetch_page,
+    get_initial_links_from_rss,
+    load_existing_urls,
+)
+from app.crawler.page_store import page_store
+from app.crawler.parse_pool import parse_pool
+from app.crawler.politeness import politeness, MAX_DEFER_SECONDS
+from app.crawler.rss_feed_state import feed_state_store
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import dedup_checks, dropped
+
+log = get_logger("bfs")
+
+# 전체 동시 요청 수 (= 페이지 수집 스레드 수)
+# 도메인별 요청 속도는 politeness 정책이 제한하므로 전체 동시 요청 수를 늘려도 됨
+MAX_CONCURRENT_FETCHES = 20
+
+# 동일 호스트에 대한 동시 요청 수
+MAX_FETCHES_PER_HOST = 2
+
+
+class HostLimiter:
+    """
+    호스트별 동시 요청 제한
+    - 호스트(netloc)마다 asyncio.Semaphore를 하나씩 생성해서 사용
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def get(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+
+def _fetch_page(symbol: str, url: str, follow_links: bool):
+    """
+    페이지 요청 + 제목/요약/링크 추출 (스레드 풀에서 실행)
+    - 파싱은 parse_pool에 원본 bytes를 넘겨서 처리 (process 모드면 별도 프로세스)
+
+    :return: (url, data, links, response) / 요청 실패 시 data = None
+        (response는 결과에 추가된 페이지만 page_store에 보관하기 위해 반환)
+    """
+    response = fetch_page(url)
+    if not response or not response.content:
+        return url, None, set(), None
+
+    try:
+        page = parse_pool.parse(response.content, url, follow_links=follow_links, encoding=response.encoding)
+    except Exception as e:
+        dropped.inc(reason="parse_failed")
+        log.warning("[⚠️ 요약 추출 실패] {url} - {error}", url=url, error=e)
+        return url, None, set(), None
+
+    return url, page.to_dict(symbol, url), page.links, response
+
+
+async def bfs_extract_urls_async(
+    symbol: str,
+    max_concurrency: int = MAX_CONCURRENT_FETCHES,
+    per_host_limit: int = MAX_FETCHES_PER_HOST,
+) -> list[dict]:
+    """
+    깊이(level) 단위 동시 BFS
+    - 같은 깊이의 URL들을 동시에 요청 (전체 / 호스트별 동시 요청 수 제한)
+    - MAX_DEPTH, MAX_URLS_PER_SYMBOL 규칙은 순차 BFS와 동일
+    - 수집 개수를 채우면 진행 중인 요청은 즉시 취소
+
+    :param max_concurrency: 전체 동시 요청 수
+    :param per_host_limit: 호스트별 동시 요청 수
+    """
+    log.debug("[🔍 START] {symbol} 비동기 BFS URL 탐색 시작", symbol=symbol)
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"bfs-{symbol}")
+    global_limit = asyncio.Semaphore(max_concurrency)
+    host_limiter = HostLimiter(per_host_limit)
+
+    async def visit(url: str, depth: int):
+        # 도메인 요청 간격이 안 됐으면 이 URL만 미룸 (슬롯을 잡지 않으므로 다른 도메인 요청은 계속 진행)
+        delay = politeness.ready_in(url)
+        while delay:
+            if delay > MAX_DEFER_SECONDS:
+                dropped.inc(reason="domain_backoff")
+                log.warning("[🐢 건너뜀] {url} - 도메인 대기 {delay:.0f}초", url=url, delay=delay)
+                return None
+            await asyncio.sleep(delay)
+            delay = politeness.ready_in(url)
+
+        # 호스트 슬롯을 먼저 잡아야 느린 호스트 대기 중에 전체 슬롯을 점유하지 않음
+        async with host_limiter.get(url):
+            async with global_limit:
+                log.debug("[🌐 요청] 깊이 {depth} → {url}", depth=depth, url=url)
+                return await loop.run_in_executor(
+                    executor, _fetch_page, symbol, url, depth < MAX_DEPTH
+                )
+
+    visited = set()
+    processed = set()
+    results = []
+    rss_links = []
+
+    try:
+        # ✅ 초기 프론티어는 RSS에서 추출된 새 URL들 (없으면 DB 조회 / 기사 요청 없이 종료)
+        rss_links = await loop.run_in_executor(executor, get_initial_links_from_rss, symbol)
+        if not rss_links:
+            log.debug("[⏭️ 건너뜀] {symbol} 새 RSS 항목 없음", symbol=symbol)
+            return results
+
+        existing_urls = await loop.run_in_executor(executor, load_existing_urls, symbol)
+        frontier = rss_links
+        depth = 0
+
+        while frontier and depth <= MAX_DEPTH and len(results) < MAX_URLS_PER_SYMBOL:
+            tasks = []
+            for url in frontier:
+                if url in visited:
+                    continue
+                visited.add(url)
+                tasks.append(asyncio.ensure_future(visit(url, depth)))
+
+            next_frontier = []
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    result = await next_done
+                    if result is None:
+                        continue  # 도메인 대기로 건너뜀 (RSS 링크면 다음 폴링에서 다시 시도)
+                    url, data, links, response = result
+                    processed.add(url)
+
+                    if data and url in existing_urls:
+                        dedup_checks.inc(stage="bfs_url", result="hit")
+                    elif data:
+                        dedup_checks.inc(stage="bfs_url", result="miss")
+                        results.append(data)
+                        # 워커가 기사 원본을 다시 받지 않도록 보관 (압축은 스레드 풀에서)
+                        await loop.run_in_executor(executor, page_store.put, url, response.content,
+                                                   response.headers.get("Content-Type", ""), response.truncated)
+                        log.debug("[✅ 수집됨] {title} - {url}", title=data["title"], url=url)
+                        if len(results) >= MAX_URLS_PER_SYMBOL:
+                            break
+
+                    if links:
+                        log.debug("[🔗 추출된 링크 수] {count}", count=len(links))
+                    for link in links:
+                        if "news" in link and link not in visited and link not in existing_urls:
+                            next_frontier.append(link)
+            finally:
+                # 수집 완료 또는 예외 → 남은 요청 취소
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            frontier = list(dict.fromkeys(next_frontier))
+            depth += 1
+    finally:
+        # 이미 실행 중인 요청은 결과를 버리고 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        # 요청을 끝내지 못한 새 RSS 링크는 다음 폴링의 시작점으로 보관
+        feed_state_store.requeue(symbol, [url for url in rss_links if url not in processed])
+
+    log.info("[🏁 완료] {symbol} → 최종 URL 수: {count}", symbol=symbol, count=len(results))
+    return results
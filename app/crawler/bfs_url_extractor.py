@@ -1,22 +1,83 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import deque
 from bs4 import BeautifulSoup
-import requests
 from urllib.parse import urljoin, urlparse
 import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
 from app.repository.content_url_repository import ContentUrlRepository
+from app.crawler.article_fetcher import ARTICLE_DEADLINE, MAX_ARTICLE_BYTES, is_html
+from app.crawler.http_client import http_client
+from app.crawler.page_store import page_store
+from app.crawler.parse_pool import parse_pool
+from app.crawler.politeness import politeness, MAX_DEFER_SECONDS
+from app.crawler.dedup_index import dedup_index
+from app.crawler.rss_feed_state import RssItem, feed_state_store
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import histogram, dedup_checks, dropped
+
+log = get_logger("bfs")
+
+rss_fetch_seconds = histogram("crawler_rss_fetch_seconds", "RSS 요청 시간 (초)")
+page_fetch_seconds = histogram("crawler_page_fetch_seconds", "기사 / 링크 페이지 요청 시간 (초)")
+bfs_symbol_seconds = histogram("crawler_bfs_symbol_seconds", "심볼 하나의 BFS URL 수집 시간 (초)", ("mode",))
 
 MAX_DEPTH = 2
 MAX_URLS_PER_SYMBOL = 3
 
+# 심볼별 RSS 검색 URL ({symbol} 치환, 로컬 벤치마크는 benchmarks.news_stub_server 주소로 변경)
+RSS_URL_TEMPLATE = os.getenv("RSS_URL_TEMPLATE", "https://news.google.com/rss/search?q={symbol}")
+
+# BFS 실행 모드
+# - "async": 깊이(level) 단위로 페이지를 동시에 요청 (app.crawler.async_bfs_url_extractor)
+# - "sync": 기존 순차 요청 방식
+BFS_MODE = "async"
+
 def fetch_html(url):
     try:
-        response = requests.get(url, timeout=5, headers={"User-Agent": "Mozilla/5.0"})
-        if response.status_code == 200:
+        with page_fetch_seconds.time():
+            response = http_client.get(url)
+        if response.ok:
             return response.text
         else:
-            print(f"❌ 실패: {url} - 상태코드 {response.status_code}")
+            log.warning("❌ 실패: {url} - 상태코드 {status}", url=url, status=response.status_code)
             return None
     except Exception as e:
-        print(f"❌ 예외: {url} - {e}")
+        log.warning("❌ 예외: {url} - {error}", url=url, error=e)
+        return None
+
+def fetch_page(url):
+    """
+    페이지 요청 (파싱 단계에 원본 bytes를 넘기기 위해 응답 객체 그대로 반환)
+
+    - robots.txt에서 금지한 URL은 요청하지 않음
+    - 응답 상태는 도메인 정책에 반영 (429 / 503 → backoff)
+    - 기사 원본과 같은 제한: 스트리밍으로 MAX_ARTICLE_BYTES까지만 읽고, HTML이 아니면 본문을 받기 전에 종료
+
+    :return: HttpResponse / 실패 시 None
+    """
+    try:
+        if not politeness.allowed(url):
+            dropped.inc(reason="robots_disallowed")
+            return None
+        with page_fetch_seconds.time():
+            response = http_client.get(url, max_bytes=MAX_ARTICLE_BYTES, accept=is_html, deadline=ARTICLE_DEADLINE)
+        politeness.record(url, response.status_code, response.headers)
+        if response.skipped:
+            dropped.inc(reason="page_not_html")
+            log.debug("[⏭️ HTML 아님] {url} - {content_type}", url=url, content_type=response.headers.get("Content-Type", ""))
+            return None
+        if response.ok:
+            return response
+        dropped.inc(reason="fetch_failed")
+        log.warning("❌ 실패: {url} - 상태코드 {status}", url=url, status=response.status_code)
+        return None
+    except Exception as e:
+        dropped.inc(reason="fetch_failed")
+        log.warning("❌ 예외: {url} - {error}", url=url, error=e)
         return None
 
 def extract_links(html, base_url):
@@ -42,72 +103,177 @@ def extract_title_summary(symbol, html, url):
         "url": url
     }
 
-def get_initial_links_from_rss(symbol: str) -> list[str]:
+def _parse_pub_date(value):
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+def parse_rss_items(content: bytes) -> list[RssItem]:
+    """
+    RSS 본문에서 link / guid / pubDate 추출
+    """
+    root = ET.fromstring(content)
+    channel = root.find("channel")
+    items = []
+    for item in channel.findall("item"):
+        link = item.findtext("link")
+        if not link:
+            continue
+        items.append(RssItem(
+            link=link,
+            guid=item.findtext("guid") or link,
+            published_at=_parse_pub_date(item.findtext("pubDate")),
+        ))
+    return items
+
+def get_initial_links_from_rss(symbol: str, incremental: bool = True) -> list[str]:
     """
     RSS에서 뉴스 URL만 추출하여 초기 큐로 사용
+
+    :param incremental: True면 심볼별 워터마크 이후의 새 항목만 반환
+                        (304 / 새 항목 없음 → 이전에 방문하지 못한 링크만 반환)
     """
-    rss_url = f"https://news.google.com/rss/search?q={symbol}"
-    headers = {
-        "User-Agent": "Mozilla/5.0"
-    }
+    rss_url = RSS_URL_TEMPLATE.format(symbol=symbol)
 
     try:
-        response = requests.get(rss_url, headers=headers)
-        response.raise_for_status()
-        root = ET.fromstring(response.content)
-        channel = root.find("channel")
-        items = channel.findall("item")
-        return [item.find("link").text for item in items]
+        if not incremental:
+            with rss_fetch_seconds.time():
+                response = http_client.get(rss_url)
+            if not response.ok:
+                log.warning("[❌ RSS 요청 실패] {symbol} - 상태코드 {status}", symbol=symbol, status=response.status_code)
+                return []
+            return [item.link for item in parse_rss_items(response.content)]
+
+        headers = feed_state_store.conditional_headers(symbol)
+        with rss_fetch_seconds.time():
+            response = http_client.get(rss_url, headers=headers, conditional=False)
+        if response.status_code == 304:
+            log.debug("[📭 RSS 변경 없음] {symbol}", symbol=symbol)
+            return feed_state_store.take_pending(symbol)
+        if not response.ok:
+            log.warning("[❌ RSS 요청 실패] {symbol} - 상태코드 {status}", symbol=symbol, status=response.status_code)
+            return []
+
+        links = feed_state_store.select_new_items(
+            symbol,
+            parse_rss_items(response.content),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        log.debug("[📰 RSS 새 항목] {symbol} → {count}개", symbol=symbol, count=len(links))
+        return links
     except Exception as e:
-        print(f"[❌ RSS 파싱 실패] {e}")
+        log.warning("[❌ RSS 파싱 실패] {symbol} - {error}", symbol=symbol, error=e)
         return []
 
-def bfs_extract_urls(symbol: str) -> list[dict]:
-    print(f"[🔍 START] {symbol} BFS URL 탐색 시작")
-
-    visited = set()
-    results = []
+def load_existing_urls(symbol: str):
+    """
+    이미 저장된 URL 집합 (`url in existing_urls` 형태로 사용)
+    - 중복 인덱스가 로드돼 있으면 DB 조회 없이 인덱스 반환
+    - 아니면 심볼에 대해 저장된 URL 목록 조회 (실패 시 빈 집합)
+    """
+    if dedup_index.ready:
+        return dedup_index.urls
 
     try:
         existing_urls = ContentUrlRepository.get_existing_urls_for_symbol(symbol)
-        print(f"[🧾 DB 조회] {symbol} 기존 URL 수: {len(existing_urls)}")
+        log.debug("[🧾 DB 조회] {symbol} 기존 URL 수: {count}", symbol=symbol, count=len(existing_urls))
+        return existing_urls
     except Exception as e:
-        print(f"[❌ DB 에러] {symbol} - {e}")
-        existing_urls = set()
+        log.error("[❌ DB 에러] {symbol} - {error}", symbol=symbol, error=e)
+        return set()
+
+def bfs_extract_urls(symbol: str, mode: str | None = None) -> list[dict]:
+    """
+    심볼 관련 뉴스 URL을 BFS로 수집
+
+    :param mode: "async" 또는 "sync" (기본값: BFS_MODE)
+    """
+    mode = mode or BFS_MODE
+    with bfs_symbol_seconds.time(mode=mode):
+        if mode == "async":
+            from app.crawler.async_bfs_url_extractor import bfs_extract_urls_async
+            return asyncio.run(bfs_extract_urls_async(symbol))
+        return _bfs_extract_urls_sync(symbol)
+
+def _bfs_extract_urls_sync(symbol: str) -> list[dict]:
+    log.debug("[🔍 START] {symbol} BFS URL 탐색 시작", symbol=symbol)
+
+    visited = set()
+    results = []
 
-    # ✅ 초기 큐는 RSS에서 추출된 URL들
+    # ✅ 초기 큐는 RSS에서 추출된 새 URL들 (없으면 DB 조회 / 기사 요청 없이 종료)
     rss_links = get_initial_links_from_rss(symbol)
-    queue = [(url, 0) for url in rss_links]
+    if not rss_links:
+        log.debug("[⏭️ 건너뜀] {symbol} 새 RSS 항목 없음", symbol=symbol)
+        return results
+
+    existing_urls = load_existing_urls(symbol)
+    queue = deque((url, 0) for url in rss_links)
+    # 도메인 요청 간격 때문에 미룬 URL (요청 가능 시각, 순번, url, 깊이)
+    deferred = []
+    sequence = itertools.count()
+
+    while (queue or deferred) and len(results) < MAX_URLS_PER_SYMBOL:
+        if queue:
+            url, depth = queue.popleft()
+        else:
+            # 다른 도메인 URL이 없을 때만 가장 먼저 가능한 URL까지 대기
+            ready_at, _, url, depth = heapq.heappop(deferred)
+            time.sleep(max(ready_at - time.monotonic(), 0))
 
-    while queue and len(results) < MAX_URLS_PER_SYMBOL:
-        url, depth = queue.pop(0)
         if url in visited or depth > MAX_DEPTH:
             continue
+
+        delay = politeness.ready_in(url)
+        if delay > MAX_DEFER_SECONDS:
+            dropped.inc(reason="domain_backoff")
+            log.warning("[🐢 건너뜀] {url} - 도메인 대기 {delay:.0f}초", url=url, delay=delay)
+            continue
+        if delay:
+            heapq.heappush(deferred, (time.monotonic() + delay, next(sequence), url, depth))
+            continue
         visited.add(url)
 
-        print(f"[🌐 요청] 깊이 {depth} → {url}")
-        html = fetch_html(url)
-        if not html:
+        log.debug("[🌐 요청] 깊이 {depth} → {url}", depth=depth, url=url)
+        response = fetch_page(url)
+        if not response or not response.content:
             continue
 
+        # 제목 / 요약 / 링크를 한 번에 추출 (마지막 깊이는 <head>만 파싱)
         try:
-            data = extract_title_summary(symbol, html, url)
-            if url not in existing_urls:
-                results.append(data)
-                print(f"[✅ 수집됨] {data['title']} - {url}")
-                if len(results) >= MAX_URLS_PER_SYMBOL:
-                    break
+            page = parse_pool.parse(
+                response.content, url, follow_links=depth < MAX_DEPTH, encoding=response.encoding
+            )
         except Exception as e:
-            print(f"[⚠️ 요약 추출 실패] {url} - {e}")
+            dropped.inc(reason="parse_failed")
+            log.warning("[⚠️ 요약 추출 실패] {url} - {error}", url=url, error=e)
+            continue
+
+        if url in existing_urls:
+            dedup_checks.inc(stage="bfs_url", result="hit")
+        else:
+            dedup_checks.inc(stage="bfs_url", result="miss")
+            data = page.to_dict(symbol, url)
+            results.append(data)
+            # 워커가 기사 원본을 다시 받지 않도록 보관
+            page_store.put(url, response.content, response.headers.get("Content-Type", ""), response.truncated)
+            log.debug("[✅ 수집됨] {title} - {url}", title=data["title"], url=url)
+            if len(results) >= MAX_URLS_PER_SYMBOL:
+                break
 
         # 링크 추출 (BFS 탐색 확장)
-        links = extract_links(html, url)
-        print(f"[🔗 추출된 링크 수] {len(links)}")
+        links = page.links
+        log.debug("[🔗 추출된 링크 수] {count}", count=len(links))
         for link in links:
             if "news" in link and link not in visited and link not in existing_urls:
                 queue.append((link, depth + 1))
 
-    print(f"[🏁 완료] {symbol} → 최종 URL 수: {len(results)}")
+    # 방문하지 못한 새 RSS 링크는 다음 폴링의 시작점으로 보관
+    feed_state_store.requeue(symbol, [url for url in rss_links if url not in visited])
+
+    log.info("[🏁 완료] {symbol} → 최종 URL 수: {count}", symbol=symbol, count=len(results))
     return results
 
 
@@ -0,0 +1,325 @@
+# app/crawler/content_writer.py
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime
+from queue import Queue, Empty, Full
+from typing import Optional
+
+from sqlalchemy import insert, select
+
+from app.models.content import Content
+from app.models.content_body import ContentBody
+from app.models.content_url import ContentUrl
+from app.crawler.deduplicator import get_url_hash
+from app.crawler.html_storage import ArticleBody, HTML_STORAGE, pack_html
+from app.queue.backpressure import stall_meter
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import counter, histogram, dedup_checks, dropped
+
+# 한 번에 INSERT할 최대 레코드 수
+BATCH_SIZE = 50
+
+# 배치가 덜 찼어도 이 시간(초)이 지나면 저장
+FLUSH_INTERVAL = 0.5
+
+# 저장 대기 레코드 최대 수 (가득 차면 submit이 대기)
+MAX_PENDING = 5000
+
+# 커밋 지연 시간 이동 평균 가중치
+COMMIT_LATENCY_ALPHA = 0.2
+
+# 레코드별 저장 결과
+SAVED = "saved"
+DUPLICATE = "duplicate"
+FAILED = "failed"
+
+log = get_logger("writer")
+
+db_commit_seconds = histogram("crawler_db_commit_seconds", "배치 저장 1회 (INSERT + 커밋) 시간 (초)")
+html_bytes = counter("crawler_html_bytes_total", "저장한 기사 HTML 크기 (kind: raw = 압축 전 / stored = 저장)", ("kind",))
+
+
+@dataclass
+class ContentRecord:
+    symbol: str
+    url: str
+    title: str
+    summary: str
+    html: str
+    source: str
+    content_hash: str
+    body: Optional[ArticleBody] = None  # 미리 압축한 HTML (split 저장, 없으면 저장 스레드가 html을 압축)
+
+
+class BatchedContentWriter(threading.Thread):
+    """
+    배치 저장 스레드 (write-behind)
+    - 워커는 submit()으로 레코드를 넘기고 Future로 결과(SAVED / DUPLICATE / FAILED)를 받음
+    - BATCH_SIZE개가 모이거나 FLUSH_INTERVAL이 지나면 다중 행 INSERT + 커밋 1회
+    - content_hash 중복은 사전 SELECT 없이 INSERT IGNORE로 처리
+    - 원본 HTML은 html_storage="split"이면 content_bodies에 압축 저장, "inline"이면 contents.html에 저장
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_pending: int = MAX_PENDING,
+        html_storage: str = HTML_STORAGE,
+    ):
+        super().__init__(daemon=True, name="content-writer")
+        if html_storage not in ("split", "inline"):
+            raise ValueError(f"지원하지 않는 HTML 저장 방식: {html_storage}")
+        self.session_factory = session_factory
+        self.html_storage = html_storage
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending: Queue = Queue(maxsize=max_pending)
+        self.running = True
+        self.listeners = []
+        self.commit_latency_ewma = 0.0  # 배치 저장 1회 소요 시간 (초)
+        self.stall = stall_meter("writer.pending")
+        self._start_lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """
+        커밋 후 호출할 콜백 등록
+
+        :param callback: callback(saved_records: list[ContentRecord])
+        """
+        self.listeners.append(callback)
+
+    def submit(self, record: ContentRecord) -> Future:
+        """
+        저장할 레코드 등록 (스레드는 첫 호출 시 시작)
+
+        :return: 저장 결과가 담길 Future
+        """
+        self._ensure_started()
+        future = Future()
+        try:
+            self.pending.put_nowait((record, future))
+        except Full:
+            # 저장 대기열이 가득 참 → 워커가 대기 (정체 시간 기록)
+            with self.stall.measure():
+                self.pending.put((record, future))
+        return future
+
+    def stop(self):
+        """남은 레코드를 모두 저장한 뒤 종료"""
+        self.running = False
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        log.info("🗄️ [ContentWriter] 배치 저장 스레드 시작됨.")
+        while self.running or not self.pending.empty():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # 결과를 받지 못한 레코드는 실패 처리 (스레드는 계속 실행, Future가 영원히 대기하지 않도록)
+                log.error("❌ 배치 저장 스레드 예외: {total}건 → {error}", total=len(batch), error=e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(FAILED)
+
+    def _ensure_started(self):
+        if self.is_alive():
+            return
+        with self._start_lock:
+            if not self.is_alive() and self.ident is None:
+                self.start()
+
+    def _collect_batch(self) -> list:
+        """BATCH_SIZE개가 모이거나 FLUSH_INTERVAL이 지날 때까지 레코드 수집"""
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = self.flush_interval if deadline is None else deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self.pending.get(timeout=timeout)
+            except Empty:
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch
+
+    def _flush(self, batch: list):
+        """
+        배치 저장
+        1) 배치 내부 중복(content_hash, url) 제거
+        2) contents 다중 행 INSERT IGNORE
+        3) 실제로 들어간 행에 대해서만 content_urls (split 저장이면 content_bodies도) 다중 행 INSERT
+        4) 커밋 1회 후 레코드별 결과 전달
+        """
+        outcomes: dict[int, str] = {}
+        candidates = []
+        seen_hashes = set()
+        seen_urls = set()
+        for index, (record, _) in enumerate(batch):
+            if record.content_hash in seen_hashes or record.url in seen_urls:
+                outcomes[index] = DUPLICATE
+                continue
+            seen_hashes.add(record.content_hash)
+            seen_urls.add(record.url)
+            candidates.append(index)
+
+        session = None
+        started = time.monotonic()
+        try:
+            session = self.session_factory()
+            inserted = self._insert_contents(session, [batch[i][0] for i in candidates])
+
+            saved_records = []
+            raw_size = stored_size = 0
+            for index in candidates:
+                record = batch[index][0]
+                if record.content_hash in inserted:
+                    outcomes[index] = SAVED
+                    saved_records.append(record)
+                else:
+                    outcomes[index] = DUPLICATE
+
+            if saved_records:
+                session.execute(insert(ContentUrl).values([
+                    {"url": record.url, "url_hash": get_url_hash(record.url), "symbol": record.symbol, "source": "google"}
+                    for record in saved_records
+                ]))
+                if self.html_storage == "split":
+                    raw_size, stored_size = self._insert_bodies(session, saved_records)
+                else:
+                    raw_size = stored_size = sum(len(record.html.encode("utf-8")) for record in saved_records)
+
+            session.commit()
+            html_bytes.inc(raw_size, kind="raw")
+            html_bytes.inc(stored_size, kind="stored")
+            elapsed = time.monotonic() - started
+            db_commit_seconds.observe(elapsed)
+            self.commit_latency_ewma = (
+                COMMIT_LATENCY_ALPHA * elapsed + (1 - COMMIT_LATENCY_ALPHA) * self.commit_latency_ewma
+            )
+            log.debug(
+                "[🗄️ 배치 저장] {saved}/{total}건 저장 ({elapsed_ms:.0f}ms)",
+                saved=len(saved_records), total=len(batch), elapsed_ms=elapsed * 1000,
+            )
+        except Exception as e:
+            log.error("❌ 배치 저장 실패: {total}건 → {error}", total=len(batch), error=e)
+            outcomes = {index: FAILED for index in range(len(batch))}
+            saved_records = []
+            if session is not None:
+                try:
+                    session.rollback()
+                except Exception as rollback_error:
+                    log.error("❌ 롤백 실패: {error}", error=rollback_error)
+        finally:
+            if session is not None:
+                session.close()
+
+        if saved_records:
+            for listener in self.listeners:
+                try:
+                    listener(saved_records)
+                except Exception as e:
+                    log.error("[❌ 저장 후처리 실패] {error}", error=e)
+
+        outcome_counts = {SAVED: 0, DUPLICATE: 0, FAILED: 0}
+        for outcome in outcomes.values():
+            outcome_counts[outcome] += 1
+        dedup_checks.inc(outcome_counts[SAVED], stage="insert", result="miss")
+        dedup_checks.inc(outcome_counts[DUPLICATE], stage="insert", result="hit")
+        if outcome_counts[FAILED]:
+            dropped.inc(outcome_counts[FAILED], reason="write_failed")
+
+        for index, (_, future) in enumerate(batch):
+            future.set_result(outcomes[index])
+
+    def _insert_contents(self, session, records: list[ContentRecord]) -> set[str]:
+        """
+        contents 다중 행 INSERT IGNORE
+
+        - 행마다 배치 토큰(write_token)을 넣고, 일부만 무시되면 토큰이 같은 행만 이번 배치가 삽입한 행
+          (auto-increment 구간은 innodb_autoinc_lock_mode=2 / 동시 저장 / 무시된 행의 id 소모 때문에 믿을 수 없음)
+
+        :return: 이번 배치에서 실제로 삽입된 content_hash 집합
+        """
+        if not records:
+            return set()
+
+        crawled_at = datetime.utcnow()
+        token = uuid.uuid4().hex
+        stmt = (
+            insert(Content)
+            .values([
+                {
+                    "symbol": record.symbol,
+                    "title": record.title,
+                    "summary": record.summary,
+                    "url": record.url,
+                    "url_hash": get_url_hash(record.url),
+                    "html": record.html if self.html_storage == "inline" else "",
+                    "source": record.source,
+                    "content_hash": record.content_hash,
+                    "is_duplicate": False,
+                    "crawled_at": crawled_at,
+                    "write_token": token,
+                }
+                for record in records
+            ])
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+        )
+        result = session.execute(stmt)
+
+        hashes = [record.content_hash for record in records]
+        if result.rowcount == len(records):
+            return set(hashes)
+        if result.rowcount <= 0:
+            return set()
+
+        # 일부만 무시된 경우: 같은 트랜잭션에서 토큰으로 이번 배치의 행 조회 (content_hash UNIQUE 인덱스 사용)
+        return set(session.scalars(
+            select(Content.content_hash).where(Content.content_hash.in_(hashes), Content.write_token == token)
+        ).all())
+
+    def _insert_bodies(self, session, records: list[ContentRecord]) -> tuple[int, int]:
+        """
+        저장된 기사의 압축 HTML을 content_bodies에 다중 행 INSERT (본문이 없는 기사는 건너뜀)
+
+        :return: (압축 전 크기, 저장 크기) bytes 합계
+        """
+        bodies = {}
+        for record in records:
+            body = record.body
+            if body is None and record.html:
+                body = pack_html(record.html)
+            if body is not None:
+                bodies[record.content_hash] = body
+        if not bodies:
+            return 0, 0
+
+        ids = dict(session.execute(
+            select(Content.content_hash, Content.id).where(Content.content_hash.in_(list(bodies)))
+        ).all())
+        session.execute(insert(ContentBody).values([
+            {
+                "content_id": ids[content_hash],
+                "codec": body.codec,
+                "charset": body.charset,
+                "raw_size": body.raw_size,
+                "truncated": body.truncated,
+                "body": body.data,
+            }
+            for content_hash, body in bodies.items()
+        ]))
+        return sum(body.raw_size for body in bodies.values()), sum(len(body.data) for body in bodies.values())
@@ -0,0 +1,190 @@
+# app/crawler/dedup_index.py
+
+import hashlib
+import heapq
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from sqlalchemy import select
+
+from app.models.content import Content
+from app.models.content_url import ContentUrl
+from app.monitoring.logger import get_logger
+
+log = get_logger("dedup")
+
+# 시작 시 DB에서 한 번에 읽어 정렬하는 지문 수
+LOAD_CHUNK_SIZE = 100_000
+
+# 최근 추가분(set)이 이 개수를 넘으면 정렬 배열로 병합
+MERGE_THRESHOLD = 50_000
+
+# 블룸 필터 사용 여부 / 목표 오탐률
+USE_BLOOM_FILTER = False
+BLOOM_ERROR_RATE = 0.01
+
+
+def fingerprint(value: str) -> int:
+    """문자열 → 64비트 지문"""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class BloomFilter:
+    """
+    64비트 지문 기반 블룸 필터 (bytearray 비트맵, double hashing)
+    """
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.capacity = capacity
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, fp: int):
+        h1 = fp & 0xFFFFFFFF
+        h2 = (fp >> 32) | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, fp: int):
+        for pos in self._positions(fp):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, fp: int) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fp))
+
+
+class FingerprintSet:
+    """
+    64비트 지문 집합
+    - 정렬된 array('Q') (원소당 8 bytes) + 최근 추가분 set
+    - 조회: set 확인 후 이진 탐색
+    - 선택적으로 블룸 필터를 앞에 둬서 대부분의 미존재 조회를 바로 거름
+    """
+
+    def __init__(self, use_bloom: bool = USE_BLOOM_FILTER):
+        self.use_bloom = use_bloom
+        self._sorted = array("Q")
+        self._recent: set[int] = set()
+        self._bloom = BloomFilter(MERGE_THRESHOLD) if use_bloom else None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._recent)
+
+    def __contains__(self, value) -> bool:
+        fp = value if isinstance(value, int) else fingerprint(value)
+        if self._bloom is not None and fp not in self._bloom:
+            return False
+        if fp in self._recent:
+            return True
+        sorted_fps = self._sorted
+        index = bisect_left(sorted_fps, fp)
+        return index < len(sorted_fps) and sorted_fps[index] == fp
+
+    def add(self, value):
+        fp = value if isinstance(value, int) else fingerprint(value)
+        with self._lock:
+            self._recent.add(fp)
+            if self._bloom is not None:
+                self._bloom.add(fp)
+            if len(self._recent) >= MERGE_THRESHOLD:
+                self._merge_recent()
+
+    def bulk_load(self, fingerprints):
+        """
+        지문을 청크 단위로 정렬 후 병합 (정렬용 임시 리스트는 청크 크기로 제한)
+        """
+        chunks = []
+        chunk = []
+        for fp in fingerprints:
+            chunk.append(fp)
+            if len(chunk) >= LOAD_CHUNK_SIZE:
+                chunks.append(array("Q", sorted(chunk)))
+                chunk = []
+        if chunk:
+            chunks.append(array("Q", sorted(chunk)))
+
+        with self._lock:
+            chunks.append(self._sorted)
+            self._sorted = array("Q", heapq.merge(*chunks))
+            self._rebuild_bloom()
+
+    def _merge_recent(self):
+        self._sorted = array("Q", heapq.merge(self._sorted, sorted(self._recent)))
+        self._recent = set()
+        if self._bloom is not None and len(self) > self._bloom.capacity:
+            self._rebuild_bloom()
+
+    def _rebuild_bloom(self):
+        if not self.use_bloom:
+            return
+        # 앞으로 추가될 여유분까지 포함해서 크기 산정
+        bloom = BloomFilter(len(self) + MERGE_THRESHOLD * 2)
+        for fp in self._sorted:
+            bloom.add(fp)
+        for fp in self._recent:
+            bloom.add(fp)
+        self._bloom = bloom
+
+
+class DedupIndex:
+    """
+    프로세스 전체 중복 판별 인덱스
+    - 시작 시 content_urls / contents에서 URL, content_hash 지문을 한 번 로드
+    - 저장 성공 시 add_records()로 갱신
+    - 인덱스에 없으면 확실히 새 URL / 해시, 있다고 나오면 DB로 확인
+    """
+
+    def __init__(self, use_bloom: bool = USE_BLOOM_FILTER):
+        self.urls = FingerprintSet(use_bloom)
+        self.hashes = FingerprintSet(use_bloom)
+        self.ready = False
+
+    def load(self, session_factory):
+        """content_urls / contents 전체 지문 로드"""
+        started = time.monotonic()
+        session = session_factory()
+        try:
+            self.urls.bulk_load(
+                fingerprint(url) for url in
+                session.execute(select(ContentUrl.url).execution_options(yield_per=LOAD_CHUNK_SIZE)).scalars()
+            )
+            self.urls.bulk_load(
+                fingerprint(url) for url in
+                session.execute(select(Content.url).execution_options(yield_per=LOAD_CHUNK_SIZE)).scalars()
+            )
+            self.hashes.bulk_load(
+                fingerprint(content_hash) for content_hash in
+                session.execute(select(Content.content_hash).execution_options(yield_per=LOAD_CHUNK_SIZE)).scalars()
+            )
+            self.ready = True
+            elapsed = time.monotonic() - started
+            log.info(
+                "[🧠 중복 인덱스] URL {urls}개, 해시 {hashes}개 로드 ({elapsed:.1f}s)",
+                urls=len(self.urls), hashes=len(self.hashes), elapsed=elapsed,
+            )
+        except Exception as e:
+            log.error("[❌ 중복 인덱스 로드 실패] {error}", error=e)
+        finally:
+            session.close()
+
+    def might_contain_url(self, url: str) -> bool:
+        return url in self.urls
+
+    def might_contain_hash(self, content_hash: str) -> bool:
+        return content_hash in self.hashes
+
+    def add_records(self, records):
+        """저장 완료된 레코드(url, content_hash 속성) 반영"""
+        for record in records:
+            self.urls.add(record.url)
+            self.hashes.add(record.content_hash)
+
+
+# ✅ 프로세스 전체에서 공유하는 중복 인덱스
+dedup_index = DedupIndex()
@@ -5,6 +5,7 @@ from urllib.parse import urlparse
 from sqlalchemy import select
 from app.models.content import Content
 from app.models.content_url import ContentUrl
+from app.crawler.dedup_index import dedup_index
 
 # ✅ 미래에 사용할 수 있는 허용 도메인 목록 (현재는 무시)
 ALLOWED_DOMAINS = [
@@ -43,22 +44,36 @@ def get_content_hash(content: str) -> str:
     """
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
+def get_url_hash(url: str) -> str:
+    """
+    URL을 SHA-256 해시로 변환 (contents.url_hash / content_urls.url_hash)
+    """
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
 def is_duplicate_hash(session, content_hash: str) -> bool:
     """
     동일한 콘텐츠 해시가 DB에 존재하는지 확인
+    - 중복 인덱스가 로드돼 있으면 인덱스에 있을 때만 DB 조회
     """
+    if dedup_index.ready and not dedup_index.might_contain_hash(content_hash):
+        return False
+
     result = session.execute(
-        select(Content).where(Content.content_hash == content_hash)
-    ).scalar_one_or_none()
+        select(Content.id).where(Content.content_hash == content_hash).limit(1)
+    ).first()
     return result is not None
 
 def is_duplicate_url(session, url: str) -> bool:
     """
     동일한 URL이 이미 저장돼 있는지 확인
+    - 중복 인덱스가 로드돼 있으면 인덱스에 있을 때만 DB 조회
     """
+    if dedup_index.ready and not dedup_index.might_contain_url(url):
+        return False
+
     result = session.execute(
-        select(ContentUrl).where(ContentUrl.url == url)
-    ).scalar_one_or_none()
+        select(ContentUrl.id).where(ContentUrl.url_hash == get_url_hash(url)).limit(1)
+    ).first()
     return result is not None
 
 def filter_and_deduplicate(session, urls: list[str]) -> list[str]:
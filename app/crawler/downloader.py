@@ -1,14 +1,24 @@
 from app.database.connection import engine
-from app.crawler.deduplicator import is_duplicate_hash
-from app.models.content import Content
-from app.models.content_url import ContentUrl
-from hashlib import sha256
+from app.crawler.article_fetcher import fetch_article, article_downloads, FETCH_ARTICLE_HTML
+from app.crawler.content_writer import BatchedContentWriter, ContentRecord, SAVED, DUPLICATE, FAILED
+from app.crawler.dedup_index import dedup_index
+from app.crawler.deduplicator import is_duplicate_url, is_duplicate_hash
+from app.crawler.html_storage import pack_html, unpack_html
+from app.crawler.page_store import page_store
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import dedup_checks
+from app.monitoring.tracing import tracer
+from concurrent.futures import Future
+import time
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select
 
 
-DUMMY_HTML = "<html>Blocked by Google policy</html>"
 Session = sessionmaker(bind=engine)
+log = get_logger("downloader")
+
+# ✅ 워커 스레드들이 공유하는 배치 저장 스레드
+content_writer = BatchedContentWriter(Session)
+content_writer.add_listener(dedup_index.add_records)
 
 def get_domain(url: str) -> str:
     try:
@@ -16,53 +26,105 @@ def get_domain(url: str) -> str:
     except Exception:
         return ""
 
-def is_duplicate_url(db_session, url: str) -> bool:
-    result = db_session.execute(
-        select(ContentUrl).where(ContentUrl.url == url)
-    ).scalar_one_or_none()
-    return result is not None
+def _is_known_duplicate(news_url: str, content_hash: str) -> bool:
+    """
+    중복 인덱스가 '있을 수도 있음'이라고 할 때만 DB로 확인
+    (인덱스가 없으면 확인 없이 배치 저장의 INSERT IGNORE에 맡김)
+    """
+    if not dedup_index.ready:
+        return False
+    if not (dedup_index.might_contain_url(news_url) or dedup_index.might_contain_hash(content_hash)):
+        dedup_checks.inc(stage="index", result="miss")
+        return False
+    dedup_checks.inc(stage="index", result="hit")
 
-def download_and_process(symbol: str, news_url: str, title, summary, content_hash):
-    print(f"🔥 download_and_process 호출됨 → {symbol}, {news_url}")
-    html = DUMMY_HTML
     session = Session()
     try:
-        if is_duplicate_url(session, news_url):
-            print(f"⚠️ 이미 저장된 URL: {news_url}")
-            return
+        duplicate = is_duplicate_url(session, news_url) or is_duplicate_hash(session, content_hash)
+        dedup_checks.inc(stage="db", result="hit" if duplicate else "miss")
+        return duplicate
+    except Exception as e:
+        log.error("❌ 중복 확인 실패: {url} → {error}", url=news_url, error=e)
+        return False
+    finally:
+        session.close()
 
-        if is_duplicate_hash(session, content_hash):
-            print(f"⚠️ 중복 콘텐츠 해시: {title}")
-            return
+def _log_outcome(title: str, news_url: str, future: Future):
+    outcome = future.result()
+    if outcome == SAVED:
+        log.debug("✅ 저장 완료: {title}", title=title)
+    elif outcome == DUPLICATE:
+        log.debug("⚠️ 중복 콘텐츠: {title} - {url}", title=title, url=news_url)
+    else:
+        log.error("❌ 저장 실패: {url}", url=news_url)
 
-        # ✅ DB 저장
-        content = Content(
-            symbol=symbol,
-            title=title,
-            summary=summary,
-            url=news_url,
-            html=html,
-            source=get_domain(news_url),
-            content_hash=content_hash,
-            is_duplicate=False,
-            
-        )
-        session.add(content)
+def _trace_commit(trace, submitted_at: float, news_url: str, future: Future):
+    outcome = future.result()
+    trace.add_span("db.commit", submitted_at, url=news_url, outcome=outcome)
+    # 실패는 워커가 재시도 여부를 정한 뒤 처리 (재시도 중에 trace가 끝나지 않도록)
+    if outcome != FAILED:
+        tracer.url_done(trace)
 
-        content_url = ContentUrl(
-            url=news_url,
-            symbol=symbol,
-            source="google"
-        )
-        session.add(content_url)
+def download_and_process(symbol: str, news_url: str, title, summary, content_hash, trace=None) -> Future:
+    """
+    기사 원본을 받아서 (FETCH_ARTICLE_HTML) 레코드를 배치 저장 스레드에 넘김 (DB 저장은 비동기로 처리)
+    - 라우터 BFS가 받아 둔 페이지(page_store)가 있으면 그대로 사용 (같은 페이지를 두 번 받지 않음)
+    - split 저장이면 HTML 압축은 워커 스레드에서 (저장 스레드는 INSERT만)
+    - 원본을 받지 못해도 제목 / 요약은 저장
 
-        session.commit()
-        print(f"✅ 저장 완료: {title}")
+    :param trace: URL 메시지의 Trace (워커 처리 / DB 커밋 구간 기록, 저장 / 중복이면 URL 완료 처리)
+    :return: 저장 결과("saved" / "duplicate" / "failed")가 담길 Future
+    """
+    log.debug("🔥 download_and_process 호출됨 → {symbol}, {url}", symbol=symbol, url=news_url)
+    started = time.time()
 
-    except Exception as e:
-        session.rollback()
-        print(f"❌ 저장 실패: {news_url} → {e}")
-    finally:
-        session.close()
+    if _is_known_duplicate(news_url, content_hash):
+        log.debug("⚠️ 이미 저장된 URL: {url}", url=news_url)
+        if trace is not None:
+            trace.add_span("worker.process", started, url=news_url, outcome=DUPLICATE)
+            tracer.url_done(trace)
+        future = Future()
+        future.set_result(DUPLICATE)
+        return future
 
+    html, body = "", None
+    # 라우터 BFS가 이미 받은 페이지면 다시 요청하지 않음
+    stored = page_store.pop(news_url) if FETCH_ARTICLE_HTML else None
+    if stored is not None:
+        article_downloads.inc(result="reused")
+        if content_writer.html_storage == "split":
+            body = stored
+        else:
+            html = unpack_html(stored.codec, stored.data)
+    elif FETCH_ARTICLE_HTML:
+        download_started = time.time()
+        article = fetch_article(news_url)
+        if trace is not None:
+            trace.add_span(
+                "worker.download", download_started, url=news_url,
+                bytes=article.size if article else 0, truncated=bool(article and article.truncated),
+            )
+        if article is not None:
+            if content_writer.html_storage == "split":
+                body = pack_html(article.html, article.charset, article.truncated)
+            else:
+                html = article.html
 
+    record = ContentRecord(
+        symbol=symbol,
+        url=news_url,
+        title=title,
+        summary=summary,
+        html=html,
+        source=get_domain(news_url),
+        content_hash=content_hash,
+        body=body,
+    )
+    if trace is not None:
+        trace.add_span("worker.process", started, url=news_url)
+    submitted_at = time.time()
+    future = content_writer.submit(record)
+    future.add_done_callback(lambda f: _log_outcome(title, news_url, f))
+    if trace is not None:
+        future.add_done_callback(lambda f: _trace_commit(trace, submitted_at, news_url, f))
+    return future
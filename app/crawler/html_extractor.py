@@ -0,0 +1,101 @@
+# app/crawler/html_extractor.py
+
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urljoin, urlparse
+
+from lxml import etree
+
+NO_TITLE = "제목 없음"
+NO_SUMMARY = "요약 없음"
+
+# <head>만 필요한 경우 한 번에 파서에 넣는 글자 수
+FEED_CHUNK_SIZE = 16 * 1024
+
+# 파서 이벤트를 받을 태그 (나머지 태그는 C 레벨에서 걸러짐)
+_EVENT_TAGS = ("title", "meta", "a", "head", "body")
+
+
+@dataclass
+class ExtractedPage:
+    title: str = NO_TITLE
+    summary: str = NO_SUMMARY
+    links: set[str] = field(default_factory=set)
+
+    def to_dict(self, symbol: str, url: str) -> dict:
+        """extract_title_summary()와 같은 형태의 dict 반환"""
+        return {
+            "symbol": symbol,
+            "title": self.title,
+            "summary": self.summary,
+            "url": url,
+        }
+
+
+def extract_page(html, base_url: str, follow_links: bool = True, encoding: Optional[str] = None) -> ExtractedPage:
+    """
+    한 번의 파싱으로 제목 / 요약(description, og:description) / 링크 추출
+    - lxml 이벤트 기반 파서 사용 (BeautifulSoup 트리 생성 없음)
+    - follow_links=False면 <head>가 끝나는 즉시 파싱 중단
+
+    :param html: HTML 문자열 또는 bytes
+    :param base_url: 상대 링크 변환 기준 URL
+    :param follow_links: <a href> 링크 추출 여부
+    :param encoding: bytes 입력의 문자 인코딩 (None이면 <meta charset>으로 판단)
+    """
+    if isinstance(html, bytes) and encoding:
+        parser = etree.HTMLPullParser(events=("start", "end"), tag=_EVENT_TAGS, encoding=encoding)
+    else:
+        parser = etree.HTMLPullParser(events=("start", "end"), tag=_EVENT_TAGS)
+    page = ExtractedPage()
+    meta = {}  # "title" / "description" / "og:description" → 값
+
+    def handle_events() -> bool:
+        """파서 이벤트 처리, <head> 파싱이 끝나서 중단해도 되면 True"""
+        for event, element in parser.read_events():
+            tag = element.tag
+
+            if event == "start":
+                if not follow_links and tag in ("body", "a"):
+                    return True
+                continue
+
+            if tag == "title":
+                if "title" not in meta:
+                    meta["title"] = element.text.strip() if element.text and len(element) == 0 else ""
+            elif tag == "meta":
+                content = element.get("content")
+                key = element.get("name") if element.get("name") == "description" else element.get("property")
+                if content and key in ("description", "og:description"):
+                    meta.setdefault(key, content.strip())
+            elif tag == "a":
+                href = element.get("href")
+                if href is not None:
+                    absolute_url = urljoin(base_url, href)
+                    if urlparse(absolute_url).scheme.startswith("http"):
+                        page.links.add(absolute_url)
+            elif tag == "head" and not follow_links:
+                return True
+        return False
+
+    chunk_size = len(html) if follow_links else FEED_CHUNK_SIZE
+    head_done = False
+    for offset in range(0, len(html), max(chunk_size, 1)):
+        parser.feed(html[offset:offset + chunk_size])
+        head_done = handle_events()
+        if head_done:
+            break
+
+    if not head_done:
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            pass  # 빈 문서 등
+        handle_events()
+
+    if meta.get("title"):
+        page.title = meta["title"]
+    summary = meta.get("description") or meta.get("og:description")
+    if summary:
+        page.summary = summary
+    return page
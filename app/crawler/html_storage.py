@@ -0,0 +1,92 @@
+# app/crawler/html_storage.py
+
+import gzip
+import os
+import threading
+from dataclasses import dataclass
+
+from app.monitoring.logger import get_logger
+
+# 원본 HTML 저장 방식
+# - "split": content_bodies 테이블에 압축해서 저장 (목록 조회는 contents만 읽음)
+# - "inline": 기존처럼 contents.html에 그대로 저장
+HTML_STORAGE = os.getenv("HTML_STORAGE", "split").lower()
+
+# zstandard 패키지가 있으면 zstd, 없으면 gzip
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+HTML_COMPRESSION = os.getenv("HTML_COMPRESSION", "zstd" if zstandard else "gzip").lower()
+ZSTD_LEVEL = 6
+GZIP_LEVEL = 6
+
+CODECS = ("zstd", "gzip", "none")
+
+log = get_logger("html_storage")
+
+# zstd 압축기 / 해제기는 스레드 간 공유 불가 → 스레드별로 생성
+_local = threading.local()
+
+
+@dataclass
+class ArticleBody:
+    codec: str  # "zstd" / "gzip" / "none"
+    data: bytes
+    raw_size: int  # 압축 전 UTF-8 bytes
+    charset: str = "utf-8"  # 원본 응답 문자셋 (저장은 항상 UTF-8)
+    truncated: bool = False  # MAX_ARTICLE_BYTES에서 잘림
+
+
+def _codec(codec: str) -> str:
+    if codec == "zstd" and zstandard is None:
+        log.warning("[⚠️ zstd 없음] zstandard 미설치 → gzip으로 저장")
+        return "gzip"
+    if codec not in CODECS:
+        raise ValueError(f"지원하지 않는 압축 방식: {codec}")
+    return codec
+
+
+def compress(data: bytes, codec: str = HTML_COMPRESSION) -> tuple[str, bytes]:
+    """
+    :return: (실제 사용한 압축 방식, 압축된 bytes)
+    """
+    codec = _codec(codec)
+    if codec == "zstd":
+        compressor = getattr(_local, "compressor", None)
+        if compressor is None:
+            compressor = _local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        return codec, compressor.compress(data)
+    if codec == "gzip":
+        return codec, gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return codec, data
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    """
+    :raises ValueError: 알 수 없는 압축 방식 (또는 zstandard 미설치)
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd로 저장된 본문이지만 zstandard가 설치되어 있지 않음")
+        decompressor = getattr(_local, "decompressor", None)
+        if decompressor is None:
+            decompressor = _local.decompressor = zstandard.ZstdDecompressor()
+        return decompressor.decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "none":
+        return data
+    raise ValueError(f"지원하지 않는 압축 방식: {codec}")
+
+
+def pack_html(html: str, charset: str = "utf-8", truncated: bool = False, codec: str = HTML_COMPRESSION) -> ArticleBody:
+    """HTML 문자열 → UTF-8 인코딩 후 압축"""
+    raw = html.encode("utf-8")
+    used, data = compress(raw, codec)
+    return ArticleBody(codec=used, data=data, raw_size=len(raw), charset=charset, truncated=truncated)
+
+
+def unpack_html(codec: str, data: bytes) -> str:
+    return decompress(codec, data).decode("utf-8")
@@ -0,0 +1,264 @@
+# app/crawler/http_client.py
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# 연결 / 응답 대기 타임아웃 (초)
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = 5
+
+# 호스트 풀 개수 / 호스트당 유지할 keep-alive 연결 수
+POOL_CONNECTIONS = 200
+POOL_MAXSIZE = 10
+
+# 본문 크기 제한(max_bytes) 요청에서 한 번에 읽는 크기
+CHUNK_SIZE = 64 * 1024
+
+# ETag / Last-Modified 재검증용으로 기억할 URL 수 / 본문 총 크기 (bytes)
+VALIDATOR_CACHE_SIZE = 5000
+VALIDATOR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# brotli 패키지가 있으면 urllib3가 br 응답을 자동으로 풀어줌
+try:
+    import brotli  # noqa: F401
+    DEFAULT_HEADERS["Accept-Encoding"] = "gzip, deflate, br"
+except ImportError:
+    pass
+
+
+@dataclass
+class HttpResponse:
+    status_code: int
+    url: str
+    content: bytes = b""
+    text: str = ""
+    headers: CaseInsensitiveDict = field(default_factory=CaseInsensitiveDict)
+    not_modified: bool = False  # 304 → 캐시된 본문 재사용
+    encoding: Optional[str] = None  # Content-Type charset (없으면 None → 파서가 <meta charset> 사용)
+    truncated: bool = False  # max_bytes / deadline에서 잘림
+    skipped: bool = False  # accept가 거부한 Content-Type → 본문을 읽지 않음
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+
+def read_limited(response: requests.Response, max_bytes: int, deadline: Optional[float] = None) -> tuple[bytes, bool]:
+    """
+    stream=True 응답 본문을 max_bytes까지만 읽음 (gzip / br은 풀린 크기 기준)
+
+    :param deadline: time.perf_counter() 기준 읽기 종료 시각 (조금씩 보내는 서버 대비)
+    :return: (본문, 잘림 여부)
+    """
+    buffer = bytearray()
+    for chunk in response.iter_content(CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            del buffer[max_bytes:]
+            return bytes(buffer), True
+        if deadline is not None and time.perf_counter() > deadline:
+            return bytes(buffer), True
+    return bytes(buffer), False
+
+
+@dataclass
+class _CachedEntry:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    response: HttpResponse
+
+    @property
+    def size(self) -> int:
+        return len(self.response.content) + len(self.response.text)
+
+
+class CrawlerHttpClient:
+    """
+    크롤러 공용 HTTP 클라이언트
+    - requests.Session 하나를 공유해서 호스트별 keep-alive 연결 재사용
+    - gzip / deflate (brotli 설치 시 br) 응답 자동 해제
+    - 모든 요청에 동일한 (connect, read) 타임아웃 적용
+    - ETag / Last-Modified 기억 후 조건부 GET → 304면 캐시된 본문 반환
+    - max_bytes 지정 시 스트리밍으로 읽고, accept가 거부한 Content-Type이면 본문을 받기 전에 종료
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+        cache_size: int = VALIDATOR_CACHE_SIZE,
+        cache_max_bytes: int = VALIDATOR_CACHE_MAX_BYTES,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache_size = cache_size
+        self.cache_max_bytes = cache_max_bytes
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._cache: OrderedDict[str, _CachedEntry] = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        conditional: bool = True,
+        max_bytes: Optional[int] = None,
+        accept: Optional[Callable[[str], bool]] = None,
+        deadline: Optional[float] = None,
+    ) -> HttpResponse:
+        """
+        GET 요청
+
+        :param headers: 추가 요청 헤더
+        :param conditional: ETag / Last-Modified 재검증 사용 여부
+        :param max_bytes: 본문 최대 크기 (지정 시 스트리밍, 넘으면 잘라서 truncated=True, text는 비움)
+        :param accept: 200 응답의 Content-Type 확인 함수 (False면 본문을 읽지 않고 skipped=True)
+        :param deadline: max_bytes 지정 시 본문 읽기 제한 시간 (초)
+        :raises requests.RequestException: 연결 실패, 타임아웃 등
+        """
+        request_headers = dict(headers or {})
+
+        cached = self._get_cached(url) if conditional else None
+        if cached:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        if max_bytes is not None:
+            return self._get_streamed(url, request_headers, cached, conditional, max_bytes, accept, deadline)
+
+        response = self.session.get(url, headers=request_headers, timeout=self.timeout)
+
+        if response.status_code == 304 and cached:
+            return HttpResponse(
+                status_code=200,
+                url=url,
+                content=cached.response.content,
+                text=cached.response.text,
+                headers=CaseInsensitiveDict(response.headers),
+                not_modified=True,
+                encoding=cached.response.encoding,
+            )
+
+        result = HttpResponse(
+            status_code=response.status_code,
+            url=response.url,
+            content=response.content,
+            text=response.text,
+            headers=CaseInsensitiveDict(response.headers),
+            encoding=response.encoding if "charset" in response.headers.get("Content-Type", "").lower() else None,
+        )
+
+        if conditional and result.ok:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._put_cached(url, _CachedEntry(etag, last_modified, result))
+
+        return result
+
+    def _get_streamed(
+        self,
+        url: str,
+        request_headers: dict,
+        cached: Optional[_CachedEntry],
+        conditional: bool,
+        max_bytes: int,
+        accept: Optional[Callable[[str], bool]],
+        deadline: Optional[float],
+    ) -> HttpResponse:
+        started = time.perf_counter()
+        with self.session.get(url, headers=request_headers, timeout=self.timeout, stream=True) as response:
+            headers = CaseInsensitiveDict(response.headers)
+            content_type = headers.get("Content-Type", "")
+            encoding = response.encoding if "charset" in content_type.lower() else None
+
+            if response.status_code == 304 and cached:
+                return HttpResponse(
+                    status_code=200,
+                    url=url,
+                    content=cached.response.content,
+                    headers=headers,
+                    not_modified=True,
+                    encoding=cached.response.encoding,
+                    truncated=cached.response.truncated,
+                )
+            if response.status_code != 200:
+                return HttpResponse(status_code=response.status_code, url=response.url, headers=headers, encoding=encoding)
+            if accept is not None and not accept(content_type):
+                return HttpResponse(status_code=200, url=response.url, headers=headers, encoding=encoding, skipped=True)
+
+            content, truncated = read_limited(
+                response, max_bytes, None if deadline is None else started + deadline
+            )
+
+        result = HttpResponse(
+            status_code=200,
+            url=response.url,
+            content=content,
+            headers=headers,
+            encoding=encoding,
+            truncated=truncated,
+        )
+        if conditional and not truncated:
+            etag = headers.get("ETag")
+            last_modified = headers.get("Last-Modified")
+            if etag or last_modified:
+                self._put_cached(url, _CachedEntry(etag, last_modified, result))
+        return result
+
+    def forget(self, url: str):
+        """URL의 재검증 정보 삭제"""
+        with self._lock:
+            entry = self._cache.pop(url, None)
+            if entry is not None:
+                self._cache_bytes -= entry.size
+
+    def _get_cached(self, url: str) -> Optional[_CachedEntry]:
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is not None:
+                self._cache.move_to_end(url)
+            return entry
+
+    def _put_cached(self, url: str, entry: _CachedEntry):
+        if entry.size > self.cache_max_bytes:
+            return
+
+        with self._lock:
+            previous = self._cache.pop(url, None)
+            if previous is not None:
+                self._cache_bytes -= previous.size
+
+            self._cache[url] = entry
+            self._cache_bytes += entry.size
+
+            # 오래된 항목부터 제거 (개수 / 크기 제한)
+            while len(self._cache) > self.cache_size or self._cache_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.size
+
+
+# ✅ 크롤러 패키지 전체에서 공유하는 클라이언트
+http_client = CrawlerHttpClient()
@@ -0,0 +1,94 @@
+# app/crawler/page_store.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.crawler.article_fetcher import FETCH_ARTICLE_HTML, MAX_ARTICLE_BYTES, detect_charset, is_html
+from app.crawler.deduplicator import get_url_hash
+from app.crawler.html_storage import ArticleBody, pack_html
+from app.monitoring.logger import get_logger
+
+# 보관할 압축 본문 전체 크기 (bytes, 넘으면 오래된 것부터 삭제)
+PAGE_STORE_MAX_BYTES = int(os.getenv("PAGE_STORE_MAX_BYTES", 64 * 1024 * 1024))
+
+# 보관 시간 (초, URL 큐 대기보다 길게)
+PAGE_STORE_TTL = 600
+
+log = get_logger("page_store")
+
+
+class PageStore:
+    """
+    라우터 BFS가 받은 기사 페이지를 워커가 다시 받지 않도록 압축해서 보관 (url_hash 기준)
+    - BFS가 수집 대상으로 고른 페이지만 put (이미 저장된 URL / 링크 페이지는 제외)
+    - 워커는 pop으로 꺼내 쓰고, 없으면 (재시작 / 삭제됨) 기사 원본을 직접 요청
+    - 압축 크기 합계 max_bytes + ttl로 메모리 사용량 제한
+    """
+
+    def __init__(self, max_bytes: int = PAGE_STORE_MAX_BYTES, ttl: float = PAGE_STORE_TTL, enabled: bool = FETCH_ARTICLE_HTML):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: OrderedDict[str, tuple[float, ArticleBody]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, url: str, content: bytes, content_type: str = "", truncated: bool = False):
+        """
+        응답 bytes → 문자셋 감지 / 디코딩 / 압축 후 보관 (HTML이 아니면 보관하지 않음)
+
+        :param truncated: 요청 단계에서 MAX_ARTICLE_BYTES / 제한 시간에 잘림
+        """
+        if not self.enabled or not content or not is_html(content_type):
+            return
+        truncated = truncated or len(content) > MAX_ARTICLE_BYTES
+        content = content[:MAX_ARTICLE_BYTES]
+        charset = detect_charset(content, content_type)
+        try:
+            body = pack_html(content.decode(charset, errors="replace"), charset, truncated)
+        except Exception as e:
+            log.warning("[⚠️ 페이지 보관 실패] {url} - {error}", url=url, error=e)
+            return
+        if len(body.data) > self.max_bytes:
+            return
+
+        key = get_url_hash(url)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._bytes += len(body.data)
+            while self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def pop(self, url: str) -> Optional[ArticleBody]:
+        """
+        :return: 보관 중인 압축 본문 (꺼내면 삭제) / 없거나 만료되면 None
+        """
+        key = get_url_hash(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            self._discard(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1].data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pages": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+# ✅ 라우터(BFS)와 워커가 공유하는 페이지 보관소
+page_store = PageStore()
@@ -0,0 +1,121 @@
+# app/crawler/parse_pool.py
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.crawler.html_extractor import ExtractedPage, extract_page
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import histogram
+
+log = get_logger("parse")
+
+parse_seconds = histogram("crawler_parse_seconds", "HTML 파싱 시간 (초, process 모드는 대기 포함)", ("mode",))
+
+# HTML 파싱 실행 방식
+# - "thread": 요청한 스레드에서 바로 파싱 (GIL을 수집 / 워커 스레드와 공유)
+# - "process": 별도 프로세스 풀에서 파싱 (멀티 코어 사용)
+PARSE_MODE = os.getenv("PARSE_MODE", "thread")
+
+# 파싱 프로세스 수 (기본값: 코어 수 - 1)
+PARSE_PROCESSES = int(os.getenv("PARSE_PROCESSES", max((os.cpu_count() or 2) - 1, 1)))
+
+# 프로세스 풀에 동시에 넘길 수 있는 최대 페이지 수 (초과 시 호출 스레드가 대기)
+MAX_IN_FLIGHT_PARSES = PARSE_PROCESSES * 4
+
+# 파싱 프로세스 시작 방식
+# - fork는 Kafka / HTTP / DB 스레드가 떠 있는 프로세스를 복제하므로 잠금이 잡힌 채로 복사될 수 있음
+# - forkserver(없으면 spawn): 스레드 없는 서버 프로세스에서 깨끗하게 시작
+PARSE_START_METHOD = os.getenv(
+    "PARSE_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+)
+
+
+def _parse_in_process(content: bytes, base_url: str, follow_links: bool, encoding: Optional[str]):
+    """
+    프로세스 풀에서 실행되는 파싱 함수
+    - 결과는 (title, summary, links) 튜플로만 반환해서 프로세스 간 전송량 최소화
+    """
+    page = extract_page(content, base_url, follow_links=follow_links, encoding=encoding)
+    return page.title, page.summary, tuple(page.links)
+
+
+class ParsePool:
+    """
+    HTML 파싱 단계
+    - 수집 스레드 / 코루틴은 원본 bytes를 넘기고 ExtractedPage를 돌려받음
+    - process 모드: ProcessPoolExecutor + 세마포어로 처리 중인 페이지 수 제한
+    - thread 모드: 호출 스레드에서 바로 extract_page() 실행
+    """
+
+    def __init__(
+        self,
+        mode: str = PARSE_MODE,
+        processes: int = PARSE_PROCESSES,
+        max_in_flight: Optional[int] = None,
+    ):
+        """
+        :param mode: "thread" 또는 "process"
+        :param processes: 파싱 프로세스 수
+        :param max_in_flight: 동시에 프로세스 풀에 넘길 최대 페이지 수 (기본값: processes * 4)
+        """
+        self.mode = mode
+        self.processes = processes
+        self.max_in_flight = max_in_flight or processes * 4
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # 프로세스는 처음 파싱할 때 생성 (import만 하는 API 서버 / 스크립트는 프로세스를 띄우지 않음)
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(PARSE_START_METHOD)
+                if PARSE_START_METHOD == "forkserver":
+                    # 파서 모듈은 서버 프로세스에서 한 번만 import
+                    context.set_forkserver_preload(["app.crawler.html_extractor"])
+                self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=context)
+                log.info(
+                    "[🧮 파싱 프로세스 풀] {processes}개 프로세스 시작 ({method})",
+                    processes=self.processes, method=PARSE_START_METHOD,
+                )
+            return self._executor
+
+    def parse(
+        self,
+        content,
+        base_url: str,
+        follow_links: bool = True,
+        encoding: Optional[str] = None,
+    ) -> ExtractedPage:
+        """
+        제목 / 요약 / 링크 추출
+
+        :param content: HTML bytes (또는 문자열)
+        :param base_url: 상대 링크 변환 기준 URL
+        :param follow_links: <a href> 링크 추출 여부
+        :param encoding: bytes 입력의 문자 인코딩
+        """
+        with parse_seconds.time(mode=self.mode):
+            if self.mode != "process":
+                return extract_page(content, base_url, follow_links=follow_links, encoding=encoding)
+
+            with self._slots:
+                future = self._get_executor().submit(
+                    _parse_in_process, content, base_url, follow_links, encoding
+                )
+                title, summary, links = future.result()
+        return ExtractedPage(title=title, summary=summary, links=set(links))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+# ✅ 크롤러 전체에서 공유하는 파싱 단계
+parse_pool = ParsePool()
@@ -0,0 +1,265 @@
+# app/crawler/politeness.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from app.crawler.http_client import http_client
+from app.monitoring.logger import get_logger
+
+log = get_logger("politeness")
+
+# 도메인별 기본 요청 속도 (초당 요청 수) / 연속 허용 요청 수
+DOMAIN_RATE = 1.0
+DOMAIN_BURST = 2
+
+# 429 / 503 응답 시 속도를 줄이는 비율 / 최저 속도 / 정상 응답마다 회복하는 양
+RATE_DECREASE = 0.5
+MIN_DOMAIN_RATE = 0.05
+RATE_RECOVERY_STEP = 0.05
+
+# Retry-After가 없을 때 대기 시간 (초, 연속 실패마다 2배) / 최대 대기 시간
+BASE_BACKOFF = 5
+MAX_BACKOFF = 300
+
+# 상태를 기억하는 최대 도메인 수
+MAX_DOMAINS = 10_000
+
+# robots.txt 준수 여부 / 캐시 유지 시간 (초)
+RESPECT_ROBOTS_TXT = os.getenv("RESPECT_ROBOTS_TXT", "true").lower() == "true"
+ROBOTS_TTL = 3600
+ROBOTS_USER_AGENT = "Mozilla/5.0"
+
+# robots.txt 5xx / 연결 실패 시 전체 금지를 유지하는 시간 (초, RFC 9309: 서버 오류면 전체 금지로 간주)
+ROBOTS_ERROR_TTL = 60
+
+# 다른 스레드가 같은 도메인의 robots.txt를 받는 동안 다시 확인하는 간격 (초)
+ROBOTS_WAIT_INTERVAL = 1.0
+
+THROTTLE_STATUSES = (429, 503)
+
+# 도메인 대기 시간이 이보다 길면 이번 BFS에서는 건너뜀 (초)
+MAX_DEFER_SECONDS = 30
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 시간 (초)"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """
+        토큰 1개 사용
+
+        :return: 0이면 사용 완료, 아니면 토큰이 생길 때까지 남은 시간 (초, 토큰은 사용하지 않음)
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class DomainState:
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.backoff_until = 0.0
+        self.strikes = 0
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_expires_at = 0.0
+        self.robots_fetching: Optional[threading.Event] = None  # robots.txt 요청 중이면 완료 이벤트
+
+
+class PolitenessPolicy:
+    """
+    도메인별 요청 예절 정책
+    - 토큰 버킷으로 도메인별 요청 속도 제한 (robots.txt Crawl-delay가 더 느리면 그 값 사용)
+    - 429 / 503 응답 시 Retry-After(없으면 지수 backoff)만큼 도메인 전체 대기 + 속도 감소,
+      정상 응답마다 기본 속도까지 조금씩 회복
+    - robots.txt는 도메인별로 ROBOTS_TTL 동안 캐시 (도메인당 한 스레드만 요청, 나머지는 결과 대기)
+    - ready_in()은 대기하지 않고 남은 시간만 반환 → 호출 측이 다른 도메인 URL을 먼저 처리
+    """
+
+    def __init__(self, rate: float = DOMAIN_RATE, burst: int = DOMAIN_BURST, respect_robots: bool = RESPECT_ROBOTS_TXT):
+        self.rate = rate
+        self.burst = burst
+        self.respect_robots = respect_robots
+        self._domains: OrderedDict[str, DomainState] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.deferred = 0
+        self.throttled = 0
+        self.robots_blocked = 0
+
+    def _state(self, host: str) -> DomainState:
+        state = self._domains.get(host)
+        if state is None:
+            state = self._domains[host] = DomainState(self.rate, self.burst)
+            while len(self._domains) > MAX_DOMAINS:
+                self._domains.popitem(last=False)
+        else:
+            self._domains.move_to_end(host)
+        return state
+
+    def ready_in(self, url: str) -> float:
+        """
+        요청 가능 여부 확인 (가능하면 토큰 사용)
+
+        :return: 0이면 바로 요청, 아니면 요청 가능할 때까지 남은 시간 (초)
+        """
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            if state.backoff_until > now:
+                self.deferred += 1
+                return state.backoff_until - now
+            delay = state.bucket.reserve(now)
+            if delay:
+                self.deferred += 1
+            return delay
+
+    def record(self, url: str, status_code: int, headers=None):
+        """응답 상태 반영 (429 / 503이면 backoff)"""
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            bucket = state.bucket
+            if status_code in THROTTLE_STATUSES:
+                self.throttled += 1
+                state.strikes += 1
+                retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+                backoff = retry_after if retry_after is not None else BASE_BACKOFF * 2 ** (state.strikes - 1)
+                backoff = min(backoff, MAX_BACKOFF)
+                state.backoff_until = max(state.backoff_until, now + backoff)
+                bucket.rate = max(bucket.rate * RATE_DECREASE, MIN_DOMAIN_RATE)
+                bucket.tokens = 0.0
+                log.warning(
+                    "[🐢 요청 제한] {host} {status} → {backoff:.0f}초 대기, 속도 {rate:.2f}/s",
+                    host=host, status=status_code, backoff=backoff, rate=bucket.rate,
+                )
+            elif status_code < 400:
+                state.strikes = 0
+                bucket.rate = min(bucket.rate + RATE_RECOVERY_STEP, state.base_rate)
+
+    def allowed(self, url: str) -> bool:
+        """robots.txt 허용 여부 (도메인별 첫 호출 시 robots.txt 요청)"""
+        if not self.respect_robots:
+            return True
+
+        parsed = urlparse(url)
+        robots = self._robots(parsed.scheme, parsed.netloc)
+
+        if robots.can_fetch(ROBOTS_USER_AGENT, url):
+            return True
+        with self._lock:
+            self.robots_blocked += 1
+        log.info("[🤖 robots.txt 차단] {url}", url=url)
+        return False
+
+    def _robots(self, scheme: str, host: str) -> RobotFileParser:
+        """
+        캐시된 robots.txt (만료되었으면 한 스레드만 요청하고 나머지는 완료 이벤트 대기)
+        """
+        while True:
+            with self._lock:
+                state = self._state(host)
+                if state.robots_expires_at > time.monotonic():
+                    return state.robots
+                fetching = state.robots_fetching
+                if fetching is None:
+                    fetching = state.robots_fetching = threading.Event()
+                    break
+            fetching.wait(ROBOTS_WAIT_INTERVAL)
+
+        try:
+            robots, ttl = self._fetch_robots(f"{scheme}://{host}/robots.txt")
+            crawl_delay = robots.crawl_delay(ROBOTS_USER_AGENT)
+            with self._lock:
+                state = self._state(host)
+                state.robots = robots
+                state.robots_expires_at = time.monotonic() + ttl
+                if crawl_delay:
+                    state.base_rate = min(state.base_rate, 1 / float(crawl_delay))
+                    state.bucket.rate = min(state.bucket.rate, state.base_rate)
+            return robots
+        finally:
+            with self._lock:
+                if state.robots_fetching is fetching:
+                    state.robots_fetching = None
+            fetching.set()
+
+    def _fetch_robots(self, robots_url: str) -> tuple[RobotFileParser, float]:
+        """
+        robots.txt 요청 / 파싱
+        - 401 / 403 → 전체 금지
+        - 5xx / 연결 실패 → ROBOTS_ERROR_TTL 동안 전체 금지 (RFC 9309, 서버가 회복되면 다시 요청)
+        - 그 외 4xx / 없음 → 전체 허용
+
+        :return: (파서, 캐시 유지 시간)
+        """
+        parser = RobotFileParser(robots_url)
+        try:
+            response = http_client.get(robots_url, conditional=False)
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code >= 500:
+                log.warning("[⚠️ robots.txt 서버 오류] {url} - 상태코드 {status}, {ttl}초 동안 금지",
+                            url=robots_url, status=response.status_code, ttl=ROBOTS_ERROR_TTL)
+                parser.disallow_all = True
+                return parser, ROBOTS_ERROR_TTL
+            elif response.ok:
+                parser.parse(response.text.splitlines())
+                parser.modified()  # 읽은 시각 기록 (없으면 can_fetch가 항상 False)
+            else:
+                parser.allow_all = True
+        except Exception as e:
+            log.warning("[⚠️ robots.txt 요청 실패] {url} - {error}, {ttl}초 동안 금지",
+                        url=robots_url, error=e, ttl=ROBOTS_ERROR_TTL)
+            parser.disallow_all = True
+            return parser, ROBOTS_ERROR_TTL
+        return parser, ROBOTS_TTL
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            backing_off = {
+                host: round(state.backoff_until - now, 1)
+                for host, state in self._domains.items()
+                if state.backoff_until > now
+            }
+            return {
+                "domains": len(self._domains),
+                "deferred": self.deferred,
+                "throttled_responses": self.throttled,
+                "robots_blocked": self.robots_blocked,
+                "backing_off": backing_off,
+            }
+
+
+# ✅ 크롤러 전체에서 공유하는 도메인 정책
+politeness = PolitenessPolicy()
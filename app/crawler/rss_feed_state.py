@@ -0,0 +1,145 @@
+# app/crawler/rss_feed_state.py
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+# 동일 pubDate / pubDate 없는 항목 판별용으로 기억할 GUID 수
+MAX_RECENT_GUIDS = 500
+
+# BFS에서 아직 방문하지 못한 새 RSS 링크를 다음 폴링으로 넘기는 최대 개수
+MAX_PENDING_LINKS = 100
+
+
+@dataclass
+class RssItem:
+    link: str
+    guid: str
+    published_at: Optional[float] = None  # pubDate (epoch seconds)
+
+
+@dataclass
+class FeedState:
+    """
+    심볼별 RSS 피드 상태
+    - etag / last_modified: 다음 요청의 조건부 GET 헤더
+    - last_guid: 마지막으로 본 최신 항목 GUID
+    - pub_date_watermark: 지금까지 본 항목 중 가장 늦은 pubDate
+    """
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    last_guid: Optional[str] = None
+    pub_date_watermark: Optional[float] = None
+    recent_guids: OrderedDict = field(default_factory=OrderedDict)
+    pending_links: list[str] = field(default_factory=list)
+
+
+class RssFeedStateStore:
+    """
+    심볼별 RSS 워터마크 저장소 (프로세스 메모리, thread-safe)
+    - 새 항목(워터마크 이후 pubDate, 처음 보는 GUID)만 BFS 시작점으로 반환
+    - BFS가 방문하지 못한 새 링크는 pending으로 보관 후 다음 폴링에 다시 반환
+    """
+
+    def __init__(self, max_recent_guids: int = MAX_RECENT_GUIDS, max_pending_links: int = MAX_PENDING_LINKS):
+        self.max_recent_guids = max_recent_guids
+        self.max_pending_links = max_pending_links
+        self._states: dict[str, FeedState] = {}
+        self._lock = threading.Lock()
+
+    def conditional_headers(self, symbol: str) -> dict:
+        """
+        If-None-Match / If-Modified-Since 헤더 생성
+        """
+        with self._lock:
+            state = self._states.get(symbol)
+            headers = {}
+            if state and state.etag:
+                headers["If-None-Match"] = state.etag
+            if state and state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+            return headers
+
+    def take_pending(self, symbol: str) -> list[str]:
+        """
+        보관 중인 미방문 링크 반환 후 비움 (304 응답 등 새 항목이 없을 때 사용)
+        """
+        with self._lock:
+            state = self._states.get(symbol)
+            if not state:
+                return []
+            links, state.pending_links = state.pending_links, []
+            return links
+
+    def select_new_items(
+        self,
+        symbol: str,
+        items: list[RssItem],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> list[str]:
+        """
+        새 항목의 링크만 골라 반환하고 워터마크 갱신
+
+        :return: 보관 중이던 미방문 링크 + 새 항목 링크
+        """
+        with self._lock:
+            state = self._states.setdefault(symbol, FeedState())
+            watermark = state.pub_date_watermark
+
+            new_links = []
+            newest: Optional[RssItem] = None
+            for item in items:
+                if self._is_new(state, item, watermark):
+                    new_links.append(item.link)
+                    self._remember_guid(state, item.guid)
+
+                if item.published_at is not None and (
+                    newest is None or item.published_at > (newest.published_at or 0)
+                ):
+                    newest = item
+
+            if newest is not None and (watermark is None or newest.published_at >= watermark):
+                state.pub_date_watermark = newest.published_at
+                state.last_guid = newest.guid
+            elif items and state.last_guid is None:
+                state.last_guid = items[0].guid
+
+            state.etag = etag
+            state.last_modified = last_modified
+
+            links, state.pending_links = state.pending_links, []
+            return list(dict.fromkeys(links + new_links))
+
+    def requeue(self, symbol: str, links: list[str]):
+        """
+        BFS에서 방문하지 못한 새 링크를 다음 폴링으로 넘김
+        """
+        if not links:
+            return
+
+        with self._lock:
+            state = self._states.setdefault(symbol, FeedState())
+            merged = list(dict.fromkeys(state.pending_links + list(links)))
+            state.pending_links = merged[: self.max_pending_links]
+
+    def reset(self, symbol: str):
+        with self._lock:
+            self._states.pop(symbol, None)
+
+    def _is_new(self, state: FeedState, item: RssItem, watermark: Optional[float]) -> bool:
+        if item.guid in state.recent_guids:
+            return False
+        if watermark is None or item.published_at is None:
+            return True
+        return item.published_at >= watermark
+
+    def _remember_guid(self, state: FeedState, guid: str):
+        state.recent_guids[guid] = None
+        while len(state.recent_guids) > self.max_recent_guids:
+            state.recent_guids.popitem(last=False)
+
+
+# ✅ 프로세스 전체에서 공유하는 피드 상태 저장소
+feed_state_store = RssFeedStateStore()
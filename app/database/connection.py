@@ -1,5 +1,7 @@
 # app/database/connection.py
 
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -9,12 +11,49 @@ MYSQL_HOST = "localhost"
 MYSQL_PORT = "3306"
 MYSQL_DB = "finstage_content_crawler"
 
-DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
+DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}",
+)
+
+# 읽기 전용 복제본 URL (없으면 DATABASE_URL 사용)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL") or DATABASE_URL
+
+# 커넥션 풀 설정
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))          # 유지할 연결 수
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))    # 순간적으로 더 열 수 있는 연결 수
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))    # 풀이 비었을 때 대기 시간 (초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # MySQL wait_timeout 이전에 연결 교체 (초)
+
+# 복제본 없이 기본 엔진을 공유할 때 배치 저장 / 중복 인덱스 로드용으로 남겨둘 연결 수
+WRITER_RESERVED_CONNECTIONS = 2
+
+
+def _create_engine(url: str):
+    options = {"echo": False, "future": True, "pool_pre_ping": True}
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return create_engine(url, **options)
+
 
 # SQLAlchemy ORM 엔진 & 세션 팩토리
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+engine = _create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 조회 API 전용 엔진 & 세션 팩토리 (복제본이 없으면 기본 엔진 공유)
+read_engine = engine if READ_DATABASE_URL == DATABASE_URL else _create_engine(READ_DATABASE_URL)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# 조회 API 동시 실행 수 (읽기 풀 크기, 기본 엔진을 공유하면 저장용 연결을 남김)
+READ_CONCURRENCY = int(os.getenv("READ_CONCURRENCY", "0")) or max(
+    1, DB_POOL_SIZE + DB_MAX_OVERFLOW - (WRITER_RESERVED_CONNECTIONS if read_engine is engine else 0)
+)
+
 # FastAPI 의존성 주입용
 def get_db():
     db = SessionLocal()
@@ -22,3 +61,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# FastAPI 의존성 주입용 (조회 API, 요청이 끝나면 항상 연결 반환)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
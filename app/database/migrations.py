@@ -0,0 +1,153 @@
+# app/database/migrations.py
+# python -m app.database.migrations
+
+from sqlalchemy import inspect, insert, select, update, bindparam, text
+
+from app.models.content import Content
+from app.models.content_body import ContentBody
+from app.models.content_url import ContentUrl
+from app.crawler.deduplicator import get_url_hash
+from app.crawler.html_storage import HTML_STORAGE, pack_html
+from app.monitoring.logger import get_logger
+
+# url_hash 백필 시 한 번에 갱신하는 행 수
+BACKFILL_BATCH_SIZE = 1000
+
+_URL_HASH_TABLES = [Content, ContentUrl]
+
+# 서버 시작 시 기존 테이블에 추가하는 컬럼 (모델, 컬럼, DDL 타입)
+_ADDED_COLUMNS = [
+    (Content, "url_hash", "CHAR(64) NULL"),
+    (ContentUrl, "url_hash", "CHAR(64) NULL"),
+    (Content, "write_token", "CHAR(32) NULL"),
+]
+
+# 예전 다운로더가 원본 대신 저장하던 값 (옮기지 않고 지움)
+LEGACY_PLACEHOLDER_HTML = "<html>Blocked by Google policy</html>"
+
+log = get_logger("migrations")
+
+
+def ensure_columns(engine):
+    """
+    _ADDED_COLUMNS 중 기존 테이블에 없는 컬럼만 추가 (nullable, MySQL 8은 INSTANT DDL)
+    - 서버 시작 시 호출, url_hash 백필 / 인덱스 생성은 migrate()에서 수행
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for model, column, ddl in _ADDED_COLUMNS:
+            table = model.__tablename__
+            if not inspector.has_table(table):
+                continue
+            columns = {existing["name"] for existing in inspector.get_columns(table)}
+            if column not in columns:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                log.info("[🛠️ 마이그레이션] {table}.{column} 컬럼 추가", table=table, column=column)
+
+
+def backfill_url_hash(engine, model, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    url_hash가 비어 있는 행을 batch_size씩 채움
+
+    :return: 갱신한 행 수
+    """
+    stmt = (
+        update(model.__table__)
+        .where(model.__table__.c.id == bindparam("_id"))
+        .values(url_hash=bindparam("_url_hash"))
+    )
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(model.id, model.url)
+                .where(model.url_hash.is_(None))
+                .order_by(model.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            conn.execute(stmt, [{"_id": row_id, "_url_hash": get_url_hash(url)} for row_id, url in rows])
+
+        total += len(rows)
+        log.info("[🛠️ 백필] {table} {total}행", table=model.__tablename__, total=total)
+    return total
+
+
+def create_missing_indexes(engine):
+    """
+    모델에 정의된 인덱스 중 DB에 없는 것 생성
+    """
+    inspector = inspect(engine)
+    for model in _URL_HASH_TABLES:
+        existing = {index["name"] for index in inspector.get_indexes(model.__tablename__)}
+        for index in model.__table__.indexes:
+            if index.name not in existing:
+                log.info("[🛠️ 인덱스 생성] {index}", index=index.name)
+                index.create(bind=engine)
+
+
+def move_inline_html(engine, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    contents.html에 남아 있는 원본을 batch_size씩 content_bodies로 압축 이동 (contents.html은 빈 문자열로)
+
+    :return: 정리한 행 수
+    """
+    ContentBody.__table__.create(bind=engine, checkfirst=True)
+    clear = (
+        update(Content.__table__)
+        .where(Content.__table__.c.id == bindparam("_id"))
+        .values(html="")
+    )
+    total = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(Content.id, Content.html)
+                .where(Content.id > last_id, Content.html != "")
+                .order_by(Content.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            bodies = [(row_id, pack_html(html)) for row_id, html in rows if html != LEGACY_PLACEHOLDER_HTML]
+            if bodies:
+                conn.execute(insert(ContentBody), [
+                    {
+                        "content_id": row_id,
+                        "codec": body.codec,
+                        "charset": body.charset,
+                        "raw_size": body.raw_size,
+                        "truncated": body.truncated,
+                        "body": body.data,
+                    }
+                    for row_id, body in bodies
+                ])
+            conn.execute(clear, [{"_id": row_id} for row_id, _ in rows])
+
+        total += len(rows)
+        last_id = rows[-1][0]
+        log.info("[🛠️ HTML 이동] contents → content_bodies {total}행", total=total)
+    return total
+
+
+def migrate(engine):
+    """
+    url_hash 컬럼 추가 → 기존 행 백필 → 인덱스 생성
+    (인덱스는 백필 후에 만들어야 빠름)
+    HTML_STORAGE="split"이면 contents.html의 원본을 content_bodies로 이동
+    """
+    ensure_columns(engine)
+    for model in _URL_HASH_TABLES:
+        backfill_url_hash(engine, model)
+    create_missing_indexes(engine)
+    if HTML_STORAGE == "split":
+        move_inline_html(engine)
+    log.info("✅ 마이그레이션 완료")
+
+
+if __name__ == "__main__":
+    from app.database.connection import engine
+
+    migrate(engine)
@@ -1,38 +1,244 @@
 # kafka_simple_consumer.py
 
 import json
+import os
 import threading
-from kafka import KafkaConsumer
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from kafka import KafkaConsumer, ConsumerRebalanceListener, OffsetAndMetadata
+from app.kafka.offset_tracker import OffsetTracker
+from app.queue.backpressure import stall_meter
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import dropped
+from app.monitoring.tracing import tracer
 
 KAFKA_TOPIC = "symbol.crawl.priority"
 BOOTSTRAP_SERVERS = "localhost:9092"
 GROUP_ID = "finstage-crawler-group"
 
+# poll 대기 시간 (ms) - 수신을 멈춘 동안에도 이 주기로 분류기 버퍼를 비움
+POLL_TIMEOUT_MS = 500
+
+# 분류기 credit이 이 값 이상 회복되면 수신 재개 (버퍼가 절반 비면 재개)
+RESUME_CREDITS = 50
+
+# poll 한 번에 받는 최대 메시지 수
+MAX_POLL_RECORDS = 500
+
+# True: 심볼에서 나온 URL이 모두 DB에 저장된 (또는 재시도를 포기한) offset만 커밋 / False: Kafka 자동 커밋
+COMMIT_AFTER_PERSIST = True
+
+# 처리 완료 offset 커밋 주기 (초)
+COMMIT_INTERVAL = 1.0
+
+# 같은 그룹으로 실행할 consumer 스레드 수 (토픽 파티션 수보다 많으면 남는 스레드는 대기)
+CONSUMER_THREADS = int(os.getenv("KAFKA_CONSUMER_THREADS", "1"))
+
+log = get_logger("kafka")
+
+
+def parse_created_at(value) -> Optional[float]:
+    """
+    메시지 createdAt (ISO 8601, 시간대가 없으면 UTC) → epoch 초
+
+    :return: 없거나 형식이 다르면 None
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        created_at = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.timestamp()
+
+
+def decode_batch(messages) -> list[tuple]:
+    """
+    poll 결과를 한 번에 역직렬화 / 검증
+
+    :return: [(offset, symbol, score, created_at)] (잘못된 메시지는 symbol = None, createdAt이 없으면 created_at = None)
+    """
+    decoded = []
+    for message in messages:
+        try:
+            data = json.loads(message.value)
+        except (TypeError, ValueError):
+            data = None
+
+        symbol = data.get("symbol") if isinstance(data, dict) else None
+        score = data.get("score") if isinstance(data, dict) else None
+        if not symbol or not isinstance(score, int):
+            dropped.inc(reason="invalid_message")
+            log.warning("[⚠️ 무시됨] 잘못된 메시지: offset={offset} {value!r:.200}", offset=message.offset, value=message.value)
+            decoded.append((message.offset, None, None, None))
+        else:
+            decoded.append((message.offset, symbol, score, parse_created_at(data.get("createdAt"))))
+    return decoded
+
+
+class _CommitOnRevoke(ConsumerRebalanceListener):
+    """
+    파티션을 넘기기 전에 처리 완료분 커밋 후 추적 정보 삭제
+    + 샤드 담당 범위(ShardOwnership) 갱신
+    """
+
+    def __init__(self, owner: "KafkaSimpleConsumer", consumer):
+        self.owner = owner
+        self.consumer = consumer
+
+    def on_partitions_revoked(self, revoked):
+        self.owner.commit(self.consumer)
+        self.owner.tracker.forget(revoked)
+        if self.owner.ownership is not None:
+            self.owner.ownership.revoked(self.owner.name, {tp.partition for tp in revoked})
+
+    def on_partitions_assigned(self, assigned):
+        log.info(
+            "[🧩 파티션 할당] {consumer} → {partitions}",
+            consumer=self.owner.name, partitions=sorted(tp.partition for tp in assigned),
+        )
+        if self.owner.ownership is not None:
+            partitions = self.consumer.partitions_for_topic(KAFKA_TOPIC) or ()
+            self.owner.ownership.assigned(
+                self.owner.name, {tp.partition for tp in assigned}, num_partitions=len(partitions)
+            )
+
+
 class KafkaSimpleConsumer(threading.Thread):
-    def __init__(self, classifier):
+    """
+    Kafka 심볼 메시지 수신 스레드 (credit 기반 backpressure)
+    - 분류기 버퍼의 남은 자리(credit)만큼만 poll
+    - credit이 0이 되면 할당된 파티션을 pause, RESUME_CREDITS 이상 회복되면 resume
+    - pause 중에도 poll은 계속 호출 (그룹 세션 유지 + 분류기 버퍼 flush)
+    - commit_after_persist: 메시지마다 ack를 달아 분류기에 넘기고,
+      심볼에서 나온 URL이 모두 DB에 커밋된 offset까지만 커밋 (중간에 종료되면 미저장 심볼은 다시 수신)
+    - 같은 그룹으로 여러 스레드를 실행하면 파티션을 나눠서 수신
+    """
+
+    def __init__(
+        self,
+        classifier,
+        commit_after_persist: bool = COMMIT_AFTER_PERSIST,
+        consumer_factory=None,
+        ownership=None,
+    ):
+        """
+        :param classifier: SymbolPriorityClassifier
+        :param commit_after_persist: 처리 완료 후 커밋 여부 (False면 자동 커밋)
+        :param consumer_factory: KafkaConsumer 대신 사용할 consumer 생성 함수 (로컬 테스트용)
+        :param ownership: ShardOwnership (파티션 할당 / 회수 반영)
+        """
         super().__init__(daemon=True)
         self.classifier = classifier
+        self.commit_after_persist = commit_after_persist
+        self.consumer_factory = consumer_factory or self._create_consumer
+        self.tracker = OffsetTracker()
+        self.ownership = ownership
+        self.running = True
+        self.paused = False
+        self.stall = stall_meter("kafka.consumer")
+        self._last_commit = 0.0
 
-    def run(self):
-        print("✅ Kafka consumer 시작됨.")
-        consumer = KafkaConsumer(
-            KAFKA_TOPIC,
+    def _create_consumer(self):
+        return KafkaConsumer(
             bootstrap_servers=BOOTSTRAP_SERVERS,
             group_id=GROUP_ID,
-            value_deserializer=lambda m: json.loads(m.decode("utf-8")),
             auto_offset_reset="earliest",
-            enable_auto_commit=True
+            enable_auto_commit=not self.commit_after_persist,
+            max_poll_records=MAX_POLL_RECORDS,
         )
 
-        for message in consumer:
-            data = message.value
-            print(f"[📦 Kafka 수신] {data}")
+    def stop(self):
+        self.running = False
+
+    def run(self):
+        log.info("✅ Kafka consumer 시작됨. ({consumer})", consumer=self.name)
+        consumer = self.consumer_factory()
+        consumer.subscribe([KAFKA_TOPIC], listener=_CommitOnRevoke(self, consumer))
+
+        try:
+            while self.running:
+                # 수신 여부와 관계없이 버퍼에 남은 메시지를 심볼 큐로 분배
+                self.classifier.try_flush()
+                credits = self.classifier.available_credits()
+                self._apply_backpressure(consumer, credits)
+
+                records = consumer.poll(
+                    timeout_ms=POLL_TIMEOUT_MS,
+                    max_records=min(max(credits, 1), MAX_POLL_RECORDS),
+                )
+                for partition, messages in records.items():
+                    self._handle_batch(consumer, partition, messages)
+
+                if self.commit_after_persist and time.monotonic() - self._last_commit >= COMMIT_INTERVAL:
+                    self.commit(consumer)
+        finally:
+            if self.commit_after_persist:
+                self.commit(consumer)
+            consumer.close()
+            if self.ownership is not None:
+                self.ownership.leave(self.name)
+            log.info(
+                "🛑 Kafka consumer 종료 ({consumer}, 미처리 {pending}건은 재수신)",
+                consumer=self.name, pending=self.tracker.pending(),
+            )
 
-            symbol = data.get("symbol")
-            score = data.get("score")
+    def commit(self, consumer):
+        """처리 완료된 offset 커밋"""
+        self._last_commit = time.monotonic()
+        offsets = self.tracker.committable()
+        if not offsets:
+            return
+        try:
+            consumer.commit({partition: OffsetAndMetadata(offset, "") for partition, offset in offsets.items()})
+            self.tracker.mark_committed(offsets)
+        except Exception as e:
+            log.error("[❌ offset 커밋 실패] {error}", error=e)
 
-            if not symbol or not isinstance(score, int):
-                print(f"[⚠️ 무시됨] 잘못된 메시지: {data}")
+    def _handle_batch(self, consumer, partition, messages):
+        log.debug(
+            "[📦 Kafka 수신] {topic}-{partition} {count}건",
+            topic=partition.topic, partition=partition.partition, count=len(messages),
+        )
+
+        for offset, symbol, score, created_at in decode_batch(messages):
+            ack = self.tracker.track(partition, offset) if self.commit_after_persist else None
+            if symbol is None:
+                if ack:
+                    ack()  # 잘못된 메시지는 처리할 것이 없으므로 바로 완료
                 continue
 
-            self.classifier.receive(symbol, score)
+            if self.ownership is not None and not self.ownership.check_key(symbol, partition.partition):
+                log.warning(
+                    "[⚠️ key 불일치] {symbol} → 파티션 {partition} (producer가 심볼을 key로 보내야 함)",
+                    symbol=symbol, partition=partition.partition,
+                )
+
+            trace = tracer.start(
+                symbol, created_at=created_at, partition=partition.partition, offset=offset, score=score
+            )
+            if not self.classifier.receive(symbol, score, ack=ack, partition=partition.partition, trace=trace):
+                # 버퍼가 가득 참 → 이 offset부터 다시 읽음 (다른 consumer 스레드와 credit 경쟁 시)
+                tracer.discard(trace)
+                if ack:
+                    self.tracker.untrack(partition, offset)
+                consumer.seek(partition, offset)
+                break
+
+    def _apply_backpressure(self, consumer, credits: int):
+        if not self.paused and credits <= 0:
+            consumer.pause(*consumer.assignment())
+            self.paused = True
+            self.stall.begin()
+            log.info("[⏸️ Kafka 수신 중지] 분류기 버퍼 가득 참")
+        elif self.paused and credits >= RESUME_CREDITS:
+            consumer.resume(*consumer.paused())
+            self.paused = False
+            self.stall.end()
+            log.info("[▶️ Kafka 수신 재개] credit {credits}", credits=credits)
+        elif self.paused:
+            # 리밸런스로 새로 할당된 파티션도 멈춤 상태 유지
+            consumer.pause(*consumer.assignment())
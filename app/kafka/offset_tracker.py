@@ -0,0 +1,80 @@
+# app/kafka/offset_tracker.py
+
+import threading
+from typing import Callable
+
+
+class OffsetTracker:
+    """
+    파티션별 처리 완료 offset 추적 (commit-after-persist)
+    - 수신한 메시지마다 track()으로 ack 함수를 받아 처리가 끝나면 호출
+    - 커밋 가능한 offset = 아직 ack되지 않은 가장 작은 offset
+      (모두 ack되었으면 마지막 offset + 1) → 앞선 메시지가 끝나기 전에는 커밋하지 않음
+    - ack는 어느 스레드에서 호출해도 됨, 커밋은 consumer 스레드에서 수행
+    """
+
+    def __init__(self):
+        self._unacked: dict = {}  # TopicPartition → 처리 중인 offset 집합
+        self._next: dict = {}  # TopicPartition → 마지막 수신 offset + 1
+        self._committed: dict = {}  # TopicPartition → 마지막으로 커밋한 offset
+        self._lock = threading.Lock()
+
+    def track(self, partition, offset: int) -> Callable[[], None]:
+        """
+        :return: 처리 완료 시 호출할 ack 함수 (여러 번 호출해도 한 번만 반영)
+        """
+        with self._lock:
+            self._unacked.setdefault(partition, set()).add(offset)
+            self._next[partition] = max(self._next.get(partition, 0), offset + 1)
+
+        def ack():
+            with self._lock:
+                unacked = self._unacked.get(partition)
+                if unacked is not None:
+                    unacked.discard(offset)
+
+        return ack
+
+    def untrack(self, partition, offset: int):
+        """
+        받지 못하고 되돌린 메시지 (seek으로 다시 읽을 예정) → 해당 offset부터 다시 추적
+        """
+        with self._lock:
+            unacked = self._unacked.get(partition)
+            if unacked is not None:
+                unacked.discard(offset)
+            self._next[partition] = min(self._next.get(partition, offset), offset)
+            if unacked:
+                # 되돌린 offset 이후의 추적분도 다시 수신하므로 제거
+                self._unacked[partition] = {o for o in unacked if o < offset}
+
+    def committable(self) -> dict:
+        """
+        :return: {TopicPartition: 커밋할 offset} (마지막 커밋 이후 전진한 파티션만)
+        """
+        with self._lock:
+            offsets = {}
+            for partition, next_offset in self._next.items():
+                unacked = self._unacked.get(partition)
+                offset = min(unacked) if unacked else next_offset
+                if offset > self._committed.get(partition, -1):
+                    offsets[partition] = offset
+            return offsets
+
+    def mark_committed(self, offsets: dict):
+        with self._lock:
+            for partition, offset in offsets.items():
+                self._committed[partition] = max(self._committed.get(partition, -1), offset)
+
+    def forget(self, partitions):
+        """리밸런스로 회수된 파티션 정보 삭제 (처리 중이던 메시지는 새 소유자가 다시 받음)"""
+        with self._lock:
+            for partition in partitions:
+                self._unacked.pop(partition, None)
+                self._next.pop(partition, None)
+                self._committed.pop(partition, None)
+
+    def pending(self) -> int:
+        """ack 대기 중인 메시지 수"""
+        with self._lock:
+            return sum(len(offsets) for offsets in self._unacked.values())
@@ -0,0 +1,131 @@
+# app/kafka/symbol_sharding.py
+
+import threading
+
+from kafka.partitioner.default import murmur2
+
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import dropped
+from app.monitoring.tracing import tracer
+
+log = get_logger("shards")
+
+
+def partition_for(symbol: str, num_partitions: int) -> int:
+    """
+    심볼 → 파티션 (Kafka 기본 파티셔너와 같은 murmur2 해시)
+    - producer가 심볼을 key로 보내면 같은 심볼은 항상 같은 파티션 → 같은 인스턴스가 담당
+    """
+    return (murmur2(symbol.encode("utf-8")) & 0x7FFFFFFF) % num_partitions
+
+
+class ShardOwnership:
+    """
+    인스턴스가 담당하는 심볼 파티션 관리
+    - 담당 범위 = 이 인스턴스의 consumer 스레드들이 할당받은 파티션 (Kafka 그룹이 인스턴스 추가 / 종료 시 재분배)
+    - 파티션 회수 후 다시 할당받지 못하면(다른 인스턴스로 이동) 아직 수집 전인 해당 파티션 심볼을
+      분류기 버퍼 / 심볼 큐에서 제거 → 커밋 전 offset부터 새 담당 인스턴스가 다시 받으므로 중복 수집 없음
+    - 수집 중인 심볼은 끝까지 처리 (저장 중복은 contents.content_hash UNIQUE + INSERT IGNORE가 처리)
+    """
+
+    def __init__(self, classifier=None, symbol_scheduler=None, coalescer=None):
+        """
+        :param classifier: 회수된 파티션 심볼을 버퍼에서 제거할 SymbolPriorityClassifier
+        :param symbol_scheduler: 회수된 파티션 심볼을 큐에서 제거할 PriorityScheduler
+        :param coalescer: 제거한 심볼의 대기 표시를 해제할 SymbolCoalescer
+        """
+        self.classifier = classifier
+        self.symbol_scheduler = symbol_scheduler
+        self.coalescer = coalescer
+        self.num_partitions = 0
+
+        self._assignments: dict[str, set[int]] = {}  # consumer 스레드 → 할당 파티션
+        self._revoking: dict[str, set[int]] = {}  # consumer 스레드 → 회수 후 재할당 대기 파티션
+        self._lock = threading.Lock()
+
+        self.rebalances = 0
+        self.dropped = 0
+        self.misrouted = 0
+
+    def owned(self) -> set[int]:
+        with self._lock:
+            return set().union(*self._assignments.values()) if self._assignments else set()
+
+    def revoked(self, owner: str, partitions):
+        """
+        파티션 회수 (리밸런스 시작) - 다시 할당될 수 있으므로 assigned()까지 정리를 미룸
+        """
+        with self._lock:
+            self._revoking.setdefault(owner, set()).update(partitions)
+
+    def assigned(self, owner: str, partitions, num_partitions: int = 0):
+        """
+        파티션 할당 (리밸런스 종료) → 다른 인스턴스로 넘어간 파티션의 대기 심볼 제거
+        """
+        with self._lock:
+            self._assignments[owner] = set(partitions)
+            if num_partitions:
+                self.num_partitions = num_partitions
+            revoking = self._revoking.pop(owner, set())
+            owned = set().union(*self._assignments.values())
+            lost = revoking - owned
+            self.rebalances += 1
+
+        log.info(
+            "[🧩 샤드] {owner} 담당 파티션 {partitions} (이동 {lost})",
+            owner=owner, partitions=sorted(partitions), lost=sorted(lost),
+        )
+        if lost:
+            self._drop(lost)
+
+    def leave(self, owner: str):
+        """
+        consumer 스레드 종료 → 다른 스레드가 담당하지 않는 파티션은 다른 인스턴스로 넘어가므로 대기 심볼 제거
+        """
+        with self._lock:
+            partitions = self._assignments.pop(owner, set()) | self._revoking.pop(owner, set())
+            owned = set().union(*self._assignments.values()) if self._assignments else set()
+            lost = partitions - owned
+
+        if lost:
+            self._drop(lost)
+
+    def check_key(self, symbol: str, partition: int) -> bool:
+        """
+        심볼이 key 해시 파티션으로 들어왔는지 확인 (key 없이 보낸 메시지 감지)
+        """
+        if not self.num_partitions or partition_for(symbol, self.num_partitions) == partition:
+            return True
+        with self._lock:
+            self.misrouted += 1
+        return False
+
+    def _drop(self, lost: set[int]):
+        def from_lost(message) -> bool:
+            return getattr(message, "partition", None) in lost
+
+        removed = []
+        if self.classifier is not None:
+            removed += self.classifier.remove(from_lost)
+        if self.symbol_scheduler is not None:
+            removed += self.symbol_scheduler.remove(from_lost)
+        for message in removed:
+            if self.coalescer is not None:
+                self.coalescer.discard(message.symbol)
+            tracer.finish(getattr(message, "trace", None), "handed_off")
+
+        with self._lock:
+            self.dropped += len(removed)
+        dropped.inc(len(removed), reason="shard_moved")
+        log.info("[🧩 샤드] 이동한 파티션 {lost}의 대기 심볼 {count}개 제거", lost=sorted(lost), count=len(removed))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "partitions": sorted(set().union(*self._assignments.values())) if self._assignments else [],
+                "num_partitions": self.num_partitions,
+                "consumers": len(self._assignments),
+                "rebalances": self.rebalances,
+                "dropped_on_rebalance": self.dropped,
+                "misrouted_messages": self.misrouted,
+            }
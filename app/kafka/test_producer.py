@@ -1,42 +1,351 @@
 # test_producer.py
+# 심볼 메시지 부하 생성 / 기록 재생 도구
+#
+# python -m app.kafka.test_producer                                   # AAPL 1건 (기존 동작)
+# python -m app.kafka.test_producer --rate 200 --duration 300 --symbols 3000 --zipf 1.1 \
+#     --profile market-open --burst 5 --metrics-url http://localhost:8082/metrics
+# python -m app.kafka.test_producer --rate 50 --duration 60 --record rebalance-day.jsonl --dry-run
+# python -m app.kafka.test_producer --replay rebalance-day.jsonl --speed 2
 
+import argparse
+import bisect
+import itertools
 import json
+import math
 import random
+import re
 import time
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Optional
 from kafka import KafkaProducer
 
+from app.kafka.kafka_simple_consumer import parse_created_at
+
 KAFKA_TOPIC = "symbol.crawl.priority"
 BOOTSTRAP_SERVERS = "localhost:9092"
 
-# 테스트용 심볼 목록
-# SYMBOLS = ["AAPL", "TSLA", "GOOG", "AMZN", "MSFT", "NVDA", "NFLX", "META"]
-SYMBOLS = ["AAPL"]
+# 테스트용 심볼 목록 (--symbols가 이보다 크면 SYM00001 형식으로 채움)
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOG", "META", "TSLA", "AVGO", "NFLX", "AMD"]
+
+# 점수 분포 (기존: 30 ~ 100 균등)
+DEFAULT_SCORE = "uniform:30:100"
+
+# 부하 형태: steady (일정) / market-open (시작 직후 burst 후 지수 감소) / spike (중간에 burst 구간)
+PROFILES = ("steady", "market-open", "spike")
+
+# 지연 시간 지표 (크롤러 /metrics)
+LATENCY_METRIC = "crawler_message_latency_seconds"
+
+
+class SymbolUniverse:
+    """
+    Zipf 분포 심볼 선택 (순위 r의 선택 확률 ∝ 1 / r^s)
+    """
+
+    def __init__(self, size: int, zipf_s: float = 1.1, symbols: list[str] = SYMBOLS):
+        """
+        :param size: 심볼 수
+        :param zipf_s: Zipf 지수 (0이면 균등, 클수록 상위 심볼에 집중)
+        """
+        self.symbols = list(symbols[:size]) + [f"SYM{i:05d}" for i in range(len(symbols), size)]
+        weights = [1 / (rank ** zipf_s) for rank in range(1, size + 1)]
+        total = sum(weights)
+        self.cumulative = list(itertools.accumulate(weight / total for weight in weights))
+
+    def pick(self, rng: random.Random) -> tuple[str, int]:
+        """:return: (심볼, 순위 0부터)"""
+        rank = min(bisect.bisect_left(self.cumulative, rng.random()), len(self.symbols) - 1)
+        return self.symbols[rank], rank
+
+
+def parse_score_distribution(spec: str) -> Callable[[random.Random, int, int], int]:
+    """
+    점수 분포 (0 ~ 100으로 자름)
+    - uniform:LOW:HIGH  균등
+    - normal:MEAN:STD   정규
+    - rank:TOP:STD      인기 순위가 높을수록 높은 점수 (1위 ≈ TOP, 꼴찌 ≈ TOP - 60) + 정규 잡음
+
+    :return: score(rng, rank, universe_size)
+    """
+    name, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(":")] if params else []
+    if name == "uniform":
+        low, high = values or (30, 100)
+        return lambda rng, rank, size: _clamp(rng.uniform(low, high))
+    if name == "normal":
+        mean, std = values or (60, 15)
+        return lambda rng, rank, size: _clamp(rng.gauss(mean, std))
+    if name == "rank":
+        top, std = values or (95, 10)
+        return lambda rng, rank, size: _clamp(rng.gauss(top - 60 * rank / max(size - 1, 1), std))
+    raise ValueError(f"알 수 없는 점수 분포: {spec} (uniform / normal / rank)")
+
+
+def _clamp(score: float) -> int:
+    return min(max(int(round(score)), 0), 100)
+
 
-producer = KafkaProducer(
-    bootstrap_servers=BOOTSTRAP_SERVERS,
-    value_serializer=lambda v: json.dumps(v).encode("utf-8")
-)
+def rate_multiplier(profile: str, elapsed: float, duration: float, burst: float, burst_seconds: float) -> float:
+    """
+    시점별 전송 속도 배수
 
-def generate_test_message():
-    symbol = random.choice(SYMBOLS)
-    score = random.randint(30, 100)  # 30 ~ 100 사이 점수
-    created_at = datetime.utcnow().isoformat()
+    :param burst: burst 구간 최대 배수
+    :param burst_seconds: burst 구간 길이 (market-open은 감소 시간 상수의 3배)
+    """
+    if profile == "market-open":
+        return 1 + (burst - 1) * math.exp(-3 * elapsed / burst_seconds)
+    if profile == "spike":
+        start = (duration - burst_seconds) / 2
+        return burst if start <= elapsed < start + burst_seconds else 1.0
+    return 1.0
 
+
+def make_message(symbol: str, score: int, created_at: Optional[datetime] = None) -> dict:
     return {
         "symbol": symbol,
         "score": score,
-        "createdAt": created_at
+        "createdAt": (created_at or datetime.now(timezone.utc)).isoformat(),
     }
 
-if __name__ == "__main__":
-    print("🚀 테스트 메시지 전송 시작")
 
-    for _ in range(1):  # 메시지 10개 전송
-        msg = generate_test_message()
-        producer.send(KAFKA_TOPIC, value=msg)
-        print(f"[📤 전송됨] {msg}")
-        time.sleep(1)  # 1초 간격으로 전송
+def generate_test_message() -> dict:
+    """기존 단건 테스트 메시지 (AAPL, 30 ~ 100 균등 점수)"""
+    return make_message("AAPL", random.randint(30, 100))
+
+
+def generate_schedule(
+    rate: float,
+    duration: float,
+    universe: SymbolUniverse,
+    score: Callable,
+    profile: str = "steady",
+    burst: float = 1.0,
+    burst_seconds: float = 60,
+    seed: int = 0,
+) -> Iterator[tuple[float, str, int]]:
+    """
+    전송 계획 (Poisson 도착, 속도 = rate × rate_multiplier)
+
+    :return: (시작 후 전송 시각 초, 심볼, 점수) 순서대로
+    """
+    rng = random.Random(seed)
+    elapsed = 0.0
+    while True:
+        elapsed += rng.expovariate(rate * rate_multiplier(profile, elapsed, duration, burst, burst_seconds))
+        if elapsed >= duration:
+            return
+        symbol, rank = universe.pick(rng)
+        yield elapsed, symbol, score(rng, rank, len(universe.symbols))
+
+
+def load_replay(path: str, speed: float = 1.0) -> list[tuple[float, str, int]]:
+    """
+    기록된 메시지(JSON lines, --record 결과 또는 토픽 덤프) → 전송 계획
+    - createdAt 간격을 그대로 유지 (speed배 빠르게), 전송 시 createdAt은 현재 시각으로 교체
+    - createdAt이 없는 줄은 앞 메시지와 같은 시각
+    """
+    entries = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            message = json.loads(line)
+            timestamp = parse_created_at(message.get("createdAt"))
+            entries.append((timestamp, message["symbol"], int(message["score"])))
+
+    schedule = []
+    first = next((timestamp for timestamp, _, _ in entries if timestamp is not None), None)
+    offset = 0.0
+    for timestamp, symbol, score in entries:
+        if timestamp is not None and first is not None:
+            offset = max((timestamp - first) / speed, offset)
+        schedule.append((offset, symbol, score))
+    return schedule
+
+
+class KafkaSink:
+    """심볼을 key로 전송 (같은 심볼 → 같은 파티션 → 같은 크롤러 인스턴스)"""
+
+    def __init__(self, bootstrap_servers: str = BOOTSTRAP_SERVERS, topic: str = KAFKA_TOPIC):
+        self.topic = topic
+        self.producer = KafkaProducer(
+            bootstrap_servers=bootstrap_servers,
+            value_serializer=lambda v: json.dumps(v).encode("utf-8"),
+            linger_ms=5,
+        )
+
+    def send(self, message: dict):
+        self.producer.send(self.topic, key=message["symbol"].encode("utf-8"), value=message)
+
+    def close(self):
+        self.producer.flush()
+        self.producer.close()
 
-    producer.flush()
-    print("✅ 전송 완료")
+
+def run_load(schedule, send: Callable[[dict], None], record_file=None, report_interval: float = 10) -> dict:
+    """
+    전송 계획대로 전송 (계획보다 늦으면 기다리지 않고 바로 전송)
+
+    :param send: send(message)
+    :param record_file: 전송한 메시지를 JSON lines로 기록할 파일 (--replay 입력)
+    :return: 전송 수 / 실제 속도 / 계획 대비 최대 지연 / 초당 전송 수 최대값 / 심볼 분포
+    """
+    started = time.perf_counter()
+    sent = 0
+    max_lag = 0.0
+    per_second = Counter()
+    symbols = Counter()
+    next_report = report_interval
+
+    for offset, symbol, score in schedule:
+        wait = offset - (time.perf_counter() - started)
+        if wait > 0:
+            time.sleep(wait)
+        else:
+            max_lag = max(max_lag, -wait)
+
+        message = make_message(symbol, score)
+        send(message)
+        if record_file is not None:
+            record_file.write(json.dumps(message) + "\n")
+        sent += 1
+        per_second[int(offset)] += 1
+        symbols[symbol] += 1
+
+        if offset >= next_report:
+            print(f"[📤 전송 중] {offset:6.0f}s  누적 {sent}건  최근 1초 {per_second[int(offset) - 1]}건")
+            next_report += report_interval
+
+    elapsed = time.perf_counter() - started
+    return {
+        "sent": sent,
+        "elapsed_s": round(elapsed, 3),
+        "rate": round(sent / elapsed, 1) if elapsed else 0.0,
+        "peak_per_second": max(per_second.values(), default=0),
+        "max_lag_s": round(max_lag, 3),
+        "unique_symbols": len(symbols),
+        "top_symbols": symbols.most_common(5),
+    }
+
+
+_SAMPLE_PATTERN = re.compile(r'^(\w+)\{(.*)\}\s+(\S+)$')
+
+
+def scrape_latency(metrics_url: str) -> dict:
+    """
+    크롤러 /metrics에서 createdAt 기준 지연 시간 히스토그램 (status별 {le: 누적 개수})
+    """
+    import requests
+
+    response = requests.get(metrics_url, timeout=5)
+    response.raise_for_status()
+    histograms: dict[str, dict[float, float]] = {}
+    for line in response.text.splitlines():
+        match = _SAMPLE_PATTERN.match(line)
+        if not match or match.group(1) != f"{LATENCY_METRIC}_bucket":
+            continue
+        labels = dict(re.findall(r'(\w+)="([^"]*)"', match.group(2)))
+        le = math.inf if labels["le"] == "+Inf" else float(labels["le"])
+        histograms.setdefault(labels.get("status", ""), {})[le] = float(match.group(3))
+    return histograms
+
+
+def histogram_quantile(buckets: dict[float, float], q: float) -> Optional[float]:
+    """
+    누적 구간 개수 → 분위수 (구간 안은 선형 보간, Prometheus histogram_quantile과 같은 방식)
+    """
+    bounds = sorted(buckets)
+    total = buckets.get(math.inf, 0)
+    if not bounds or total <= 0:
+        return None
+    target = q * total
+    previous_bound, previous_count = 0.0, 0.0
+    for bound in bounds:
+        count = buckets[bound]
+        if count >= target:
+            if bound == math.inf:
+                return previous_bound
+            if count == previous_count:
+                return bound
+            return previous_bound + (bound - previous_bound) * (target - previous_count) / (count - previous_count)
+        previous_bound, previous_count = bound, count
+    return previous_bound
+
+
+def latency_report(before: dict, after: dict) -> dict:
+    """실행 전후 히스토그램 차이 → status별 개수 / p50 / p99"""
+    report = {}
+    for status, buckets in after.items():
+        delta = {le: count - before.get(status, {}).get(le, 0) for le, count in buckets.items()}
+        count = delta.get(math.inf, 0)
+        if count <= 0:
+            continue
+        report[status] = {
+            "count": int(count),
+            "p50_s": histogram_quantile(delta, 0.5),
+            "p99_s": histogram_quantile(delta, 0.99),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="심볼 메시지 부하 생성 / 기록 재생")
+    parser.add_argument("--bootstrap-servers", default=BOOTSTRAP_SERVERS)
+    parser.add_argument("--topic", default=KAFKA_TOPIC)
+    parser.add_argument("--rate", type=float, default=0, help="초당 메시지 수 (0이면 AAPL 1건만 전송)")
+    parser.add_argument("--duration", type=float, default=60, help="전송 시간 (초)")
+    parser.add_argument("--symbols", type=int, default=1000, help="심볼 수")
+    parser.add_argument("--zipf", type=float, default=1.1, help="심볼 인기 Zipf 지수 (0이면 균등)")
+    parser.add_argument("--score", default=DEFAULT_SCORE, help="uniform:LOW:HIGH / normal:MEAN:STD / rank:TOP:STD")
+    parser.add_argument("--profile", choices=PROFILES, default="steady")
+    parser.add_argument("--burst", type=float, default=5.0, help="burst 구간 최대 속도 배수")
+    parser.add_argument("--burst-seconds", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", default=None, help="기록된 메시지 파일 (JSON lines) 재생")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 속도 배수")
+    parser.add_argument("--record", default=None, help="전송한 메시지를 JSON lines로 기록")
+    parser.add_argument("--dry-run", action="store_true", help="Kafka로 보내지 않음 (--record로 계획만 기록)")
+    parser.add_argument("--metrics-url", default=None, help="크롤러 /metrics (createdAt 기준 지연 시간 보고)")
+    parser.add_argument("--drain-seconds", type=float, default=30, help="전송 후 지연 시간 집계 전 대기 시간")
+    args = parser.parse_args()
+
+    if args.replay:
+        schedule = load_replay(args.replay, args.speed)
+        print(f"🚀 기록 재생: {args.replay} {len(schedule)}건 (x{args.speed})")
+    elif args.rate > 0:
+        universe = SymbolUniverse(args.symbols, args.zipf)
+        schedule = generate_schedule(
+            args.rate, args.duration, universe, parse_score_distribution(args.score),
+            profile=args.profile, burst=args.burst, burst_seconds=args.burst_seconds, seed=args.seed,
+        )
+        print(f"🚀 부하 전송: {args.rate}/s × {args.duration:.0f}s, 심볼 {args.symbols}개 (zipf {args.zipf}), {args.profile}")
+    else:
+        message = generate_test_message()
+        schedule = [(0.0, message["symbol"], message["score"])]
+        print("🚀 테스트 메시지 전송 시작")
+
+    sink = None if args.dry_run else KafkaSink(args.bootstrap_servers, args.topic)
+    send = sink.send if sink else (lambda message: None)
+    before = scrape_latency(args.metrics_url) if args.metrics_url else None
+
+    record_file = open(args.record, "w", encoding="utf-8") if args.record else None
+    try:
+        stats = run_load(schedule, send, record_file)
+    finally:
+        if record_file is not None:
+            record_file.close()
+        if sink is not None:
+            sink.close()
+    print(f"✅ 전송 완료: {json.dumps(stats, ensure_ascii=False)}")
+
+    if before is not None:
+        print(f"[⏳ 대기] 처리 완료까지 {args.drain_seconds:.0f}초")
+        time.sleep(args.drain_seconds)
+        report = latency_report(before, scrape_latency(args.metrics_url))
+        print(f"[⏱️ createdAt → 처리 완료] {json.dumps(report, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
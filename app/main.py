@@ -1,16 +1,30 @@
 # uvicorn app.main:app --host 0.0.0.0 --port 8082 --reload
-from fastapi import FastAPI
+from fastapi import FastAPI, Query, Response
 from app.models.base import Base
 from app.database.connection import engine
+from app.database.migrations import ensure_columns
 from sqlalchemy.orm import sessionmaker
 from app.routes import content_router  
-from app.kafka.kafka_simple_consumer import KafkaSimpleConsumer
-from app.ranking.symbol_priority_classifier import SymbolPriorityClassifier
-from app.queue.symbol_to_url_router import SymbolToUrlQueueRouter
+from app.kafka.kafka_simple_consumer import KafkaSimpleConsumer, CONSUMER_THREADS
+from app.kafka.symbol_sharding import ShardOwnership
+from app.ranking.symbol_priority_classifier import SymbolPriorityClassifier, MAX_QUEUE_SIZE
+from app.queue.symbol_to_url_router import SymbolToUrlQueueRouter, MAX_URL_QUEUE_SIZE
 from app.worker.content_worker_pool import ContentWorkerPool
+from app.worker.worker_autoscaler import WorkerAutoscaler
+from app.queue.priority_scheduler import PriorityScheduler
+from app.queue.backpressure import stall_stats
+from app.queue.symbol_coalescer import SymbolCoalescer
+from app.queue.spool import open_spool
+from app.crawler.downloader import content_writer
+from app.crawler.dedup_index import dedup_index
+from app.crawler.politeness import politeness
+from app.services.content_service import on_contents_saved
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import registry, gauge, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.monitoring.tracing import tracer
 
-from queue import Queue  # ✅ 교체 포인트: thread-safe queue 사용
 import threading
+from typing import Optional
 
 app = FastAPI(
     title="Finstage Content Crawler",
@@ -20,24 +34,46 @@ app = FastAPI(
 
 app.include_router(content_router.router)
 
+# ✅ 새 기사 저장 시 목록 응답 캐시 무효화
+content_writer.add_listener(on_contents_saved)
+
 # ✅ 테이블 자동 생성
 Base.metadata.create_all(bind=engine)
 
+# ✅ 기존 테이블에 url_hash / write_token 컬럼 추가 (백필 / 인덱스: python -m app.database.migrations)
+ensure_columns(engine)
+
 # ✅ 큐 구성 (thread-safe)
-symbol_queue_top = Queue()
-symbol_queue_mid = Queue()
-symbol_queue_bot = Queue()
+# 등급별 처리 비율 (모든 등급이 밀려 있을 때 TOP:MID:BOT)
+SYMBOL_SHARES = {"TOP": 5, "MID": 3, "BOT": 2}
+URL_SHARES = {"TOP": 5, "MID": 3, "BOT": 2}
+
+# 심볼 / URL 스케줄러: 등급별 큐는 스케줄러의 뷰 (queue.Queue 인터페이스)
+# 등급별 크기 제한 → 가득 차면 앞 단계가 대기 (라우터 → 분류기 버퍼 → Kafka pause)
+# SPOOL_DIR 설정 시 디스크 스풀에도 기록 → 재시작해도 분류 / 수집된 작업 유지
+symbol_spool = open_spool("symbols")
+url_spool = open_spool("urls")
+symbol_scheduler = PriorityScheduler(shares=SYMBOL_SHARES, maxsize=MAX_QUEUE_SIZE, spool=symbol_spool)
+url_scheduler = PriorityScheduler(shares=URL_SHARES, maxsize=MAX_URL_QUEUE_SIZE, spool=url_spool)
+
+symbol_queue_top = symbol_scheduler.tier("TOP")
+symbol_queue_mid = symbol_scheduler.tier("MID")
+symbol_queue_bot = symbol_scheduler.tier("BOT")
+
+url_queue_top = url_scheduler.tier("TOP")
+url_queue_mid = url_scheduler.tier("MID")
+url_queue_bot = url_scheduler.tier("BOT")
 
-url_queue_top = Queue()
-url_queue_mid = Queue()
-url_queue_bot = Queue()
+# ✅ 같은 심볼 중복 수집 방지 (대기 / 수집 중 병합, 최근 수집 심볼 건너뜀)
+symbol_coalescer = SymbolCoalescer()
 
 # ✅ 심볼 분류기 (점수 기반으로 우선순위 큐에 배정)
 symbol_classifier = SymbolPriorityClassifier(
     queue_top=symbol_queue_top,
     queue_mid=symbol_queue_mid,
     queue_bot=symbol_queue_bot,
-    use_threadsafe_queue=True
+    use_threadsafe_queue=True,
+    coalescer=symbol_coalescer
 )
 
 # ✅ URL 라우터 (심볼 큐 → bfs → URL 큐)
@@ -48,37 +84,154 @@ symbol_router = SymbolToUrlQueueRouter(
     url_queue_top=url_queue_top,
     url_queue_mid=url_queue_mid,
     url_queue_bot=url_queue_bot,
-    use_threadsafe_queue=True
+    use_threadsafe_queue=True,
+    symbol_scheduler=symbol_scheduler,
+    coalescer=symbol_coalescer
+)
+
+# ✅ 샤드 담당 범위 (인스턴스 = Kafka 그룹 멤버, 심볼 key 파티션 단위로 분배)
+shard_ownership = ShardOwnership(
+    classifier=symbol_classifier,
+    symbol_scheduler=symbol_scheduler,
+    coalescer=symbol_coalescer
 )
 
 # ✅ 워커 풀 (URL 큐 → HTML 수집 → DB 저장)
 SessionFactory = sessionmaker(bind=engine)
 content_worker_pool = ContentWorkerPool(
     db_session_factory=SessionFactory,
-    url_queue_top=url_queue_top,
-    url_queue_mid=url_queue_mid,
-    url_queue_bot=url_queue_bot,
-    use_threadsafe_queue=True
+    use_threadsafe_queue=True,
+    scheduler=url_scheduler
 )
 
+# ✅ 워커 수 자동 조절 (대기 건수 / 처리 시간 / DB 커밋 지연 기준)
+worker_autoscaler = WorkerAutoscaler(
+    content_worker_pool,
+    commit_latency=lambda: content_writer.commit_latency_ewma,
+)
+
+kafka_consumers: list[KafkaSimpleConsumer] = []
+
+log = get_logger("main")
+
+# ✅ /metrics 게이지 (요청 시점에 큐 길이 / 대기 건수를 읽음)
+queue_depth = gauge("crawler_queue_depth", "파이프라인 큐 대기 건수", ("queue", "tier"))
+for _tier in ("TOP", "MID", "BOT"):
+    queue_depth.set_function(lambda tier=_tier: symbol_scheduler.qsize(tier), queue="symbol", tier=_tier)
+    queue_depth.set_function(lambda tier=_tier: url_scheduler.qsize(tier), queue="url", tier=_tier)
+gauge("crawler_classifier_buffer_size", "분류기 버퍼에 보관 중인 심볼 수").set_function(
+    lambda: len(symbol_classifier.buffer)
+)
+gauge("crawler_writer_pending", "배치 저장 대기 레코드 수").set_function(lambda: content_writer.pending.qsize())
+gauge("crawler_workers", "콘텐츠 워커 스레드 수").set_function(lambda: content_worker_pool.size())
+stall_seconds = gauge("crawler_stall_seconds", "단계별 누적 정체 시간 (초)", ("stage",))
+
 @app.on_event("startup")
 def startup_event():
-    print("크롤링 시스템 초기화 시작...")
+    log.info("크롤링 시스템 초기화 시작...")
+
+    # 0. 중복 인덱스 로드 (content_urls / contents)
+    dedup_index.load(SessionFactory)
 
-    # 1. 전면 큐 라우터 실행
+    # 1. 분류기 버퍼 flush 타이머 + 전면 큐 라우터 실행
+    symbol_classifier.start()
     threading.Thread(target=symbol_router.start, daemon=True).start()
 
     # 2. 워커 풀 실행
     content_worker_pool.start()
+    worker_autoscaler.start()
+
+    # 3. Kafka Consumer 실행 (같은 그룹으로 CONSUMER_THREADS개, 파티션을 나눠 수신)
+    for _ in range(CONSUMER_THREADS):
+        consumer = KafkaSimpleConsumer(symbol_classifier, ownership=shard_ownership)
+        consumer.start()
+        kafka_consumers.append(consumer)
+
+    log.info("✅ Kafka consumer + 라우터 + 워커 실행 완료")
+
 
-    # 3. Kafka Consumer 실행 (classifier만 넘김)
-    consumer = KafkaSimpleConsumer(symbol_classifier)
-    consumer.start()
+@app.on_event("shutdown")
+def shutdown_event():
+    # 수신 중지 + 처리 완료 offset 커밋
+    for consumer in kafka_consumers:
+        consumer.stop()
+    for consumer in kafka_consumers:
+        consumer.join(timeout=5)
 
-    print("✅ Kafka consumer + 라우터 + 워커 실행 완료")
+    # 워커 종료 후 배치 저장 대기 중인 레코드를 모두 저장
+    worker_autoscaler.stop()
+    content_worker_pool.stop()
+    content_writer.stop()
+
+    # 남은 큐 항목을 디스크에 반영 (다음 시작 시 복구)
+    for spool in (symbol_spool, url_spool):
+        if spool is not None:
+            spool.close()
+
+    # 남은 trace 전송
+    tracer.stop()
 
 
 @app.get("/health", tags=["Health"])
 def health():
     return {"status": "ok", "message": "Finstage Crawler is running"}
 
+
+@app.get("/metrics", tags=["Health"])
+def metrics():
+    """Prometheus 수집용 지표 (큐 길이 / 단계별 지연 시간 히스토그램 / 중복 / 버린 항목 수)"""
+    for stage, stats in stall_stats().items():
+        stall_seconds.set(stats["total_seconds"], stage=stage)
+    return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/stats/queues", tags=["Health"])
+def queue_stats():
+    """등급별 대기 건수 / 대기 시간(초)"""
+    return {"symbol": symbol_scheduler.stats(), "url": url_scheduler.stats()}
+
+
+
+@app.get("/stats/symbols", tags=["Health"])
+def symbol_stats():
+    """심볼 병합 / 최근 수집 건너뜀 횟수"""
+    return symbol_coalescer.stats()
+
+
+@app.get("/stats/shards", tags=["Health"])
+def shard_stats():
+    """이 인스턴스가 담당하는 파티션 / 리밸런스 횟수 / key 불일치 메시지 수"""
+    return shard_ownership.stats()
+
+
+@app.get("/stats/politeness", tags=["Health"])
+def politeness_stats():
+    """도메인별 요청 제한 / backoff 중인 도메인 / robots.txt 차단 수"""
+    return politeness.stats()
+
+
+@app.get("/stats/backpressure", tags=["Health"])
+def backpressure_stats():
+    """단계별 정체 시간 (Kafka 수신 중지 / 라우터 URL 큐 대기 / 저장 대기열 대기)"""
+    return stall_stats()
+
+
+@app.get("/stats/workers", tags=["Health"])
+def worker_stats():
+    """워커 수 / 처리 시간 / 커밋 지연 / 최근 자동 조절 결정"""
+    return worker_autoscaler.stats()
+
+
+@app.get("/debug/traces", tags=["Health"])
+def debug_traces(symbol: Optional[str] = None, status: Optional[str] = None, limit: int = Query(20, ge=1, le=500), active: bool = False):
+    """
+    심볼별 처리 구간 (Kafka 수신 → 분류기 → 심볼 큐 → BFS → URL 큐 → 워커 → DB 커밋)
+
+    :param symbol: 이 심볼의 trace만
+    :param status: done / failed / merged / skipped / handed_off / incomplete
+    :param active: True면 진행 중 trace도 포함
+    """
+    result = {"summary": tracer.summary(), "traces": tracer.traces(symbol, status, limit)}
+    if active:
+        result["active"] = tracer.active(symbol, limit)
+    return result
@@ -1,20 +1,35 @@
-from sqlalchemy import Column, BigInteger, String, Text, DateTime, Boolean
+from sqlalchemy import Column, BigInteger, Integer, String, CHAR, Text, DateTime, Boolean, Index
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 from app.models.base import Base
+from app.models.content_body import ContentBody
 
 class Content(Base):
     __tablename__ = "contents"
+    __table_args__ = (
+        Index("ix_contents_url_hash", "url_hash"),
+        Index("ix_contents_symbol_crawled_at", "symbol", "crawled_at"),
+        Index("ix_contents_crawled_at", "crawled_at"),
+    )
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True, comment="PK")
+    # SQLite는 INTEGER PK만 자동 증가 (로컬 DB로 여러 인스턴스를 실행할 때 사용)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True, comment="PK")
     symbol = Column(String(20), nullable=False, comment="종목 티커 (예: TSLA)")
     title = Column(Text, nullable=False, comment="기사 제목")
     summary = Column(Text, nullable=True, comment="기사 요약 또는 본문 일부")
     url = Column(Text, nullable=False, comment="기사 원본 URL")
-    html = Column(Text, nullable=False, comment="기사 원본 URL")
+    url_hash = Column(CHAR(64), nullable=True, comment="URL SHA-256 해시 (URL 조회용 인덱스)")
+    # HTML_STORAGE="inline"일 때만 채움 (기본은 content_bodies에 압축 저장, 여기는 빈 문자열)
+    # 목록 조회가 읽지 않도록 지연 로딩
+    html = deferred(Column(Text, nullable=False, comment="기사 원본 HTML (inline 저장 방식)"))
     source = Column(String(255), nullable=True, comment="출처 도메인 (예: reuters.com)")
     crawled_at = Column(DateTime, nullable=False, default=datetime.utcnow, comment="크롤링 시각")
     content_hash = Column(String(64), nullable=False, unique=True, comment="중복 방지를 위한 콘텐츠 해시")
     is_duplicate = Column(Boolean, default=False, comment="중복 여부")
+    write_token = Column(CHAR(32), nullable=True, comment="배치 저장 토큰 (INSERT IGNORE로 실제 삽입된 행 확인용)")
+
+    # 압축 원본 HTML (접근할 때만 조회)
+    body = relationship(ContentBody, uselist=False, lazy="select", passive_deletes=True)
 
 
     def __repr__(self):
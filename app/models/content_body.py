@@ -0,0 +1,28 @@
+# app/models/content_body.py
+
+from sqlalchemy import Column, BigInteger, Integer, String, Boolean, LargeBinary, ForeignKey
+from sqlalchemy.dialects.mysql import MEDIUMBLOB
+
+from app.models.base import Base
+
+
+class ContentBody(Base):
+    """
+    기사 원본 HTML (압축) - 목록 조회가 읽지 않도록 contents와 분리
+    """
+    __tablename__ = "content_bodies"
+
+    content_id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        ForeignKey("contents.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="contents.id",
+    )
+    codec = Column(String(10), nullable=False, comment="압축 방식 (zstd / gzip / none)")
+    charset = Column(String(40), nullable=True, comment="원본 응답 문자셋 (본문은 UTF-8로 저장)")
+    raw_size = Column(Integer, nullable=False, comment="압축 전 크기 (bytes)")
+    truncated = Column(Boolean, nullable=False, default=False, comment="최대 크기에서 잘렸는지 여부")
+    body = Column(LargeBinary().with_variant(MEDIUMBLOB(), "mysql"), nullable=False, comment="압축된 HTML")
+
+    def __repr__(self):
+        return f"<ContentBody(content_id={self.content_id}, codec='{self.codec}', raw_size={self.raw_size})>"
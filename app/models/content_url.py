@@ -1,6 +1,6 @@
 # app/models/content_url.py
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, CHAR, DateTime, Index
 
 
 from app.models.base import Base
@@ -8,9 +8,13 @@ from app.models.base import Base
 
 class ContentUrl(Base):
     __tablename__ = "content_urls"
+    __table_args__ = (
+        Index("ix_content_urls_url_hash", "url_hash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     symbol = Column(String(255), nullable=False)
     url = Column(String(1024), nullable=False)
+    url_hash = Column(CHAR(64), nullable=True, comment="URL SHA-256 해시 (URL 조회용 인덱스)")
     source = Column(String(50), nullable=True, comment="수집 출처")
 
@@ -0,0 +1,227 @@
+# app/monitoring/logger.py
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+# 출력 레벨 (DEBUG로 바꾸면 URL 삽입 / 페이지 요청 등 항목별 로그까지 출력)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# 출력 형식: "text" (사람이 읽는 메시지) / "json" (한 줄에 JSON 하나, 필드 포함)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+# 같은 메시지(템플릿)를 초당 최대 몇 번 출력할지 (0이면 제한 없음)
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", "10"))
+
+# 제한 전에 한꺼번에 출력할 수 있는 개수
+LOG_RATE_BURST = int(os.getenv("LOG_RATE_BURST", "20"))
+
+# ERROR 이상은 더 크게 허용 (장애 직후 원인 로그가 생략되지 않도록)
+LOG_ERROR_BURST = int(os.getenv("LOG_ERROR_BURST", "100"))
+
+# 생략된 로그 개수를 출력하는 주기 (초, 같은 템플릿이 다시 출력되지 않아도 표시)
+LOG_SUPPRESSED_FLUSH_INTERVAL = float(os.getenv("LOG_SUPPRESSED_FLUSH_INTERVAL", "10"))
+
+ROOT_LOGGER = "crawler"
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """
+    출력 시점의 sys.stdout에 기록 (기존 print와 같은 출력 위치, 벤치마크의 stdout 전환도 그대로 적용)
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s %(message)s")
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    """crawler.* 로거 출력 설정 (다시 호출하면 레벨 / 형식만 바꿈)"""
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.propagate = False
+    handler = next((h for h in root.handlers if isinstance(h, _StdoutHandler)), None)
+    if handler is None:
+        handler = _StdoutHandler()
+        root.addHandler(handler)
+    handler.setFormatter(_JsonFormatter() if fmt == "json" else _TextFormatter())
+
+
+class _RateLimit:
+    """메시지 템플릿별 토큰 버킷 (초과분은 개수와 마지막 필드만 기억했다가 다음 출력 / 주기 출력에 표시)"""
+
+    def __init__(self, rate: float, burst: int, level: int):
+        self.rate = rate
+        self.burst = burst
+        self.level = level
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.suppressed = 0
+        self.last_fields: dict = {}
+
+    def acquire(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.suppressed += 1
+        return False
+
+
+class _SuppressedFlusher:
+    """
+    생략된 로그 개수를 주기적으로 출력하는 데몬 스레드 (처음 생략될 때 시작)
+    - 같은 템플릿이 다시 출력되지 않아도 생략 개수가 사라지지 않음
+    """
+
+    def __init__(self, interval: float = LOG_SUPPRESSED_FLUSH_INTERVAL):
+        self.interval = interval
+        self._loggers: list["StructuredLogger"] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, logger: "StructuredLogger"):
+        with self._lock:
+            self._loggers.append(logger)
+
+    def ensure_started(self):
+        if self._thread is not None or self.interval <= 0:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-flusher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            loggers = list(self._loggers)
+        for logger in loggers:
+            logger.flush_suppressed()
+
+
+class StructuredLogger:
+    """
+    레벨 + 필드 기반 로거
+    - log.info("[✅ URL 수집 완료] {symbol} → {count}개", symbol=symbol, count=n)
+      → text 형식은 메시지만, json 형식은 필드도 별도 키로 출력
+    - 꺼진 레벨은 메시지를 만들지 않고 바로 반환 (항목별 로그는 debug로 두면 기본 설정에서 비용 없음)
+    - 같은 템플릿이 LOG_RATE_LIMIT을 넘으면 생략하고 생략한 개수를 다음 출력에 붙임
+      (ERROR 이상은 burst를 LOG_ERROR_BURST로 크게 허용, 생략 개수는 LOG_SUPPRESSED_FLUSH_INTERVAL마다 출력)
+    """
+
+    def __init__(
+        self, name: str, rate: float = LOG_RATE_LIMIT, burst: int = LOG_RATE_BURST, error_burst: int = LOG_ERROR_BURST
+    ):
+        self._logger = logging.getLogger(f"{ROOT_LOGGER}.{name}")
+        self.rate = rate
+        self.burst = burst
+        self.error_burst = error_burst
+        self._limits: dict[str, _RateLimit] = {}
+        self._lock = threading.Lock()
+        _flusher.register(self)
+
+    def enabled(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def debug(self, template: str, **fields):
+        self._log(logging.DEBUG, template, fields)
+
+    def info(self, template: str, **fields):
+        self._log(logging.INFO, template, fields)
+
+    def warning(self, template: str, **fields):
+        self._log(logging.WARNING, template, fields)
+
+    def error(self, template: str, exc_info: bool = False, **fields):
+        self._log(logging.ERROR, template, fields, exc_info=exc_info)
+
+    def _log(self, level: int, template: str, fields: dict, exc_info: bool = False):
+        if not self._logger.isEnabledFor(level):
+            return
+
+        suppressed = 0
+        if self.rate > 0:
+            with self._lock:
+                limit = self._limits.get(template)
+                if limit is None:
+                    burst = self.error_burst if level >= logging.ERROR else self.burst
+                    limit = self._limits[template] = _RateLimit(self.rate, burst, level)
+                if not limit.acquire():
+                    limit.last_fields = fields
+                    _flusher.ensure_started()
+                    return
+                suppressed, limit.suppressed = limit.suppressed, 0
+
+        self._emit(level, template, fields, suppressed, exc_info)
+
+    def flush_suppressed(self):
+        """생략된 개수가 남은 템플릿마다 마지막 필드로 한 줄 출력"""
+        pending = []
+        with self._lock:
+            for template, limit in self._limits.items():
+                if limit.suppressed:
+                    pending.append((limit.level, template, limit.last_fields, limit.suppressed))
+                    limit.suppressed = 0
+        for level, template, fields, suppressed in pending:
+            self._emit(level, template, fields, suppressed)
+
+    def _emit(self, level: int, template: str, fields: dict, suppressed: int, exc_info: bool = False):
+        try:
+            message = template.format(**fields) if fields else template
+        except (KeyError, IndexError, ValueError):
+            message = f"{template} {fields}"
+        if suppressed:
+            message = f"{message} (같은 로그 {suppressed}건 생략)"
+            fields = {**fields, "suppressed": suppressed}
+        self._logger.log(level, message, exc_info=exc_info, extra={"fields": fields})
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """
+    :param name: 모듈 구분 이름 (crawler.<name> 로거로 출력)
+    """
+    return StructuredLogger(name)
+
+
+# ✅ 모든 StructuredLogger가 공유하는 생략 개수 출력 스레드
+_flusher = _SuppressedFlusher()
+
+configure_logging()
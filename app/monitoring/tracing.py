@@ -0,0 +1,464 @@
+# app/monitoring/tracing.py
+
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from queue import Queue, Empty, Full
+from typing import Optional
+
+import requests
+
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import histogram, dropped
+
+# 완료된 trace를 보관하는 개수 (/debug/traces, 오래된 것부터 삭제)
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "500"))
+
+# 진행 중인 trace 최대 개수 (넘으면 가장 오래된 것을 incomplete로 종료)
+MAX_ACTIVE_TRACES = 5000
+
+# Kafka 메시지 중 trace를 남길 비율 (0 ~ 1)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+
+# OTLP/HTTP(JSON) 수집기 주소 (예: http://localhost:4318), 없으면 내보내지 않음
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+OTLP_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "finstage-content-crawler")
+
+# 한 번에 보내는 trace 수 / 전송 주기 (초) / 전송 대기 최대 trace 수
+OTLP_BATCH_SIZE = 100
+OTLP_EXPORT_INTERVAL = 2.0
+OTLP_MAX_QUEUE = 2000
+OTLP_TIMEOUT = 5
+
+log = get_logger("tracing")
+
+stage_seconds = histogram(
+    "crawler_trace_stage_seconds",
+    "trace 구간별 소요 시간 (초, 큐 대기 포함)",
+    ("stage",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+message_latency = histogram(
+    "crawler_message_latency_seconds",
+    "메시지 createdAt(producer)부터 trace 종료까지 시간 (초, status별)",
+    ("status",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    end: float
+    attributes: dict = field(default_factory=dict)
+    span_id: str = field(default_factory=lambda: _new_id(64))
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "start": self.start,
+            "duration": round(self.duration, 6),
+            **({"attributes": self.attributes} if self.attributes else {}),
+        }
+
+
+class Trace:
+    """
+    Kafka 메시지 하나(심볼)의 파이프라인 기록
+    - 단계마다 구간(Span)을 추가: 분류기 → 심볼 큐 대기 → BFS → URL 큐 대기 → 워커 → DB 커밋
+    - URL마다 워커 / 커밋 구간이 따로 기록되고, 라우터가 넘긴 URL이 모두 저장되면 종료
+    - 시각은 epoch 초 (OTLP 전송 시 그대로 사용)
+    """
+
+    def __init__(self, symbol: str, attributes: dict, created_at: Optional[float] = None):
+        """
+        :param created_at: 메시지 createdAt (epoch 초, producer 시각)
+        """
+        self.trace_id = _new_id(128)
+        self.root_span_id = _new_id(64)
+        self.symbol = symbol
+        self.attributes = attributes
+        self.started_at = time.time()
+        self.created_at = created_at
+        self.ended_at: Optional[float] = None
+        self.status = "active"
+        self.spans: list[Span] = []
+        self.marks: dict[str, float] = {}
+        self._pending_urls = 0
+        self._routed = False
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def mark(self, name: str):
+        """구간 시작 시각 기록 (since()로 구간 추가)"""
+        self.marks[name] = time.time()
+
+    def since(self, mark: str, name: str, **attributes) -> Optional[Span]:
+        """mark() 시각부터 지금까지를 구간으로 추가 (mark가 없으면 무시)"""
+        start = self.marks.get(mark)
+        if start is None:
+            return None
+        return self.add_span(name, start, **attributes)
+
+    def add_span(self, name: str, start: float, end: Optional[float] = None, **attributes) -> Span:
+        span = Span(name, start, end if end is not None else time.time(), attributes)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def event(self, name: str, **attributes) -> Span:
+        """길이 0인 구간 (병합 등)"""
+        now = time.time()
+        return self.add_span(name, now, now, **attributes)
+
+    def url_queued(self):
+        with self._lock:
+            self._pending_urls += 1
+
+    def url_done(self, failed: bool = False) -> bool:
+        """
+        :param failed: 재시도를 모두 넘겨 저장하지 못함 (trace를 "failed"로 종료)
+        :return: 라우팅이 끝났고 남은 URL이 없으면 True (trace 종료)
+        """
+        with self._lock:
+            self._pending_urls -= 1
+            self._failed = self._failed or failed
+            return self._routed and self._pending_urls <= 0
+
+    @property
+    def failed(self) -> bool:
+        return self._failed
+
+    def routed(self) -> bool:
+        """:return: 워커에서 처리 중인 URL이 없으면 True (trace 종료)"""
+        with self._lock:
+            self._routed = True
+            return self._pending_urls <= 0
+
+    @property
+    def duration(self) -> float:
+        return (self.ended_at or time.time()) - self.started_at
+
+    @property
+    def latency(self) -> Optional[float]:
+        """createdAt부터 종료(진행 중이면 지금)까지 (createdAt이 없으면 None)"""
+        if self.created_at is None:
+            return None
+        return max((self.ended_at or time.time()) - self.created_at, 0.0)
+
+    def stages(self) -> dict:
+        """
+        구간 이름별 경과 시간 (초)
+        - URL별 구간은 병렬로 겹치므로 합계 대신 첫 시작 ~ 마지막 끝
+        """
+        ranges: dict[str, tuple[float, float]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            start, end = ranges.get(span.name, (span.start, span.end))
+            ranges[span.name] = (min(start, span.start), max(end, span.end))
+        return {name: round(end - start, 6) for name, (start, end) in ranges.items()}
+
+    def to_dict(self, include_spans: bool = True) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        entry = {
+            "trace_id": self.trace_id,
+            "symbol": self.symbol,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration": round(self.duration, 6),
+            "latency": round(self.latency, 6) if self.created_at is not None else None,
+            "attributes": self.attributes,
+            "stages": self.stages(),
+        }
+        if include_spans:
+            entry["spans"] = [span.to_dict() for span in spans]
+        return entry
+
+
+class OtlpHttpExporter:
+    """
+    완료된 trace를 OTLP/HTTP JSON 형식으로 수집기에 전송 ({endpoint}/v1/traces)
+    - export()는 대기열에 넣기만 하고 전송은 백그라운드 스레드가 배치로 처리
+    - 대기열이 가득 차면 버림 (파이프라인을 막지 않음)
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = OTLP_SERVICE_NAME,
+        batch_size: int = OTLP_BATCH_SIZE,
+        interval: float = OTLP_EXPORT_INTERVAL,
+        max_queue: int = OTLP_MAX_QUEUE,
+    ):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pending: Queue = Queue(maxsize=max_queue)
+        self.session = requests.Session()
+        self.exported = 0
+        self.failed = 0
+        self.running = True
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def export(self, trace: Trace):
+        self._ensure_started()
+        try:
+            self.pending.put_nowait(trace)
+        except Full:
+            dropped.inc(reason="trace_export_queue_full")
+
+    def stop(self):
+        """남은 trace를 전송한 뒤 종료"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=OTLP_TIMEOUT * 2)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="otlp-exporter")
+                self._thread.start()
+
+    def _run(self):
+        while self.running or not self.pending.empty():
+            batch = []
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0 or (not self.running and self.pending.empty()):
+                    break
+                try:
+                    batch.append(self.pending.get(timeout=min(timeout, 0.1)))
+                except Empty:
+                    continue
+            if batch:
+                self._send(batch)
+
+    def _send(self, traces: list[Trace]):
+        try:
+            response = self.session.post(self.url, json=to_otlp(traces, self.service_name), timeout=OTLP_TIMEOUT)
+            response.raise_for_status()
+            self.exported += len(traces)
+        except Exception as e:
+            self.failed += len(traces)
+            log.warning("[❌ trace 전송 실패] {url} {count}건 - {error}", url=self.url, count=len(traces), error=e)
+
+
+def _otlp_attributes(attributes: dict) -> list[dict]:
+    converted = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            wrapped = {"boolValue": value}
+        elif isinstance(value, int):
+            wrapped = {"intValue": str(value)}
+        elif isinstance(value, float):
+            wrapped = {"doubleValue": value}
+        else:
+            wrapped = {"stringValue": str(value)}
+        converted.append({"key": key, "value": wrapped})
+    return converted
+
+
+def _nanos(seconds: float) -> str:
+    return str(int(seconds * 1_000_000_000))
+
+
+def to_otlp(traces: list[Trace], service_name: str = OTLP_SERVICE_NAME) -> dict:
+    """
+    OTLP/JSON ExportTraceServiceRequest
+    - trace 전체 = root span (symbol.pipeline), 단계별 구간 = 자식 span
+    """
+    spans = []
+    for trace in traces:
+        status_code = 2 if trace.status in ("failed", "incomplete") else 1  # ERROR / OK
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": trace.root_span_id,
+            "name": "symbol.pipeline",
+            "kind": 4,  # CONSUMER
+            "startTimeUnixNano": _nanos(min(trace.created_at or trace.started_at, trace.started_at)),
+            "endTimeUnixNano": _nanos(trace.ended_at or time.time()),
+            "attributes": _otlp_attributes({"symbol": trace.symbol, "status": trace.status, **trace.attributes}),
+            "status": {"code": status_code},
+        })
+        with trace._lock:
+            children = list(trace.spans)
+        for span in children:
+            spans.append({
+                "traceId": trace.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": trace.root_span_id,
+                "name": span.name,
+                "kind": 1,  # INTERNAL
+                "startTimeUnixNano": _nanos(span.start),
+                "endTimeUnixNano": _nanos(span.end),
+                "attributes": _otlp_attributes(span.attributes),
+            })
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{"scope": {"name": "app.monitoring.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+class Tracer:
+    """
+    진행 중 / 최근 완료 trace 관리
+    - 진행 중: trace_id → Trace (URL 메시지에는 trace_id만 넣어서 스풀에도 그대로 저장 가능)
+    - 완료: 크기 제한 ring buffer + 구간별 히스토그램(crawler_trace_stage_seconds) + 선택적 OTLP 전송
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = TRACE_BUFFER_SIZE,
+        max_active: int = MAX_ACTIVE_TRACES,
+        sample_rate: float = TRACE_SAMPLE_RATE,
+        exporter: Optional[OtlpHttpExporter] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.max_active = max_active
+        self.exporter = exporter
+        self._active: OrderedDict[str, Trace] = OrderedDict()
+        self._finished: deque[Trace] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    def start(self, symbol: str, created_at: Optional[float] = None, **attributes) -> Optional[Trace]:
+        """
+        :param created_at: 메시지 createdAt (epoch 초, 있으면 수신까지를 kafka.wait 구간으로 기록)
+        :return: 새 Trace (샘플링에서 빠지면 None)
+        """
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return None
+        trace = Trace(symbol, attributes, created_at)
+        if created_at is not None and created_at <= trace.started_at:
+            trace.add_span("kafka.wait", created_at, trace.started_at)
+        evicted = None
+        with self._lock:
+            self._active[trace.trace_id] = trace
+            if len(self._active) > self.max_active:
+                _, evicted = self._active.popitem(last=False)
+        if evicted is not None:
+            self.finish(evicted, "incomplete")
+        return trace
+
+    def get(self, trace_id: Optional[str]) -> Optional[Trace]:
+        if trace_id is None:
+            return None
+        with self._lock:
+            return self._active.get(trace_id)
+
+    def discard(self, trace: Optional[Trace]):
+        """기록하지 않고 삭제 (다시 수신할 메시지)"""
+        if trace is None:
+            return
+        with self._lock:
+            self._active.pop(trace.trace_id, None)
+
+    def finish(self, trace: Optional[Trace], status: str = "done", **attributes):
+        if trace is None:
+            return
+        with self._lock:
+            self._active.pop(trace.trace_id, None)
+            if trace.ended_at is not None:
+                return
+            trace.ended_at = time.time()
+            trace.status = status
+            trace.attributes.update(attributes)
+            self._finished.append(trace)
+
+        for name, seconds in trace.stages().items():
+            stage_seconds.observe(seconds, stage=name)
+        if trace.created_at is not None:
+            message_latency.observe(trace.latency, status=status)
+        if self.exporter is not None:
+            self.exporter.export(trace)
+
+    def url_done(self, trace: Optional[Trace], failed: bool = False):
+        """
+        URL 하나 처리 끝 (마지막이면 trace 종료)
+        - 저장 / 중복이면 바로 호출, 실패면 워커가 재시도를 포기한 뒤 failed=True로 호출
+
+        :param failed: 저장하지 못한 URL이 있으면 trace를 "failed"로 종료
+        """
+        if trace is not None and trace.url_done(failed):
+            self.finish(trace, "failed" if trace.failed else "done")
+
+    def routed(self, trace: Optional[Trace], status: str = "done"):
+        """라우터 처리 완료 (워커에 넘긴 URL이 없으면 바로 종료)"""
+        if trace is not None and trace.routed():
+            self.finish(trace, "failed" if trace.failed else status)
+
+    def traces(self, symbol: Optional[str] = None, status: Optional[str] = None, limit: int = 50) -> list[dict]:
+        """최근 완료 trace (최신순)"""
+        with self._lock:
+            finished = list(self._finished)
+        selected = [
+            trace for trace in reversed(finished)
+            if (symbol is None or trace.symbol == symbol) and (status is None or trace.status == status)
+        ]
+        return [trace.to_dict() for trace in selected[:limit]]
+
+    def active(self, symbol: Optional[str] = None, limit: int = 50) -> list[dict]:
+        """진행 중 trace (오래된 순)"""
+        with self._lock:
+            active = [trace for trace in self._active.values() if symbol is None or trace.symbol == symbol]
+        return [trace.to_dict() for trace in active[:limit]]
+
+    def summary(self) -> dict:
+        """최근 완료 trace 기준 구간별 소요 시간 (어느 단계가 병목인지)"""
+        with self._lock:
+            finished = list(self._finished)
+            active = len(self._active)
+
+        per_stage: dict[str, list[float]] = {}
+        for trace in finished:
+            for name, seconds in trace.stages().items():
+                per_stage.setdefault(name, []).append(seconds)
+
+        stages = {}
+        for name, values in per_stage.items():
+            values.sort()
+            stages[name] = {
+                "count": len(values),
+                "avg": round(sum(values) / len(values), 6),
+                "p50": values[len(values) // 2],
+                "p95": values[min(int(len(values) * 0.95), len(values) - 1)],
+                "max": values[-1],
+            }
+
+        durations = sorted(trace.duration for trace in finished)
+        return {
+            "active": active,
+            "finished": len(finished),
+            "duration_p50": durations[len(durations) // 2] if durations else 0.0,
+            "duration_max": durations[-1] if durations else 0.0,
+            "stages": stages,
+        }
+
+    def stop(self):
+        if self.exporter is not None:
+            self.exporter.stop()
+
+
+# ✅ 프로세스 전체에서 공유하는 tracer
+tracer = Tracer(exporter=OtlpHttpExporter(OTLP_ENDPOINT) if OTLP_ENDPOINT else None)
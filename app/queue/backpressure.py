@@ -0,0 +1,89 @@
+# app/queue/backpressure.py
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+class StallMeter:
+    """
+    단계별 정체(stall) 시간 측정
+    - 다음 단계에 여유가 없어 대기한 횟수 / 누적 시간 / 현재 진행 중인 대기 시간
+    - 여러 스레드가 같은 meter를 공유하므로 대기 중인 스레드 수(active)를 셈
+      (정체 시간 = 한 스레드라도 대기 중인 구간, 마지막 스레드가 끝날 때 구간 종료)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0  # 스레드별 대기 횟수
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.active = 0  # 지금 대기 중인 스레드 수
+        self._started_at: Optional[float] = None  # 정체 구간 시작 (active가 0 → 1이 된 시각)
+        self._lock = threading.Lock()
+
+    def begin(self):
+        """스레드 하나 대기 시작 (begin / end는 스레드마다 짝을 맞춰 호출)"""
+        with self._lock:
+            self.count += 1
+            self.active += 1
+            if self.active == 1:
+                self._started_at = time.monotonic()
+
+    def end(self):
+        """스레드 하나 대기 종료 (대기 중인 스레드가 없으면 무시)"""
+        with self._lock:
+            if self.active == 0:
+                return
+            self.active -= 1
+            if self.active > 0:
+                return
+            elapsed = time.monotonic() - self._started_at
+            self._started_at = None
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    @contextmanager
+    def measure(self):
+        self.begin()
+        try:
+            yield
+        finally:
+            self.end()
+
+    @property
+    def stalled(self) -> bool:
+        return self.active > 0
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            current = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+            return {
+                "stalled": self.active > 0,
+                "waiting": self.active,
+                "count": self.count,
+                "total_seconds": self.total_seconds + current,
+                "max_seconds": max(self.max_seconds, current),
+                "current_seconds": current,
+            }
+
+
+_meters: dict[str, StallMeter] = {}
+_meters_lock = threading.Lock()
+
+
+def stall_meter(name: str) -> StallMeter:
+    """이름별 StallMeter (같은 이름이면 같은 객체)"""
+    with _meters_lock:
+        meter = _meters.get(name)
+        if meter is None:
+            meter = _meters[name] = StallMeter(name)
+        return meter
+
+
+def stall_stats() -> dict:
+    """전체 단계의 정체 시간"""
+    with _meters_lock:
+        meters = list(_meters.values())
+    return {meter.name: meter.to_dict() for meter in meters}
@@ -0,0 +1,275 @@
+# app/queue/priority_scheduler.py
+
+import threading
+import time
+from collections import deque
+from queue import Empty, Full
+from typing import Optional
+
+TIERS = ("TOP", "MID", "BOT")
+
+# 모든 등급에 작업이 쌓여 있을 때의 처리 비율 (기존 워커 스레드 비율 5:3:2)
+DEFAULT_SHARES = {"TOP": 5, "MID": 3, "BOT": 2}
+
+# 대기 시간 이동 평균 가중치
+WAIT_EWMA_ALPHA = 0.2
+
+_STRIDE = 1_000_000
+
+
+class TierStats:
+    def __init__(self):
+        self.enqueued = 0
+        self.dequeued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_ewma = 0.0
+
+    def record_wait(self, wait: float):
+        self.dequeued += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        self.wait_ewma = wait if self.dequeued == 1 else (
+            WAIT_EWMA_ALPHA * wait + (1 - WAIT_EWMA_ALPHA) * self.wait_ewma
+        )
+
+    def to_dict(self, depth: int) -> dict:
+        return {
+            "depth": depth,
+            "enqueued": self.enqueued,
+            "dequeued": self.dequeued,
+            "wait_avg": self.wait_total / self.dequeued if self.dequeued else 0.0,
+            "wait_ewma": self.wait_ewma,
+            "wait_max": self.wait_max,
+        }
+
+
+class PriorityScheduler:
+    """
+    가중 공정 우선순위 스케줄러 (stride scheduling)
+    - 등급(TOP / MID / BOT)별 FIFO 큐 + 등급별 pass 값
+    - 꺼낼 때는 작업이 있는 등급 중 pass가 가장 작은 등급 선택 → 등급 pass += STRIDE / share
+      (모두 밀려 있으면 share 비율대로, 상위 등급이 비면 남는 처리량은 하위 등급이 사용)
+    - 동점이면 TOP → MID → BOT 순서
+    - 모든 소비자(워커)가 하나의 스케줄러에서 꺼내므로 등급별 전용 스레드가 필요 없음
+    - spool 지정 시 넣은 항목을 디스크에도 기록, 소비자가 ack()하면 삭제
+      (재시작 시 처리하지 못한 항목 복구)
+      스풀 행 id는 항목 자체에 담아서 전달 (dict면 "spool_id" 키, 객체면 spool_id 속성)
+    """
+
+    def __init__(self, shares: Optional[dict] = None, maxsize: int = 0, spool=None):
+        """
+        :param shares: 등급별 처리 비율 (기본값: DEFAULT_SHARES)
+        :param maxsize: 등급별 최대 크기 (0이면 무제한)
+        :param spool: SqliteSpool (None이면 메모리에만 보관)
+        """
+        self.shares = dict(shares or DEFAULT_SHARES)
+        self.maxsize = maxsize
+        self.spool = spool
+        self._queues = {tier: deque() for tier in TIERS}
+        self._passes = {tier: 0 for tier in TIERS}
+        self._stats = {tier: TierStats() for tier in TIERS}
+        self._virtual_time = 0
+        self._cond = threading.Condition()
+
+        if spool is not None:
+            # 이전 실행에서 처리하지 못한 항목 복구 (처리 중이던 항목 포함)
+            now = time.monotonic()
+            for spool_id, tier, item in spool.recover():
+                _set_spool_id(item, spool_id)
+                self._queues[tier].append((now, item))
+                self._stats[tier].enqueued += 1
+
+    def tier(self, tier: str) -> "TierQueue":
+        """등급 하나를 queue.Queue처럼 다루는 뷰"""
+        return TierQueue(self, tier)
+
+    def put(self, item, tier: str = "TOP", block: bool = False, timeout: Optional[float] = None):
+        """
+        :param block: 등급 큐가 가득 찼을 때 자리가 날 때까지 대기할지 여부
+        :param timeout: block=True일 때 대기 시간 (None이면 무한 대기)
+        :raises queue.Full: 등급 큐가 maxsize에 도달한 경우 (대기하지 않거나 timeout 초과)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            queue = self._queues[tier]
+            while self.maxsize and len(queue) >= self.maxsize:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    raise Full
+                self._cond.wait(remaining)
+            if not queue:
+                # 쉬고 있던 등급이 밀린 몫을 한꺼번에 가져가지 않도록 현재 시점으로 맞춤
+                self._passes[tier] = max(self._passes[tier], self._virtual_time)
+            if self.spool is not None:
+                _set_spool_id(item, self.spool.append(tier, item))
+            queue.append((time.monotonic(), item))
+            self._stats[tier].enqueued += 1
+            self._cond.notify_all()
+
+    def retry(self, item, tier: str = "TOP"):
+        """
+        꺼냈던 항목을 다시 넣음 (스풀 행은 그대로 사용, 저장 스레드 콜백에서도 막히지 않도록 maxsize 무시)
+        """
+        with self._cond:
+            queue = self._queues[tier]
+            if not queue:
+                self._passes[tier] = max(self._passes[tier], self._virtual_time)
+            queue.append((time.monotonic(), item))
+            self._stats[tier].enqueued += 1
+            self._cond.notify_all()
+
+    def get(self, timeout: Optional[float] = None, tiers=None):
+        """
+        다음 작업 꺼내기
+
+        :param timeout: 대기 시간 (None이면 무한 대기)
+        :param tiers: 꺼낼 수 있는 등급 제한 (None이면 전체)
+        :return: (tier, item)
+        :raises queue.Empty: timeout 동안 꺼낼 작업이 없는 경우
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                tier = self._select(tiers)
+                if tier is not None:
+                    return tier, self._pop(tier)
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise Empty
+                self._cond.wait(remaining)
+
+    def get_nowait(self, tiers=None):
+        return self.get(timeout=0, tiers=tiers)
+
+    def ack(self, item):
+        """
+        꺼낸 항목 처리 완료 → 스풀에서 삭제 (스풀이 없으면 아무 일도 하지 않음, 두 번째 ack는 무시)
+        """
+        if self.spool is None:
+            return
+        spool_id = _get_spool_id(item)
+        if spool_id is not None:
+            _set_spool_id(item, None)
+            self.spool.remove(spool_id)
+
+    def remove(self, predicate) -> list:
+        """
+        대기 중인 항목 중 조건에 맞는 것 제거 (스풀에서도 삭제)
+
+        :return: 제거한 항목
+        """
+        removed = []
+        with self._cond:
+            for tier, queue in self._queues.items():
+                kept = deque()
+                for entry in queue:
+                    if predicate(entry[1]):
+                        removed.append(entry)
+                    else:
+                        kept.append(entry)
+                self._queues[tier] = kept
+            if removed:
+                self._cond.notify_all()
+
+        items = [item for _, item in removed]
+        for item in items:
+            self.ack(item)
+        return items
+
+    def qsize(self, tier: Optional[str] = None) -> int:
+        with self._cond:
+            if tier is not None:
+                return len(self._queues[tier])
+            return sum(len(queue) for queue in self._queues.values())
+
+    def empty(self, tier: Optional[str] = None) -> bool:
+        return self.qsize(tier) == 0
+
+    def stats(self) -> dict:
+        """등급별 대기 건수 / 처리 건수 / 대기 시간(초)"""
+        with self._cond:
+            return {
+                tier: self._stats[tier].to_dict(len(self._queues[tier]))
+                for tier in TIERS
+            }
+
+    def _select(self, tiers) -> Optional[str]:
+        selected = None
+        for tier in TIERS:
+            if not self._queues[tier] or (tiers is not None and tier not in tiers):
+                continue
+            if selected is None or self._passes[tier] < self._passes[selected]:
+                selected = tier
+        return selected
+
+    def _pop(self, tier: str):
+        enqueued_at, item = self._queues[tier].popleft()
+        self._virtual_time = self._passes[tier]
+        self._passes[tier] += _STRIDE // max(self.shares.get(tier, 1), 1)
+        self._stats[tier].record_wait(time.monotonic() - enqueued_at)
+        if self.maxsize:
+            self._cond.notify_all()  # 자리가 나기를 기다리는 put() 깨움
+        return item
+
+
+def _get_spool_id(item) -> Optional[int]:
+    if isinstance(item, dict):
+        return item.get("spool_id")
+    return getattr(item, "spool_id", None)
+
+
+def _set_spool_id(item, spool_id: Optional[int]):
+    """id를 담을 수 없는 항목 (None 종료 신호 등)은 ack할 수 없으므로 그대로 둠"""
+    if isinstance(item, dict):
+        if spool_id is None:
+            item.pop("spool_id", None)
+        else:
+            item["spool_id"] = spool_id
+    elif hasattr(item, "__dict__"):
+        item.spool_id = spool_id
+
+
+class TierQueue:
+    """
+    스케줄러의 등급 하나를 queue.Queue 인터페이스로 감싼 뷰
+    - 분류기 / 라우터의 기존 qsize() / put_nowait() / get_nowait() 코드 그대로 사용 가능
+    """
+
+    def __init__(self, scheduler: PriorityScheduler, tier: str):
+        self.scheduler = scheduler
+        self.tier = tier
+
+    def put(self, item, block: bool = True, timeout: Optional[float] = None):
+        self.scheduler.put(item, self.tier, block=block, timeout=timeout)
+
+    def put_nowait(self, item):
+        self.scheduler.put(item, self.tier)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        return self.scheduler.get(timeout=timeout if block else 0, tiers=(self.tier,))[1]
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        return self.scheduler.qsize(self.tier)
+
+    def empty(self) -> bool:
+        return self.scheduler.empty(self.tier)
+
+    def task_done(self):
+        pass
+
+    def ack(self, item):
+        self.scheduler.ack(item)
+
+    def remove(self, item):
+        """
+        대기 중인 항목 하나 제거 (deque.remove처럼 동작)
+
+        :raises ValueError: 대기 중이 아님 (이미 꺼냄)
+        """
+        if not self.scheduler.remove(lambda other: other is item):
+            raise ValueError("대기 중인 항목이 아님")
@@ -0,0 +1,145 @@
+# app/queue/spool.py
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.monitoring.logger import get_logger
+
+# 디스크 스풀 디렉터리 (없으면 메모리 큐만 사용)
+SPOOL_DIR = os.getenv("SPOOL_DIR")
+
+# 쌓인 추가 / 삭제를 한 번의 커밋(fsync)으로 반영하는 주기 (초)
+SPOOL_SYNC_INTERVAL = 0.05
+
+# 체크포인트 후 WAL 파일 크기 상한 (bytes)
+SPOOL_WAL_LIMIT = 4 * 1024 * 1024
+
+log = get_logger("spool")
+
+
+class SqliteSpool:
+    """
+    SQLite(WAL) 기반 큐 스풀
+    - append()로 넣은 항목은 remove()로 처리 완료될 때까지 디스크에 남음
+      → 재시작 시 recover()로 처리하지 못한 항목을 순서대로 복구 (at-least-once)
+    - 추가 / 삭제는 메모리에 모았다가 SPOOL_SYNC_INTERVAL마다 한 번에 커밋 (묶음 fsync)
+      → 커밋 전에 추가 후 삭제된 항목은 디스크에 쓰지 않음
+    - 디스크 사용량은 큐 크기 + 처리 중 항목 수로 제한 (삭제된 페이지 재사용, WAL 크기 제한)
+    """
+
+    def __init__(self, path: str, sync_interval: float = SPOOL_SYNC_INTERVAL):
+        """
+        :param path: SQLite 파일 경로
+        :param sync_interval: 묶음 커밋 주기 (초)
+        """
+        self.path = path
+        self.sync_interval = sync_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(f"PRAGMA journal_size_limit={SPOOL_WAL_LIMIT}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spool ("
+            "id INTEGER PRIMARY KEY, tier TEXT NOT NULL, payload BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._next_id = (self._conn.execute("SELECT MAX(id) FROM spool").fetchone()[0] or 0) + 1
+        self._inserts: dict[int, tuple[str, bytes]] = {}
+        self._deletes: list[int] = []
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+
+        self.synced = 0
+        self.running = True
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name=f"spool-{os.path.basename(path)}")
+        self._flusher.start()
+
+    def recover(self) -> list[tuple[int, str, object]]:
+        """
+        :return: 처리되지 않은 항목 [(id, tier, item)] (넣은 순서)
+        """
+        started = time.monotonic()
+        with self._db_lock:
+            rows = self._conn.execute("SELECT id, tier, payload FROM spool ORDER BY id").fetchall()
+        items = [(row_id, tier, pickle.loads(payload)) for row_id, tier, payload in rows]
+        if items:
+            log.info(
+                "[💾 스풀 복구] {path} {count}건 ({elapsed_ms:.0f}ms)",
+                path=self.path, count=len(items), elapsed_ms=(time.monotonic() - started) * 1000,
+            )
+        return items
+
+    def append(self, tier: str, item) -> int:
+        """
+        :return: 스풀 항목 id (remove()에 사용)
+        """
+        payload = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            spool_id = self._next_id
+            self._next_id += 1
+            self._inserts[spool_id] = (tier, payload)
+        return spool_id
+
+    def remove(self, spool_id: int):
+        """처리 완료 항목 삭제"""
+        with self._lock:
+            if self._inserts.pop(spool_id, None) is None:
+                self._deletes.append(spool_id)
+
+    def flush(self):
+        """쌓인 추가 / 삭제를 한 트랜잭션으로 커밋"""
+        with self._lock:
+            inserts, self._inserts = self._inserts, {}
+            deletes, self._deletes = self._deletes, []
+        if not inserts and not deletes:
+            return
+
+        with self._db_lock:
+            if inserts:
+                self._conn.executemany(
+                    "INSERT INTO spool (id, tier, payload) VALUES (?, ?, ?)",
+                    [(spool_id, tier, payload) for spool_id, (tier, payload) in inserts.items()],
+                )
+            if deletes:
+                self._conn.executemany("DELETE FROM spool WHERE id = ?", [(spool_id,) for spool_id in deletes])
+            self._conn.commit()
+        self.synced += len(inserts) + len(deletes)
+
+    def _flush_loop(self):
+        while self.running:
+            time.sleep(self.sync_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                log.error("[❌ 스풀 저장 실패] {path} - {error}", path=self.path, error=e)
+
+    def size(self) -> int:
+        """디스크 + 커밋 대기 중인 항목 수"""
+        with self._db_lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+        with self._lock:
+            return stored + len(self._inserts) - len(self._deletes)
+
+    def close(self):
+        """남은 변경 커밋 후 종료"""
+        self.running = False
+        self._flusher.join()
+        self.flush()
+        with self._db_lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+
+
+def open_spool(name: str) -> Optional[SqliteSpool]:
+    """
+    SPOOL_DIR이 설정된 경우 {SPOOL_DIR}/{name}.db 스풀 생성
+    """
+    if not SPOOL_DIR:
+        return None
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    return SqliteSpool(os.path.join(SPOOL_DIR, f"{name}.db"))
@@ -0,0 +1,150 @@
+# app/queue/symbol_coalescer.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.ranking.symbol_priority_classifier import SymbolMessage
+from app.monitoring.logger import get_logger
+from app.monitoring.tracing import Trace, tracer
+
+# 최근 수집한 심볼을 다시 수집하지 않는 시간 (초)
+RECENT_CRAWL_TTL = float(os.getenv("RECENT_CRAWL_TTL", "60"))
+
+log = get_logger("coalescer")
+
+
+class SymbolCoalescer:
+    """
+    같은 심볼의 중복 수집 방지
+    - 대기 중(분류기 버퍼 / 심볼 큐)인 심볼이 다시 오면 기존 메시지에 병합
+      (점수는 큰 값, 수신 시각은 이른 값 유지, 점수가 오르면 분류기가 등급을 다시 배정)
+    - 수집 중인 심볼이 다시 오면 병합 (진행 중인 수집이 처리)
+    - RECENT_CRAWL_TTL 안에 수집을 마친 심볼은 건너뜀
+    """
+
+    def __init__(self, ttl: float = RECENT_CRAWL_TTL):
+        self.ttl = ttl
+        self._pending: dict[str, SymbolMessage] = {}
+        self._in_flight: dict[str, list] = {}  # 수집 중인 심볼 → 병합된 메시지 ack
+        self._last_crawled: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.admitted = 0
+        self.merged_pending = 0
+        self.merged_in_flight = 0
+        self.ttl_skipped = 0
+
+    def admit(
+        self,
+        symbol: str,
+        score: int,
+        received_at: Optional[float] = None,
+        ack=None,
+        partition: Optional[int] = None,
+        trace: Optional[Trace] = None,
+    ) -> Optional[SymbolMessage]:
+        """
+        새 심볼 메시지 등록
+
+        :param ack: 처리 완료 시 호출할 함수 (병합되면 병합 대상 수집이 끝날 때, 건너뛰면 즉시 호출)
+        :param trace: 이 메시지의 Trace (병합 / 건너뛰면 바로 종료)
+        :return: 큐에 넣을 새 메시지 / 병합 또는 건너뛴 경우 None
+        """
+        received_at = received_at or time.time()
+        with self._lock:
+            pending = self._pending.get(symbol)
+            if pending is not None:
+                pending.score = max(pending.score, score)
+                pending.received_at = min(pending.received_at, received_at)
+                if ack is not None:
+                    pending.acks.append(ack)
+                if trace is not None and pending.trace is not None:
+                    tracer.finish(trace, "merged", merged_into=pending.trace.trace_id)
+                else:
+                    tracer.finish(trace, "merged")
+                self.merged_pending += 1
+                log.debug("[🔗 병합] {symbol} 대기 중 (score={score})", symbol=symbol, score=pending.score)
+                return None
+
+            in_flight_acks = self._in_flight.get(symbol)
+            if in_flight_acks is not None:
+                if ack is not None:
+                    in_flight_acks.append(ack)
+                tracer.finish(trace, "merged")
+                self.merged_in_flight += 1
+                log.debug("[🔗 병합] {symbol} 수집 중", symbol=symbol)
+                return None
+
+            self._expire_recent()
+            crawled_at = self._last_crawled.get(symbol)
+            if crawled_at is None:
+                message = SymbolMessage(symbol, score, received_at, partition, trace=trace)
+                if ack is not None:
+                    message.acks.append(ack)
+                self._pending[symbol] = message
+                self.admitted += 1
+                return message
+
+            self.ttl_skipped += 1
+            tracer.finish(trace, "skipped")
+            log.debug("[⏭️ 건너뜀] {symbol} {age:.0f}초 전 수집", symbol=symbol, age=time.time() - crawled_at)
+
+        if ack is not None:
+            ack()
+        return None
+
+    def pending(self, symbol: str) -> Optional[SymbolMessage]:
+        """대기 중인 (아직 수집을 시작하지 않은) 메시지"""
+        with self._lock:
+            return self._pending.get(symbol)
+
+    def begin(self, symbol: str):
+        """라우터가 심볼을 꺼내 수집 시작"""
+        with self._lock:
+            self._pending.pop(symbol, None)
+            self._in_flight.setdefault(symbol, [])
+
+    def finish(self, symbol: str, success: bool = True):
+        """
+        수집 종료 (수집 중에 병합된 메시지도 함께 완료 처리)
+
+        :param success: 성공 시에만 TTL 적용 (실패하면 다음 메시지에서 바로 재시도)
+        """
+        with self._lock:
+            acks = self._in_flight.pop(symbol, [])
+            if success:
+                self._last_crawled[symbol] = time.time()
+                self._last_crawled.move_to_end(symbol)
+        for ack in acks:
+            ack()
+
+    def discard(self, symbol: str):
+        """큐에 넣지 못하고 버린 메시지의 대기 표시 해제"""
+        with self._lock:
+            self._pending.pop(symbol, None)
+
+    def _expire_recent(self):
+        # 수집 시각 순서로 유지되므로 앞에서부터 만료된 것만 제거
+        deadline = time.time() - self.ttl
+        while self._last_crawled:
+            symbol, crawled_at = next(iter(self._last_crawled.items()))
+            if crawled_at > deadline:
+                break
+            self._last_crawled.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire_recent()
+            return {
+                "ttl": self.ttl,
+                "pending": len(self._pending),
+                "in_flight": len(self._in_flight),
+                "recently_crawled": len(self._last_crawled),
+                "admitted": self.admitted,
+                "merged_pending": self.merged_pending,
+                "merged_in_flight": self.merged_in_flight,
+                "ttl_skipped": self.ttl_skipped,
+            }
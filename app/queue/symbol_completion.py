@@ -0,0 +1,85 @@
+# app/queue/symbol_completion.py
+
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.monitoring.logger import get_logger
+
+log = get_logger("completion")
+
+
+@dataclass
+class _Pending:
+    on_complete: Callable[[], None]
+    urls: int = 0  # 워커에 넘겼지만 저장 결과가 아직 없는 URL 수
+    sealed: bool = False  # 라우터가 URL을 모두 넘김
+
+
+class SymbolCompletion:
+    """
+    심볼 메시지 1건에서 나온 URL이 모두 저장(SAVED / DUPLICATE, 또는 재시도 포기)된 시점 추적
+    - 라우터: open() → URL마다 add() 후 URL 메시지에 completion_id 전달 → seal()
+    - 워커: 저장 결과가 나오면 done(completion_id)
+    - seal 이후 남은 URL이 0이 되면 on_complete 호출 (Kafka offset ack / 심볼 스풀 ack)
+    - URL 메시지는 디스크 스풀에 저장되므로 콜백 대신 id만 담음
+      (재시작 후 복구된 메시지의 id는 모르는 id → 무시, 해당 offset은 커밋되지 않았으므로 다시 수신)
+    """
+
+    def __init__(self):
+        self._pending: dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+
+    def open(self, on_complete: Callable[[], None]) -> str:
+        """
+        :return: completion_id (URL 메시지에 담아 워커로 전달)
+        """
+        completion_id = uuid.uuid4().hex
+        with self._lock:
+            self._pending[completion_id] = _Pending(on_complete)
+        return completion_id
+
+    def add(self, completion_id: str):
+        """URL 하나를 워커에 넘김"""
+        with self._lock:
+            self._pending[completion_id].urls += 1
+
+    def done(self, completion_id: Optional[str]):
+        """URL 하나의 저장 결과 수신"""
+        with self._lock:
+            pending = self._pending.get(completion_id)
+            if pending is None:
+                return
+            pending.urls -= 1
+            if not pending.sealed or pending.urls > 0:
+                return
+            del self._pending[completion_id]
+        self._run(pending)
+
+    def seal(self, completion_id: str):
+        """라우터 처리 끝 (넘긴 URL이 없거나 모두 저장되었으면 바로 완료)"""
+        with self._lock:
+            pending = self._pending.get(completion_id)
+            if pending is None:
+                return
+            pending.sealed = True
+            if pending.urls > 0:
+                return
+            del self._pending[completion_id]
+        self._run(pending)
+
+    def pending(self) -> int:
+        """저장을 기다리는 심볼 수"""
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self, pending: _Pending):
+        try:
+            pending.on_complete()
+        except Exception as e:
+            log.error("[❌ 심볼 완료 처리 실패] {error}", error=e)
+
+
+# ✅ 라우터 / 워커가 공유하는 완료 추적기
+symbol_completion = SymbolCompletion()
@@ -1,19 +1,33 @@
 import time
-from queue import Queue
+from queue import Queue, Empty
 from collections import deque
+from typing import Optional
 from app.crawler.bfs_url_extractor import bfs_extract_urls
 from app.ranking.symbol_priority_classifier import SymbolMessage
+from app.queue.priority_scheduler import PriorityScheduler
+from app.queue.backpressure import stall_meter
+from app.queue.symbol_completion import symbol_completion
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import dropped
+from app.monitoring.tracing import tracer
 
 # URL 큐 하나당 최대 크기
 MAX_URL_QUEUE_SIZE = 30
 
+# URL 큐가 가득 찼을 때 여유 공간 확인 간격 (초)
+URL_QUEUE_WAIT_INTERVAL = 0.05
+
+log = get_logger("router")
+
 
 class SymbolToUrlQueueRouter:
     """
     전면 큐 라우터
     - 심볼 우선순위 큐에서 하나씩 꺼내 BFS를 통해 URL 목록 수집
     - 수집한 URL들을 우선순위에 맞는 URL 큐에 삽입
-    - URL 큐가 가득 차면 대기 (심볼은 다시 큐에 보관하지 않음, 단순 대기)
+    - URL 큐가 가득 차면 자리가 날 때까지 대기 (수집한 URL은 버리지 않음)
+      → 라우터가 멈추면 심볼 큐 / 분류기 버퍼가 차고 Kafka consumer가 수신을 멈춤
+    - 심볼에서 나온 URL이 모두 DB에 저장된 뒤에 Kafka offset 커밋 허용 + 심볼 스풀 ack (symbol_completion)
     """
 
     def __init__(
@@ -24,7 +38,9 @@ class SymbolToUrlQueueRouter:
         url_queue_top,
         url_queue_mid,
         url_queue_bot,
-        use_threadsafe_queue=False
+        use_threadsafe_queue=False,
+        symbol_scheduler: PriorityScheduler = None,
+        coalescer=None
     ):
         """
         전면 큐 라우터 초기화
@@ -32,6 +48,8 @@ class SymbolToUrlQueueRouter:
         :param symbol_queue_*: 심볼 우선순위 큐
         :param url_queue_*: URL 우선순위 큐
         :param use_threadsafe_queue: Queue 사용 여부
+        :param symbol_scheduler: 심볼 스케줄러 (지정 시 TOP→MID→BOT 폴링 대신 스케줄러에서 대기)
+        :param coalescer: SymbolCoalescer (수집 시작 / 종료 알림)
         """
         self.symbol_queue_top = symbol_queue_top
         self.symbol_queue_mid = symbol_queue_mid
@@ -42,18 +60,25 @@ class SymbolToUrlQueueRouter:
         self.url_queue_bot = url_queue_bot
 
         self.use_threadsafe_queue = use_threadsafe_queue
+        self.symbol_scheduler = symbol_scheduler
+        self.coalescer = coalescer
 
         self.queue_map = {
             "TOP": (self.symbol_queue_top, self.url_queue_top),
             "MID": (self.symbol_queue_mid, self.url_queue_mid),
             "BOT": (self.symbol_queue_bot, self.url_queue_bot),
         }
+        self.stall = stall_meter("router.url_queue")
 
     def start(self):
         """
         전면 큐 라우터 실행 메서드 (무한 루프)
         """
-        print("🚀 [전면 큐 라우터] 시작됨.")
+        log.info("🚀 [전면 큐 라우터] 시작됨.")
+
+        if self.symbol_scheduler is not None:
+            self._run_scheduler()
+            return
 
         while True:
             processed = False
@@ -67,6 +92,29 @@ class SymbolToUrlQueueRouter:
                 # print("[⏳ 대기] 모든 심볼 큐가 비어 있음")
                 time.sleep(1)
 
+    def _run_scheduler(self):
+        """
+        스케줄러 모드: URL 큐에 여유가 있는 등급 중에서 가중 공정 순서로 심볼을 꺼냄
+        """
+        while True:
+            open_tiers = [
+                priority for priority, (_, url_queue) in self.queue_map.items()
+                if self._url_queue_size(url_queue) < MAX_URL_QUEUE_SIZE
+            ]
+            if not open_tiers:
+                time.sleep(0.2)
+                continue
+
+            try:
+                priority, symbol_msg = self.symbol_scheduler.get(timeout=1, tiers=open_tiers)
+            except Empty:
+                continue
+
+            self._route(priority, symbol_msg)
+
+    def _url_queue_size(self, url_queue) -> int:
+        return url_queue.qsize() if self.use_threadsafe_queue else len(url_queue)
+
     def _process(self, priority: str) -> bool:
         """
         지정된 우선순위 큐에서 심볼을 꺼내 URL 수집 후 URL 큐에 삽입
@@ -82,7 +130,7 @@ class SymbolToUrlQueueRouter:
                     return False
 
                 if url_queue.qsize() >= MAX_URL_QUEUE_SIZE:
-                    print(f"[⛔ 큐 FULL] {priority} URL 큐가 가득 참 → 대기")
+                    log.warning("[⛔ 큐 FULL] {tier} URL 큐가 가득 참 → 대기", tier=priority)
                     time.sleep(1)
                     return True
 
@@ -93,41 +141,106 @@ class SymbolToUrlQueueRouter:
                     return False
 
                 if len(url_queue) >= MAX_URL_QUEUE_SIZE:
-                    print(f"[⛔ 큐 FULL] {priority} URL 큐가 가득 참 → 대기")
+                    log.warning("[⛔ 큐 FULL] {tier} URL 큐가 가득 참 → 대기", tier=priority)
                     time.sleep(1)
                     return True
 
                 symbol_msg: SymbolMessage = symbol_queue.popleft()
 
         except Exception as e:
-            print(f"[❌ 큐 처리 실패] {priority} - {e}")
+            log.error("[❌ 큐 처리 실패] {tier} - {error}", tier=priority, error=e)
             return False
 
+        self._route(priority, symbol_msg)
+        return True
+
+    def _route(self, priority: str, symbol_msg: SymbolMessage):
+        """
+        심볼 하나에 대해 BFS로 URL 수집 후 URL 큐에 삽입
+        """
+        _, url_queue = self.queue_map[priority]
         symbol = symbol_msg.symbol
-        print(f"[🔍 심볼 처리] {priority} 큐 → {symbol}")
+        trace = symbol_msg.trace
+        log.debug("[🔍 심볼 처리] {tier} 큐 → {symbol}", tier=priority, symbol=symbol)
+        if trace is not None:
+            trace.since("symbol_queue", "symbol_queue.wait", tier=priority)
+
+        if self.coalescer is not None:
+            self.coalescer.begin(symbol)
+        # 워커에 넘긴 URL이 모두 저장되면 Kafka offset 커밋 허용 + 심볼 스풀에서 삭제
+        completion_id = symbol_completion.open(lambda: self._complete(symbol_msg))
+        success = False
+        try:
+            success = self._route_urls(priority, url_queue, symbol, trace, completion_id)
+        finally:
+            if self.coalescer is not None:
+                self.coalescer.finish(symbol, success=success)
+            # 넘긴 URL이 없거나 이미 모두 저장되었으면 바로 완료
+            symbol_completion.seal(completion_id)
+            # 워커에 넘긴 URL이 모두 저장되면 trace 종료 (넘긴 URL이 없으면 바로 종료)
+            tracer.routed(trace, "done" if success else "failed")
+
+    def _complete(self, symbol_msg: SymbolMessage):
+        """심볼 처리 완료 (저장 스레드 / 라우터 스레드에서 호출)"""
+        symbol_msg.complete()
+        if self.symbol_scheduler is not None:
+            self.symbol_scheduler.ack(symbol_msg)
+
+    def _route_urls(self, priority: str, url_queue, symbol: str, trace=None, completion_id: Optional[str] = None) -> bool:
+        """
+        BFS로 URL 수집 후 URL 큐에 삽입
 
+        :param trace: 심볼 메시지의 Trace (URL 메시지에 trace_id / 삽입 시각을 넣어 워커로 전달)
+        :param completion_id: symbol_completion id (URL 메시지에 넣어 워커가 저장 결과를 알림)
+        :return: URL 수집 성공 여부
+        """
+        started = time.time()
         try:
             url_list = bfs_extract_urls(symbol)
-            print(f"[✅ URL 수집 완료] {symbol} → {len(url_list)}개")
+            log.debug("[✅ URL 수집 완료] {symbol} → {count}개", symbol=symbol, count=len(url_list))
         except Exception as e:
-            print(f"[❌ URL 수집 실패] {symbol} - {e}")
-            return True
+            log.error("[❌ URL 수집 실패] {symbol} - {error}", symbol=symbol, error=e)
+            if trace is not None:
+                trace.add_span("router.bfs", started, error=str(e))
+            return False
+        if trace is not None:
+            trace.add_span("router.bfs", started, urls=len(url_list))
 
         for url in url_list:
+            waited_from = time.time()
+            if self._wait_for_url_capacity(priority, url_queue) and trace is not None:
+                trace.add_span("router.url_queue_full", waited_from, tier=priority)
+            if trace is not None:
+                url = {**url, "trace_id": trace.trace_id, "queued_at": time.time()}
+                trace.url_queued()
+            if completion_id is not None:
+                url = {**url, "completion_id": completion_id}
+                symbol_completion.add(completion_id)
             try:
                 if self.use_threadsafe_queue:
-                    if url_queue.qsize() >= MAX_URL_QUEUE_SIZE:
-                        print(f"[⚠️ 중단] {priority} URL 큐 가득 참 → 일부 URL 누락")
-                        break
-                    url_queue.put_nowait(url)
+                    url_queue.put(url)
                 else:
-                    if len(url_queue) >= MAX_URL_QUEUE_SIZE:
-                        print(f"[⚠️ 중단] {priority} URL 큐 가득 참 → 일부 URL 누락")
-                        break
                     url_queue.append(url)
 
-                print(f"[📥 삽입 → {priority}] {url['url']}")
+                log.debug("[📥 삽입 → {tier}] {url}", tier=priority, url=url["url"])
             except Exception as e:
-                print(f"[❌ URL 삽입 실패] {url['url']} - {e}")
+                dropped.inc(reason="url_enqueue_failed")
+                log.error("[❌ URL 삽입 실패] {url} - {error}", url=url["url"], error=e)
+                tracer.url_done(trace)
+                symbol_completion.done(completion_id)
+        return True
+
+    def _wait_for_url_capacity(self, priority: str, url_queue) -> bool:
+        """
+        URL 큐에 자리가 날 때까지 대기 (대기 시간은 router.url_queue 정체 시간으로 기록)
+
+        :return: 대기했으면 True
+        """
+        if self._url_queue_size(url_queue) < MAX_URL_QUEUE_SIZE:
+            return False
 
+        log.debug("[⏸️ 대기] {tier} URL 큐 가득 참 → 자리가 날 때까지 대기", tier=priority)
+        with self.stall.measure():
+            while self._url_queue_size(url_queue) >= MAX_URL_QUEUE_SIZE:
+                time.sleep(URL_QUEUE_WAIT_INTERVAL)
         return True
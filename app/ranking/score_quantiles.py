@@ -0,0 +1,51 @@
+# app/ranking/score_quantiles.py
+
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+# 분위수를 계산할 최근 점수 개수
+DEFAULT_WINDOW = 1000
+
+
+class RollingQuantiles:
+    """
+    최근 window개 점수의 분위수
+    - 정렬 리스트 + 도착 순서 deque
+    - 추가 / 만료: 이진 탐색 O(log n) (+ 리스트 이동, window 크기로 제한)
+    - 분위수 / 순위 조회: O(1) / O(log n)
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._sorted: list[float] = []
+        self._arrivals: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def add(self, score: float):
+        insort(self._sorted, score)
+        self._arrivals.append(score)
+        if len(self._arrivals) > self.window:
+            expired = self._arrivals.popleft()
+            del self._sorted[bisect_left(self._sorted, expired)]
+
+    def quantile(self, q: float) -> float:
+        """
+        :param q: 0.0 ~ 1.0
+        :raises ValueError: 점수가 하나도 없는 경우
+        """
+        if not self._sorted:
+            raise ValueError("점수 없음")
+        index = min(int(q * len(self._sorted)), len(self._sorted) - 1)
+        return self._sorted[index]
+
+    def rank(self, score: float) -> float:
+        """
+        점수의 상대 순위 (0.0 = 최저, 1.0 = 최고, 같은 점수는 중간 순위)
+        """
+        if not self._sorted:
+            return 0.5
+        below = bisect_left(self._sorted, score)
+        not_above = bisect_right(self._sorted, score)
+        return (below + not_above) / 2 / len(self._sorted)
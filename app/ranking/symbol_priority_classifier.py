@@ -1,102 +1,289 @@
+import heapq
+import itertools
+import threading
 import time
 from queue import Queue
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
+from app.ranking.score_quantiles import RollingQuantiles, DEFAULT_WINDOW
+from app.monitoring.logger import get_logger
+from app.monitoring.tracing import Trace
+
 # 각 큐에 들어갈 수 있는 최대 메시지 수
 MAX_QUEUE_SIZE = 10
 
+# 큐에 넣지 못한 메시지를 보관하는 버퍼 최대 크기 (= Kafka consumer가 받을 수 있는 credit)
+MAX_BUFFER_SIZE = 100
+
+# 등급 경계 (최근 점수 분포에서의 순위): 상위 1/3 → TOP, 중간 1/3 → MID, 나머지 → BOT
+TOP_RANK = 2 / 3
+MID_RANK = 1 / 3
+
+# 분위수 계산에 필요한 최소 점수 개수 (부족하면 여유 있는 상위 큐부터 배정)
+MIN_SAMPLES = 3
+
+# 버퍼 flush 타이머 주기 (초)
+FLUSH_INTERVAL = 0.2
+
+TIERS = ("TOP", "MID", "BOT")
+
+log = get_logger("classifier")
+
 
 @dataclass
 class SymbolMessage:
     symbol: str
     score: int
     received_at: float
+    partition: Optional[int] = None  # 수신한 Kafka 파티션 (샤드 재분배 시 사용)
+    # 수집이 끝나면 호출할 함수 (Kafka offset ack 등, 병합된 메시지 것까지 포함)
+    acks: list = field(default_factory=list, repr=False)
+    trace: Optional[Trace] = field(default=None, repr=False, compare=False)
+    spool_id: Optional[int] = field(default=None, repr=False, compare=False)  # 디스크 스풀 행 id
+    tier: Optional[str] = field(default=None, repr=False, compare=False)  # 들어간 심볼 큐 등급 (버퍼에 있으면 None)
+
+    def __getstate__(self):
+        # 디스크 스풀에 저장할 때 ack 함수 / trace는 제외
+        state = self.__dict__.copy()
+        state["acks"] = []
+        state["trace"] = None
+        return state
+
+    def complete(self):
+        acks, self.acks = self.acks, []
+        for ack in acks:
+            ack()
 
 
 class SymbolPriorityClassifier:
-    def __init__(self, queue_top, queue_mid, queue_bot, use_threadsafe_queue: bool = False):
+    """
+    점수 기반 심볼 등급 분류기 (스트리밍)
+    - 최근 점수 분포(RollingQuantiles)에서의 순위로 TOP / MID / BOT 결정 (O(log n))
+    - 등급 큐에 자리가 없으면 점수 높은 순 힙 버퍼에 보관
+    - 버퍼는 수신 시 + 백그라운드 타이머(FLUSH_INTERVAL)로 flush
+    - 대기 중인 메시지에 더 높은 점수가 병합되면 버퍼 순서 / 등급 큐를 다시 배정
+    """
+
+    def __init__(
+        self,
+        queue_top,
+        queue_mid,
+        queue_bot,
+        use_threadsafe_queue: bool = False,
+        window: int = DEFAULT_WINDOW,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+        coalescer=None,
+    ):
+        """
+        :param queue_*: 심볼 우선순위 큐
+        :param use_threadsafe_queue: thread-safe 큐 여부
+        :param window: 분위수 계산에 쓰는 최근 점수 개수
+        :param max_queue_size: 등급 큐 하나당 최대 메시지 수
+        :param coalescer: SymbolCoalescer (지정 시 대기 / 수집 중 / 최근 수집 심볼은 병합 또는 건너뜀)
+        """
+        self.queue_map = {"TOP": queue_top, "MID": queue_mid, "BOT": queue_bot}
         self.queue_top = queue_top
         self.queue_mid = queue_mid
         self.queue_bot = queue_bot
         self.use_threadsafe_queue = use_threadsafe_queue
+        self.max_queue_size = max_queue_size
+        self.coalescer = coalescer
+
+        self.quantiles = RollingQuantiles(window)
+        # (-score, 순번, tier, message) → 점수 높은 순, 같은 점수는 먼저 들어온 순
+        self.buffer: list[tuple] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Thread] = None
+        self.running = False
+
+    def start(self):
+        """버퍼 flush 타이머 스레드 시작"""
+        if self._timer is not None:
+            return
+        self.running = True
+        self._timer = threading.Thread(target=self._flush_loop, daemon=True, name="classifier-flush")
+        self._timer.start()
 
-        self.buffer: list[SymbolMessage] = []
-        self.first_received_at: Optional[float] = None
+    def stop(self):
+        self.running = False
 
-    def receive(self, symbol: str, score: int):
-        now = time.time()
-        message = SymbolMessage(symbol, score, now)
-        self.buffer.append(message)
+    def _flush_loop(self):
+        while self.running:
+            time.sleep(FLUSH_INTERVAL)
+            try:
+                self.try_flush()
+            except Exception as e:
+                log.error("[❌ 분류기 flush 실패] {error}", error=e)
 
-        if not self.first_received_at:
-            self.first_received_at = now
+    def available_credits(self) -> int:
+        """버퍼에 더 받을 수 있는 메시지 수 (0이면 consumer가 수신을 멈춰야 함)"""
+        return max(MAX_BUFFER_SIZE - len(self.buffer), 0)
+
+    def thresholds(self) -> dict:
+        """현재 등급 경계 점수 (TOP 이상 / MID 이상)"""
+        with self._lock:
+            if len(self.quantiles) < MIN_SAMPLES:
+                return {}
+            return {"TOP": self.quantiles.quantile(TOP_RANK), "MID": self.quantiles.quantile(MID_RANK)}
+
+    def classify(self, score: float) -> Optional[str]:
+        """
+        최근 점수 분포 기준 등급 (점수가 MIN_SAMPLES개 미만이면 None)
+        """
+        if len(self.quantiles) < MIN_SAMPLES:
+            return None
+        rank = self.quantiles.rank(score)
+        if rank >= TOP_RANK:
+            return "TOP"
+        if rank >= MID_RANK:
+            return "MID"
+        return "BOT"
+
+    def receive(
+        self,
+        symbol: str,
+        score: int,
+        ack=None,
+        partition: Optional[int] = None,
+        trace: Optional[Trace] = None,
+    ) -> bool:
+        """
+        :param ack: 이 메시지 처리가 끝났을 때 호출할 함수 (라우터 수집 완료 / 병합 대상 수집 완료 / 건너뜀)
+        :param partition: 수신한 Kafka 파티션
+        :param trace: 이 메시지의 Trace (심볼 큐에 들어갈 때 분류기 구간 기록)
+        :return: 버퍼가 가득 차서 받지 못했으면 False (호출 전에 available_credits() 확인)
+        """
+        with self._lock:
+            if len(self.buffer) >= MAX_BUFFER_SIZE:
+                log.warning("[⛔ 버퍼 FULL] {symbol} (score={score}) 수신 거부", symbol=symbol, score=score)
+                return False
+
+            if self.coalescer is not None:
+                message = self.coalescer.admit(symbol, score, ack=ack, partition=partition, trace=trace)
+                if message is None:
+                    pending = self.coalescer.pending(symbol)
+                    if pending is not None:
+                        self._promote(pending)
+                    return True
+            else:
+                message = SymbolMessage(symbol, score, time.time(), partition, trace=trace)
+                if ack is not None:
+                    message.acks.append(ack)
+            self.quantiles.add(score)
+            tier = self.classify(score)
+
+            # 버퍼에 먼저 기다리는 메시지가 없으면 바로 큐에 삽입
+            if not self.buffer and self._place(tier, message):
+                return True
+            heapq.heappush(self.buffer, (-score, next(self._sequence), tier, message))
+            log.debug("[⛔ 큐 FULL → {tier}] {symbol} (score={score}) 버퍼 보관", tier=tier or "전체", symbol=symbol, score=score)
 
         self.try_flush()
+        return True
 
     def try_flush(self):
-        now = time.time()
+        """
+        버퍼 → 심볼 큐 분배 (점수 높은 순)
+        - 자리가 없는 등급의 메시지는 다시 버퍼에 보관
+        """
+        with self._lock:
+            if not self.buffer:
+                return
+
+            deferred = []
+            while self.buffer and self._has_capacity():
+                entry = heapq.heappop(self.buffer)
+                _, _, tier, message = entry
+                if not self._place(tier, message):
+                    deferred.append(entry)
 
-        if len(self.buffer) >= 1 and (now - self.first_received_at >= 1):
-            self._flush_batch()
-            self.first_received_at = None
-        elif 0 < len(self.buffer) < 3:
-            self._flush_individual()
+            for entry in deferred:
+                heapq.heappush(self.buffer, entry)
 
-    def _flush_batch(self):
-        print("[⚙️ BATCH 처리] 조건 충족 → 큐 분배 시도")
+    def remove(self, predicate) -> list[SymbolMessage]:
+        """
+        버퍼에서 조건에 맞는 메시지 제거
 
-        batch = self.buffer[:3]
-        self.buffer = self.buffer[3:]
+        :return: 제거한 메시지
+        """
+        with self._lock:
+            removed = [entry[3] for entry in self.buffer if predicate(entry[3])]
+            if removed:
+                self.buffer = [entry for entry in self.buffer if not predicate(entry[3])]
+                heapq.heapify(self.buffer)
+            return removed
 
-        sorted_batch = sorted(batch, key=lambda m: m.score, reverse=True)
-        top_msg = sorted_batch[0]
-        mid_msg = sorted_batch[2]
-        bot_msg = sorted_batch[1]
+    def _promote(self, message: SymbolMessage):
+        """
+        병합으로 점수가 오른 대기 메시지 재배정 (self._lock 보유 상태에서 호출)
+        - 버퍼에 있으면 새 점수로 힙 순서 / 등급 갱신
+        - 더 낮은 등급 큐에 있으면 꺼내서 새 등급 큐로 이동 (자리가 없으면 버퍼)
+        """
+        tier = self.classify(message.score)
+        for index, entry in enumerate(self.buffer):
+            if entry[3] is message:
+                if -entry[0] < message.score:
+                    self.buffer[index] = (-message.score, entry[1], tier, message)
+                    heapq.heapify(self.buffer)
+                return
 
-        success_top = self._enqueue(self.queue_top, top_msg, "TOP")
-        success_mid = self._enqueue(self.queue_mid, bot_msg, "MID")
-        success_bot = self._enqueue(self.queue_bot, mid_msg, "BOT")
+        if tier is None or message.tier is None or TIERS.index(tier) >= TIERS.index(message.tier):
+            return
+        if not self._take(self.queue_map[message.tier], message):
+            return  # 라우터가 이미 꺼냄
 
-        for success, msg in zip([success_top, success_mid, success_bot], [top_msg, bot_msg, mid_msg]):
-            if not success:
-                self.buffer.insert(0, msg)
+        log.debug("[⬆️ 등급 상승 {old} → {tier}] {symbol} (score={score})",
+                  old=message.tier, tier=tier, symbol=message.symbol, score=message.score)
+        message.tier = None
+        if not self._place(tier, message):
+            heapq.heappush(self.buffer, (-message.score, next(self._sequence), tier, message))
+
+    def _take(self, queue, message: SymbolMessage) -> bool:
+        """등급 큐에서 메시지 하나 제거 (없으면 False)"""
+        try:
+            if isinstance(queue, Queue):
+                with queue.mutex:
+                    queue.queue.remove(message)
+            else:
+                queue.remove(message)  # deque / TierQueue
+            return True
+        except ValueError:
+            return False
 
-    def _flush_individual(self):
-        print("[⚙️ 개별 처리] 큐 여유 공간에 메시지 삽입 시도")
+    def _has_capacity(self) -> bool:
+        return any(self._size(queue) < self.max_queue_size for queue in self.queue_map.values())
 
-        rebuffer = []
-        for msg in self.buffer:
-            if self._enqueue(self.queue_top, msg, "TOP"):
-                continue
-            if self._enqueue(self.queue_mid, msg, "MID"):
-                continue
-            if self._enqueue(self.queue_bot, msg, "BOT"):
-                continue
-            rebuffer.append(msg)
+    def _place(self, tier: Optional[str], message: SymbolMessage) -> bool:
+        """
+        등급 큐에 삽입 (등급 미정이면 여유 있는 상위 큐부터)
+        """
+        if tier is not None:
+            return self._enqueue(self.queue_map[tier], message, tier)
+        return any(self._enqueue(self.queue_map[label], message, label) for label in TIERS)
 
-        self.buffer = rebuffer
-        self.first_received_at = time.time() if self.buffer else None
+    def _size(self, queue) -> int:
+        return queue.qsize() if self.use_threadsafe_queue else len(queue)
 
     def _enqueue(self, queue, message: SymbolMessage, label: str) -> bool:
-        if self.use_threadsafe_queue:
-            if queue.qsize() < MAX_QUEUE_SIZE:
-                try:
-                    queue.put_nowait(message)
-                    print(f"[📥 삽입 → {label}] {message.symbol} (score={message.score})")
-                    return True
-                except Exception as e:
-                    print(f"[❌ 삽입 실패 → {label}] {message.symbol} - {e}")
-                    return False
+        if self._size(queue) >= self.max_queue_size:
+            return False
+
+        try:
+            if self.use_threadsafe_queue:
+                queue.put_nowait(message)
             else:
-                print(f"[⛔ 큐 FULL → {label}] {message.symbol} (score={message.score})")
-                return False
-        else:
-            if len(queue) < MAX_QUEUE_SIZE:
                 queue.append(message)
-                print(f"[📥 삽입 → {label}] {message.symbol} (score={message.score})")
-                return True
-            else:
-                print(f"[⛔ 큐 FULL → {label}] {message.symbol} (score={message.score})")
-                return False
+        except Exception as e:
+            log.error("[❌ 삽입 실패 → {tier}] {symbol} - {error}", tier=label, symbol=message.symbol, error=e)
+            return False
+
+        message.tier = label
+        log.debug("[📥 삽입 → {tier}] {symbol} (score={score})", tier=label, symbol=message.symbol, score=message.score)
+        if message.trace is not None:
+            # 수신 → 심볼 큐 삽입 (버퍼 대기 포함), 이후는 심볼 큐 대기
+            message.trace.add_span("classifier", message.trace.started_at, tier=label)
+            message.trace.mark("symbol_queue")
+        return True
@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.database.connection import SessionLocal
 from app.models.content_url import ContentUrl
+from app.monitoring.logger import get_logger
+
+log = get_logger("repository")
 
 class ContentUrlRepository:
 
@@ -16,7 +19,7 @@ class ContentUrlRepository:
             urls = [row[0] for row in result.all()]
             return set(urls)
         except Exception as e:
-            print(f"[❌ DB 조회 실패] {symbol} - {e}")
+            log.error("[❌ DB 조회 실패] {symbol} - {error}", symbol=symbol, error=e)
             return set()
         finally:
             session.close()
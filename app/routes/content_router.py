@@ -1,21 +1,94 @@
-from fastapi import APIRouter, Query, Path
-from app.services.content_service import get_contents_paginated, get_contents_by_symbol
-from app.schemas.content_response import PaginatedContentResponse
+from functools import partial
+from typing import Optional, Union
+import anyio
+from fastapi import APIRouter, Query, Path, HTTPException, Depends, Response
+from sqlalchemy.orm import Session
+from app.database.connection import get_read_db, READ_CONCURRENCY
+from app.services.content_service import (
+    get_contents_paginated,
+    get_contents_by_symbol,
+    get_contents_by_cursor,
+    get_contents_by_symbol_cursor,
+    get_content_html,
+)
+from app.services.response_cache import response_cache, ALL_SCOPE
+from app.schemas.content_response import PaginatedContentResponse, CursorPaginatedContentResponse
 
 router = APIRouter()
 
-@router.get("/contents", response_model=PaginatedContentResponse, summary="콘텐츠 목록 조회 (페이지네이션)", tags=["Content"])
-def get_contents(
+CURSOR_DESCRIPTION = "커서 방식 조회 (첫 페이지는 빈 값, 이후 응답의 next_cursor 사용). 지정하면 page는 무시됨"
+
+# ✅ 조회 라우트 전용 스레드 제한 (읽기 풀 크기만큼만 동시에 DB 조회, 나머지는 스레드를 기다림)
+# - anyio 기본 스레드 제한(다른 동기 라우트 / 의존성 공용)은 건드리지 않음
+read_limiter = anyio.CapacityLimiter(READ_CONCURRENCY)
+
+
+async def _run_read(func, *args):
+    """동기 조회 함수를 read_limiter 안에서 실행 (풀 대기 타임아웃 대신 스레드 대기)"""
+    return await anyio.to_thread.run_sync(partial(func, *args), limiter=read_limiter)
+
+
+def _list_contents(db: Session, symbol: Optional[str], page: int, size: int, cursor: Optional[str], include_total: bool):
+    """
+    목록 조회 공통 처리
+    - 앞쪽 페이지(page 방식 MAX_CACHED_PAGES 이하, 커서 방식 첫 페이지)는 직렬화된 본문을 캐시에서 반환
+    - 캐시 백엔드(Redis) 오류 시 DB 조회로 응답 (ResponseCache가 오류를 로그로 남기고 build 결과 반환)
+    """
+    if cursor is not None:
+        def build():
+            if symbol is None:
+                return get_contents_by_cursor(db, cursor, size, include_total)
+            return get_contents_by_symbol_cursor(db, symbol, cursor, size, include_total)
+        cacheable = cursor == ""
+        variant = f"cursor:size={size}:total={int(include_total)}"
+    else:
+        def build():
+            if symbol is None:
+                return get_contents_paginated(db, page, size)
+            return get_contents_by_symbol(db, symbol, page, size)
+        cacheable = response_cache.is_cacheable(page)
+        variant = f"page={page}:size={size}"
+
+    try:
+        if not cacheable:
+            return build()
+        body = response_cache.get_or_build(
+            symbol or ALL_SCOPE, variant, lambda: build().model_dump_json().encode("utf-8")
+        )
+        return Response(content=body, media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/contents", response_model=Union[PaginatedContentResponse, CursorPaginatedContentResponse], summary="콘텐츠 목록 조회 (페이지네이션)", tags=["Content"])
+async def get_contents(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    include_total: bool = Query(False, description="커서 방식에서 전체 건수(캐시) 포함 여부"),
+    db: Session = Depends(get_read_db),
 ):
-    return get_contents_paginated(page, size)
+    return await _run_read(_list_contents, db, None, page, size, cursor, include_total)
 
 
-@router.get("/contents/{symbol}", response_model=PaginatedContentResponse, summary="심볼 기반 콘텐츠 조회", tags=["Content"])
-def get_contents_by_symbol_route(
+@router.get("/contents/{symbol}", response_model=Union[PaginatedContentResponse, CursorPaginatedContentResponse], summary="심볼 기반 콘텐츠 조회", tags=["Content"])
+async def get_contents_by_symbol_route(
     symbol: str = Path(..., description="조회할 심볼 예: AAPL"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    include_total: bool = Query(False, description="커서 방식에서 전체 건수(캐시) 포함 여부"),
+    db: Session = Depends(get_read_db),
+):
+    return await _run_read(_list_contents, db, symbol, page, size, cursor, include_total)
+
+
+@router.get("/contents/{content_id}/html", summary="기사 원본 HTML 조회", tags=["Content"])
+async def get_content_html_route(
+    content_id: int = Path(..., description="콘텐츠 id (목록 응답의 id)"),
+    db: Session = Depends(get_read_db),
 ):
-    return get_contents_by_symbol(symbol, page, size)
+    html = await _run_read(get_content_html, db, content_id)
+    if html is None:
+        raise HTTPException(status_code=404, detail="저장된 원본 HTML이 없습니다.")
+    return Response(content=html, media_type="text/html; charset=utf-8")
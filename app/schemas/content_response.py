@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict
-from typing import List
+from typing import List, Optional
 
 
 
@@ -23,4 +23,13 @@ class PaginatedContentResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # 다음 페이지부터 커서 방식으로 이어서 조회할 때 사용
+    items: List[ContentResponse]
+
+
+class CursorPaginatedContentResponse(BaseModel):
+    size: int
+    has_next: bool
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None  # include_total=true일 때만 (캐시된 값)
     items: List[ContentResponse]
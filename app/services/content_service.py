@@ -1,20 +1,88 @@
+import base64
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_, and_
 from app.models.content import Content
-from app.schemas.content_response import ContentResponse, PaginatedContentResponse
-from app.database.connection import SessionLocal
+from app.models.content_body import ContentBody
+from app.crawler.html_storage import unpack_html
+from app.schemas.content_response import ContentResponse, PaginatedContentResponse, CursorPaginatedContentResponse
+from app.services.response_cache import response_cache
 
+# 전체 건수(COUNT) 캐시 유지 시간 (초)
+COUNT_CACHE_TTL = 30
 
-def get_contents_paginated(page: int, size: int) -> PaginatedContentResponse:
-    session = SessionLocal()
-    offset = (page - 1) * size
+# 건수 캐시 최대 항목 수 (심볼은 요청 파라미터이므로 제한, 넘으면 오래 안 쓴 것부터 삭제)
+MAX_COUNT_CACHE_ENTRIES = 1000
 
-    total = session.scalar(select(func.count()).select_from(Content))
+_count_cache: OrderedDict[Optional[str], tuple[float, int]] = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def encode_cursor(content: Content) -> str:
+    """(crawled_at, id) → 불투명 커서 문자열"""
+    raw = f"{content.crawled_at.isoformat()}|{content.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    커서 문자열 → (crawled_at, id)
+
+    :raises ValueError: 잘못된 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        crawled_at, content_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(crawled_at), int(content_id)
+    except Exception:
+        raise ValueError(f"잘못된 커서: {cursor}")
+
+
+def _count_contents(session: Session, symbol: Optional[str] = None) -> int:
+    """
+    전체 / 심볼별 건수 (COUNT_CACHE_TTL 동안, 최대 MAX_COUNT_CACHE_ENTRIES개 LRU 캐시)
+    """
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(symbol)
+        if cached is not None:
+            if cached[0] > now:
+                _count_cache.move_to_end(symbol)
+                return cached[1]
+            del _count_cache[symbol]
+
+    stmt = select(func.count()).select_from(Content)
+    if symbol is not None:
+        stmt = stmt.where(Content.symbol == symbol)
+    total = session.scalar(stmt)
+
+    with _count_cache_lock:
+        _count_cache[symbol] = (now + COUNT_CACHE_TTL, total)
+        _count_cache.move_to_end(symbol)
+        while len(_count_cache) > MAX_COUNT_CACHE_ENTRIES:
+            _count_cache.popitem(last=False)
+    return total
 
-    stmt = select(Content).order_by(Content.crawled_at.desc()).offset(offset).limit(size)
-    contents = session.execute(stmt).scalars().all()
 
-    items = [
+def on_contents_saved(records):
+    """
+    새 기사 저장 후 호출 (배치 저장 스레드의 커밋 리스너)
+    - 저장된 심볼 + 전체 목록의 응답 캐시 / 건수 캐시 무효화
+    """
+    symbols = {record.symbol for record in records}
+    response_cache.invalidate(symbols)
+    with _count_cache_lock:
+        for symbol in symbols | {None}:
+            _count_cache.pop(symbol, None)
+
+
+def _to_items(contents) -> list[ContentResponse]:
+    return [
         ContentResponse(
             id=content.id,
             symbol=content.symbol,
@@ -26,52 +94,88 @@ def get_contents_paginated(page: int, size: int) -> PaginatedContentResponse:
         for content in contents
     ]
 
+
+def _get_page(session: Session, symbol: Optional[str], page: int, size: int) -> PaginatedContentResponse:
+    offset = (page - 1) * size
+    total = _count_contents(session, symbol)
+
+    stmt = select(Content)
+    if symbol is not None:
+        stmt = stmt.where(Content.symbol == symbol)
+    stmt = stmt.order_by(Content.crawled_at.desc(), Content.id.desc()).offset(offset).limit(size)
+    contents = session.execute(stmt).scalars().all()
+
+    total_pages = total // size + (1 if total % size else 0)
     return PaginatedContentResponse(
         total=total,
         page=page,
         size=size,
-        total_pages=(total // size + (1 if total % size else 0)),
-        has_next=page < (total // size + (1 if total % size else 0)),
+        total_pages=total_pages,
+        has_next=page < total_pages,
         has_prev=page > 1,
-        items=items
+        next_cursor=encode_cursor(contents[-1]) if contents and page < total_pages else None,
+        items=_to_items(contents),
     )
 
 
-def get_contents_by_symbol(symbol: str, page: int, size: int) -> PaginatedContentResponse:
-    session = SessionLocal()
+def _get_page_by_cursor(
+    session: Session, symbol: Optional[str], cursor: Optional[str], size: int, include_total: bool
+) -> CursorPaginatedContentResponse:
+    """
+    키셋 페이지네이션: (crawled_at, id) 기준으로 커서 이후 size개 조회 (OFFSET / COUNT 없음)
+    """
+    stmt = select(Content)
+    if symbol is not None:
+        stmt = stmt.where(Content.symbol == symbol)
+    if cursor:
+        crawled_at, content_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            Content.crawled_at < crawled_at,
+            and_(Content.crawled_at == crawled_at, Content.id < content_id),
+        ))
+    stmt = stmt.order_by(Content.crawled_at.desc(), Content.id.desc()).limit(size + 1)
+    contents = session.execute(stmt).scalars().all()
 
-    offset = (page - 1) * size
-    total = session.scalar(
-        select(func.count()).select_from(Content).where(Content.symbol == symbol)
+    has_next = len(contents) > size
+    contents = contents[:size]
+    return CursorPaginatedContentResponse(
+        size=size,
+        has_next=has_next,
+        next_cursor=encode_cursor(contents[-1]) if has_next else None,
+        total=_count_contents(session, symbol) if include_total else None,
+        items=_to_items(contents),
     )
 
-    stmt = (
-        select(Content)
-        .where(Content.symbol == symbol)
-        .order_by(Content.crawled_at.desc())
-        .offset(offset)
-        .limit(size)
-    )
-    contents = session.execute(stmt).scalars().all()
 
-    items = [
-        ContentResponse(
-            id=content.id,
-            symbol=content.symbol,
-            summary=content.summary,
-            url=content.url,
-            title=content.title,
-            date=content.crawled_at
-        )
-        for content in contents
-    ]
+def get_contents_paginated(session: Session, page: int, size: int) -> PaginatedContentResponse:
+    return _get_page(session, None, page, size)
 
-    return PaginatedContentResponse(
-        total=total,
-        page=page,
-        size=size,
-        total_pages=(total // size + (1 if total % size else 0)),
-        has_next=page < (total // size + (1 if total % size else 0)),
-        has_prev=page > 1,
-        items=items
-    )
+
+def get_contents_by_symbol(session: Session, symbol: str, page: int, size: int) -> PaginatedContentResponse:
+    return _get_page(session, symbol, page, size)
+
+
+def get_contents_by_cursor(
+    session: Session, cursor: Optional[str], size: int, include_total: bool = False
+) -> CursorPaginatedContentResponse:
+    return _get_page_by_cursor(session, None, cursor, size, include_total)
+
+
+def get_contents_by_symbol_cursor(
+    session: Session, symbol: str, cursor: Optional[str], size: int, include_total: bool = False
+) -> CursorPaginatedContentResponse:
+    return _get_page_by_cursor(session, symbol, cursor, size, include_total)
+
+
+def get_content_html(session: Session, content_id: int) -> Optional[str]:
+    """
+    기사 원본 HTML (목록 조회와 달리 본문 테이블을 읽음)
+    - content_bodies의 압축 본문 → 없으면 inline 저장된 contents.html
+
+    :return: HTML / 저장된 본문이 없으면 None
+    """
+    body = session.get(ContentBody, content_id)
+    if body is not None:
+        return unpack_html(body.codec, body.body)
+    html = session.scalar(select(Content.html).where(Content.id == content_id))
+    return html or None
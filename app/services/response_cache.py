@@ -0,0 +1,170 @@
+# app/services/response_cache.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.monitoring.logger import get_logger
+
+# 캐시 유지 시간 (초)
+RESPONSE_CACHE_TTL = 10
+
+# 심볼별로 캐시할 앞쪽 페이지 수
+MAX_CACHED_PAGES = 3
+
+# 메모리 캐시 최대 항목 수 (LRU)
+MAX_CACHE_ENTRIES = 2000
+
+# 공유 캐시(Redis) URL, 없으면 프로세스 메모리 캐시 사용
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+
+# 전체 목록(/contents)의 scope 이름
+ALL_SCOPE = "__all__"
+
+log = get_logger("cache")
+
+
+class InMemoryCacheBackend:
+    """
+    프로세스 메모리 캐시 (TTL + LRU, thread-safe)
+    - 공유 캐시와 같은 인터페이스라 테스트 / 단일 인스턴스에서 대체용으로 사용
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class RedisCacheBackend:
+    """
+    Redis 공유 캐시 (여러 API 인스턴스가 같은 캐시 / 무효화 상태 공유)
+    - redis 패키지가 필요함
+    """
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(key, value, px=int(ttl * 1000))
+
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value else 0
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(key)
+
+    def clear(self):
+        pass
+
+
+class ResponseCache:
+    """
+    목록 응답 캐시
+    - 직렬화된 JSON 본문(bytes)을 저장 → 적중 시 DB 조회와 pydantic 모델 생성 모두 생략
+    - 심볼별 세대(generation) 번호를 키에 포함, 무효화는 세대 번호만 증가
+      (공유 캐시에서도 키 삭제 없이 무효화 가능)
+    - 캐시 백엔드(Redis) 오류는 fail-open: 로그만 남기고 DB 조회 결과를 그대로 반환
+    """
+
+    def __init__(self, backend, ttl: float = RESPONSE_CACHE_TTL, max_pages: int = MAX_CACHED_PAGES):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def is_cacheable(self, page: int) -> bool:
+        return page <= self.max_pages
+
+    def get_or_build(self, scope: str, variant: str, build: Callable[[], bytes]) -> bytes:
+        """
+        :param scope: 심볼 또는 ALL_SCOPE
+        :param variant: 페이지 구분 값 (예: "page=1:size=20")
+        :param build: 캐시 미스 시 JSON 본문 생성 (build 자체의 예외는 그대로 전달)
+        """
+        try:
+            generation = self.backend.get_counter(f"contents:gen:{scope}")
+            key = f"contents:{scope}:{generation}:{variant}"
+            body = self.backend.get(key)
+        except Exception as e:
+            self._on_error("조회", e)
+            return build()
+        if body is not None:
+            self.hits += 1
+            return body
+
+        self.misses += 1
+        body = build()
+        try:
+            self.backend.set(key, body, self.ttl)
+        except Exception as e:
+            self._on_error("저장", e)
+        return body
+
+    def _on_error(self, operation: str, error: Exception):
+        self.errors += 1
+        log.warning("[⚠️ 캐시 {operation} 실패 → DB 조회] {error}", operation=operation, error=error)
+
+    def invalidate(self, symbols):
+        """
+        새 기사가 저장된 심볼 + 전체 목록 캐시 무효화
+        """
+        for scope in set(symbols) | {ALL_SCOPE}:
+            self.backend.incr(f"contents:gen:{scope}")
+
+
+def _create_backend():
+    if RESPONSE_CACHE_URL:
+        try:
+            return RedisCacheBackend(RESPONSE_CACHE_URL)
+        except Exception as e:
+            log.warning("[⚠️ 공유 캐시 연결 실패 → 메모리 캐시 사용] {error}", error=e)
+    return InMemoryCacheBackend()
+
+
+# ✅ 조회 API 전체에서 공유하는 응답 캐시
+response_cache = ResponseCache(_create_backend())
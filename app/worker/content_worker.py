@@ -4,27 +4,49 @@ import time
 import hashlib
 from queue import Queue
 from collections import deque
+from typing import Optional
 import traceback
 
+from app.crawler.content_writer import FAILED
 from app.crawler.downloader import download_and_process
+from app.queue.priority_scheduler import PriorityScheduler
+from app.queue.symbol_completion import symbol_completion
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import dropped
+from app.monitoring.tracing import tracer
+
+# 저장 실패(FAILED)한 URL 재시도 횟수 / 간격 (초, 시도마다 늘어남)
+# - 스풀에 저장된 URL: MAX_URL_RETRIES를 넘기면 스풀에 남겨 두고 (재시작 시 복구) Kafka offset 진행
+# - 스풀이 없으면 내구성 있는 곳이 없으므로 MAX_URL_RETRY_DELAY 간격으로 계속 재시도 (offset 커밋 안 함)
+MAX_URL_RETRIES = 3
+URL_RETRY_DELAY = 2.0
+MAX_URL_RETRY_DELAY = 60.0
+
+log = get_logger("worker")
 
 
 class ContentWorker(threading.Thread):
     """
     URL 큐에서 메시지를 꺼내 HTML 수집 후 DB에 저장하는 작업 스레드
     병렬로 작동하며 큐가 비면 대기함
+    - 저장 결과(Future)가 SAVED / DUPLICATE로 끝난 뒤에 스풀에서 삭제 (ack) + 심볼 완료 추적기에 알림
+    - FAILED면 URL_RETRY_DELAY 뒤 다시 큐에 넣고, MAX_URL_RETRIES를 넘기면 스풀에 남겨 둠 (재시작 시 복구)
+      스풀에 없는 URL은 저장될 때까지 재시도 (심볼 완료 / Kafka offset 커밋은 저장 후에만)
     """
 
-    def __init__(self, url_queue, db_session_factory, use_threadsafe_queue=False):
+    def __init__(self, url_queue, db_session_factory, use_threadsafe_queue=False, on_processed=None):
         """
-        :param url_queue: 처리할 URL 큐 (Queue 또는 deque)
+        :param url_queue: 처리할 URL 큐 (Queue, deque 또는 PriorityScheduler)
         :param db_session_factory: SQLAlchemy 세션 팩토리
         :param use_threadsafe_queue: thread-safe 큐 여부
+        :param on_processed: 메시지 하나의 저장 결과가 나오면 호출할 콜백 on_processed(elapsed_seconds)
+            (elapsed: 큐에서 꺼낸 시점 → 배치 저장 Future 완료, 저장 스레드 대기 포함)
         """
         super().__init__(daemon=True)
         self.url_queue = url_queue
         self.db_session_factory = db_session_factory
         self.use_threadsafe_queue = use_threadsafe_queue
+        self.on_processed = on_processed
         self.running = True
 
     def stop(self):
@@ -32,9 +54,17 @@ class ContentWorker(threading.Thread):
         self.running = False
 
     def run(self):
-        print(f"🧵 [Worker-{self.name}] 시작됨.")
+        log.debug("🧵 [Worker-{name}] 시작됨.", name=self.name)
         while self.running:
             try:
+                if isinstance(self.url_queue, PriorityScheduler):
+                    try:
+                        tier, message = self.url_queue.get(timeout=1)
+                    except Empty:
+                        continue
+                    self._process_and_ack(tier, message)
+                    continue
+
                 if self.use_threadsafe_queue:
                     try:
                         message = self.url_queue.get(timeout=1)
@@ -46,26 +76,81 @@ class ContentWorker(threading.Thread):
                         continue
                     message = self.url_queue.popleft()
 
-                self._process(message)
+                self._process_and_ack(None, message)
 
                 if self.use_threadsafe_queue:
                     self.url_queue.task_done()
 
             except Exception as e:
-                print(f"[❌ 처리 중 예외] {e}")
-                import traceback
-                traceback.print_exc()
+                log.error("[❌ 처리 중 예외] {error}", exc_info=True, error=e)
                 time.sleep(1)
 
+    def _process_and_ack(self, tier: Optional[str], message: dict):
+        """저장 결과가 나오면 (배치 저장 스레드에서) ack 또는 재시도"""
+        started = time.monotonic()
+        try:
+            future = self._process(message)
+        except Exception:
+            self._on_result(tier, message, FAILED, started)
+            raise
+        future.add_done_callback(lambda f: self._on_result(tier, message, f.result(), started))
+
+    def _on_result(self, tier: Optional[str], message: dict, outcome: str, started: float):
+        if self.on_processed:
+            self.on_processed(time.monotonic() - started)
+        if outcome == FAILED and self._retry(tier, message):
+            return
+        # 커밋된 URL만 디스크 스풀에서 삭제
+        if outcome != FAILED and isinstance(self.url_queue, PriorityScheduler):
+            self.url_queue.ack(message)
+        # 심볼의 URL이 모두 끝나면 Kafka offset 커밋 허용
+        symbol_completion.done(message.get("completion_id"))
+
+    def _retry(self, tier: Optional[str], message: dict) -> bool:
+        """:return: 다시 큐에 넣었으면 True (스풀에 남기고 재시도를 멈추면 False)"""
+        attempts = message.get("attempts", 0) + 1
+        if attempts > MAX_URL_RETRIES and message.get("spool_id") is not None:
+            # ack하지 않음 → 재시작 시 스풀에서 다시 처리 (Kafka offset은 진행)
+            dropped.inc(reason="url_retry_exhausted")
+            log.error("[❌ 저장 재시도 초과] {url} ({attempts}회, 스풀에 보관)", url=message.get("url"), attempts=attempts - 1)
+            tracer.url_done(tracer.get(message.get("trace_id")), failed=True)
+            return False
+
+        # trace는 URL 완료 처리 없이 그대로 두고 (재시도 중 종료 방지) 큐 대기 구간만 새로 기록
+        message["attempts"] = attempts
+        if message.get("trace_id") is not None:
+            message["queued_at"] = time.time()
+        delay = min(URL_RETRY_DELAY * attempts, MAX_URL_RETRY_DELAY)
+        log.warning("[🔁 저장 재시도] {url} ({attempts}번째, {delay:.0f}초 뒤)", url=message.get("url"), attempts=attempts, delay=delay)
+        timer = threading.Timer(delay, self._requeue, args=(tier, message))
+        timer.daemon = True
+        timer.start()
+        return True
+
+    def _requeue(self, tier: Optional[str], message: dict):
+        if isinstance(self.url_queue, PriorityScheduler):
+            self.url_queue.retry(message, tier)
+        elif self.use_threadsafe_queue:
+            self.url_queue.put_nowait(message)
+        else:
+            self.url_queue.append(message)
+
     def _process(self, message: dict):
         """
         HTML 수집 및 DB 저장 처리
 
+        :return: 저장 결과가 담길 Future
+
         :param message: {
             "symbol": "AAPL",
             "title": "...",
             "summary": "...",
-            "url": "..."
+            "url": "...",
+            "trace_id": "...",   # (선택) 라우터가 넣은 trace
+            "queued_at": 0.0,    # (선택) URL 큐 삽입 시각
+            "spool_id": 1,       # (선택) 디스크 스풀 행 id
+            "attempts": 0,       # (선택) 저장 재시도 횟수
+            "completion_id": "…"  # (선택) 라우터가 넣은 symbol_completion id
         }
         """
         symbol = message.get("symbol")
@@ -77,5 +162,11 @@ class ContentWorker(threading.Thread):
         raw = f"{url}"
         content_hash = hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
+        # URL 큐 대기 구간 (라우터가 넣은 trace_id / 삽입 시각)
+        trace = tracer.get(message.get("trace_id"))
+        if trace is not None:
+            trace.add_span("url_queue.wait", message["queued_at"], url=url)
+
         # HTML 다운로드 및 처리
-        download_and_process(symbol, url, title, summary, content_hash)
+        # 예외는 _process_and_ack가 FAILED로 처리 (trace 완료 처리도 _retry에서)
+        return download_and_process(symbol, url, title, summary, content_hash, trace=trace)
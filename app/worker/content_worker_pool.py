@@ -1,61 +1,156 @@
+import threading
+import time
 from app.worker.content_worker import ContentWorker
+from app.queue.priority_scheduler import PriorityScheduler
+from app.monitoring.logger import get_logger
 from queue import Queue
 from collections import deque
 
+# 스케줄러 사용 시 워커 스레드 수
+DEFAULT_WORKER_COUNT = 10
+
+# 처리 시간 이동 평균 가중치
+LATENCY_EWMA_ALPHA = 0.2
+
+log = get_logger("worker")
+
 class ContentWorkerPool:
     """
     콘텐츠 워커 스레드 풀
-    - URL 우선순위 큐별로 지정된 수의 워커를 병렬 실행
+    - scheduler 지정 시: 모든 워커가 하나의 가중 공정 스케줄러에서 URL을 꺼냄
+      (TOP 우선, 상위 등급이 비면 남는 워커가 하위 등급 처리)
+    - 미지정 시: URL 우선순위 큐별로 지정된 수의 워커를 병렬 실행
     - 각 워커는 큐에서 URL 메시지를 가져와 HTML 수집 및 DB 저장 수행
     """
 
-    def __init__(self, db_session_factory, url_queue_top, url_queue_mid, url_queue_bot, use_threadsafe_queue=False):
+    def __init__(
+        self,
+        db_session_factory,
+        url_queue_top=None,
+        url_queue_mid=None,
+        url_queue_bot=None,
+        use_threadsafe_queue=False,
+        scheduler: PriorityScheduler = None,
+        worker_count: int = DEFAULT_WORKER_COUNT,
+    ):
         """
         :param db_session_factory: SQLAlchemy 세션 팩토리
         :param url_queue_top: 높은 우선순위 URL 큐
         :param url_queue_mid: 중간 우선순위 URL 큐
         :param url_queue_bot: 낮은 우선순위 URL 큐
         :param use_threadsafe_queue: thread-safe 큐(Queue) 사용 여부
+        :param scheduler: URL 스케줄러 (지정 시 url_queue_*는 무시)
+        :param worker_count: 스케줄러 사용 시 워커 수
         """
         self.db_session_factory = db_session_factory
         self.use_threadsafe_queue = use_threadsafe_queue
+        self.scheduler = scheduler
 
-        if use_threadsafe_queue:
-            assert isinstance(url_queue_top, Queue)
-            assert isinstance(url_queue_mid, Queue)
-            assert isinstance(url_queue_bot, Queue)
+        if scheduler is not None:
+            self.worker_configs = [(scheduler, worker_count)]
         else:
-            assert isinstance(url_queue_top, deque)
-            assert isinstance(url_queue_mid, deque)
-            assert isinstance(url_queue_bot, deque)
+            if use_threadsafe_queue:
+                assert isinstance(url_queue_top, Queue)
+                assert isinstance(url_queue_mid, Queue)
+                assert isinstance(url_queue_bot, Queue)
+            else:
+                assert isinstance(url_queue_top, deque)
+                assert isinstance(url_queue_mid, deque)
+                assert isinstance(url_queue_bot, deque)
 
-        # 스레드 할당 비율: TOP=5, MID=3, BOT=2
-        self.worker_configs = [
-            (url_queue_top, 5),
-            (url_queue_mid, 3),
-            (url_queue_bot, 2),
-        ]
+            # 스레드 할당 비율: TOP=5, MID=3, BOT=2
+            self.worker_configs = [
+                (url_queue_top, 5),
+                (url_queue_mid, 3),
+                (url_queue_bot, 2),
+            ]
 
         self.workers = []
+        self.item_latency_ewma = 0.0  # 메시지 1건 처리 시간 (꺼낸 시점 → 저장 결과, 초)
+        self.processed_count = 0
+        self._lock = threading.Lock()
+
+    def _on_processed(self, elapsed: float):
+        with self._lock:
+            self.processed_count += 1
+            self.item_latency_ewma = (
+                LATENCY_EWMA_ALPHA * elapsed + (1 - LATENCY_EWMA_ALPHA) * self.item_latency_ewma
+            )
+
+    def _spawn(self, queue) -> ContentWorker:
+        worker = ContentWorker(
+            queue, self.db_session_factory, self.use_threadsafe_queue, on_processed=self._on_processed
+        )
+        worker.start()
+        self.workers.append(worker)
+        return worker
 
     def start(self):
         """
         모든 워커 스레드를 생성 및 시작
         """
-        print("🚀 [WorkerPool] 콘텐츠 워커 스레드 실행 시작")
+        log.info("🚀 [WorkerPool] 콘텐츠 워커 스레드 실행 시작")
+
+        with self._lock:
+            for queue, count in self.worker_configs:
+                for _ in range(count):
+                    self._spawn(queue)
+
+        log.info("✅ 총 {count}개 워커 스레드 실행 완료", count=len(self.workers))
+
+    def size(self) -> int:
+        """실행 중인(종료 요청되지 않은) 워커 수"""
+        with self._lock:
+            return sum(1 for worker in self.workers if worker.running)
+
+    def add_workers(self, count: int) -> int:
+        """
+        워커 추가 (스케줄러 사용 시만)
 
-        for queue, count in self.worker_configs:
+        :return: 추가된 워커 수
+        """
+        if self.scheduler is None:
+            return 0
+        with self._lock:
             for _ in range(count):
-                worker = ContentWorker(queue, self.db_session_factory, self.use_threadsafe_queue)
-                worker.start()
-                self.workers.append(worker)
+                self._spawn(self.scheduler)
+        return count
 
-        print(f"✅ 총 {len(self.workers)}개 워커 스레드 실행 완료")
+    def retire_workers(self, count: int) -> int:
+        """
+        워커 종료 요청 (처리 중인 메시지는 끝까지 처리한 뒤 종료)
 
-    def stop(self):
+        :return: 종료 요청한 워커 수
         """
-        모든 워커 스레드 종료 요청
+        if self.scheduler is None:
+            return 0
+        with self._lock:
+            self.workers = [worker for worker in self.workers if worker.is_alive()]
+            active = [worker for worker in self.workers if worker.running]
+            retiring = active[-count:] if count > 0 else []
+            for worker in retiring:
+                worker.stop()
+        return len(retiring)
+
+    def stats(self) -> dict:
+        """등급별 대기 건수 / 대기 시간 (스케줄러 사용 시)"""
+        return self.scheduler.stats() if self.scheduler is not None else {}
+
+    def stop(self, timeout: float = 10):
         """
-        print("🛑 [WorkerPool] 종료 요청")
-        for worker in self.workers:
+        모든 워커 스레드 종료 요청 후 처리 중인 메시지가 끝날 때까지 대기
+
+        :param timeout: 전체 대기 시간 (초)
+        """
+        log.info("🛑 [WorkerPool] 종료 요청")
+        with self._lock:
+            workers = list(self.workers)
+        for worker in workers:
             worker.stop()
+
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.join(max(deadline - time.monotonic(), 0))
+
+        alive = sum(1 for worker in workers if worker.is_alive())
+        log.info("🛑 [WorkerPool] 종료 완료 (미종료 {alive}개)", alive=alive)
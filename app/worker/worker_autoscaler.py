@@ -0,0 +1,156 @@
+# app/worker/worker_autoscaler.py
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from app.worker.content_worker_pool import ContentWorkerPool
+from app.monitoring.logger import get_logger
+
+log = get_logger("autoscaler")
+
+# 워커 수 범위
+MIN_WORKERS = 4
+MAX_WORKERS = 40
+
+# 판단 주기 (초)
+SCALE_INTERVAL = 5
+
+# 워커 1개당 대기 메시지가 이보다 많으면 증설
+SCALE_UP_BACKLOG_PER_WORKER = 2
+
+# 예상 대기 시간(대기 건수 x 처리 시간 / 워커 수)이 이보다 길면 증설 (초)
+SCALE_UP_DRAIN_SECONDS = 10
+
+# 한 번에 늘리는 워커 수
+SCALE_UP_STEP = 4
+
+# DB 커밋 지연이 이보다 길면 DB가 병목이므로 증설하지 않음 (초)
+MAX_COMMIT_LATENCY = 1.0
+
+# 큐가 비어 있는 상태가 이 횟수만큼 연속되면 워커 1개 축소
+SCALE_DOWN_IDLE_ROUNDS = 6
+
+# 기록할 최근 결정 수
+DECISION_HISTORY = 50
+
+
+class WorkerAutoscaler(threading.Thread):
+    """
+    워커 수 자동 조절 스레드
+    - 증설: 대기 건수 / 예상 대기 시간이 기준을 넘고 DB 커밋 지연이 정상일 때
+    - 축소: 큐가 일정 시간 연속으로 비어 있을 때 1개씩 (처리 중인 메시지는 끝낸 뒤 종료)
+    - 결정 내역은 로그 출력 + stats()로 조회
+    """
+
+    def __init__(
+        self,
+        pool: ContentWorkerPool,
+        commit_latency: Optional[Callable[[], float]] = None,
+        min_workers: int = MIN_WORKERS,
+        max_workers: int = MAX_WORKERS,
+        interval: float = SCALE_INTERVAL,
+    ):
+        """
+        :param pool: 스케줄러 모드 ContentWorkerPool
+        :param commit_latency: 현재 DB 커밋 지연(초)을 반환하는 함수
+        """
+        super().__init__(daemon=True, name="worker-autoscaler")
+        assert pool.scheduler is not None, "자동 조절은 스케줄러 모드 워커 풀에서만 사용 가능"
+        self.pool = pool
+        self.commit_latency = commit_latency or (lambda: 0.0)
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.interval = interval
+        self.running = True
+
+        self.idle_rounds = 0
+        self.scale_ups = 0
+        self.scale_downs = 0
+        self.decisions = deque(maxlen=DECISION_HISTORY)
+
+    def stop(self):
+        self.running = False
+
+    def run(self):
+        log.info("📈 [Autoscaler] 시작됨 (워커 {min_workers}~{max_workers}개)", min_workers=self.min_workers, max_workers=self.max_workers)
+        while self.running:
+            time.sleep(self.interval)
+            try:
+                self.evaluate()
+            except Exception as e:
+                log.error("[❌ Autoscaler 판단 실패] {error}", error=e)
+
+    def evaluate(self) -> int:
+        """
+        한 번 판단하고 워커 수 조정
+
+        :return: 변경된 워커 수 (+ 증설 / - 축소 / 0 유지)
+        """
+        workers = self.pool.size()
+        backlog = self.pool.scheduler.qsize()
+        item_latency = self.pool.item_latency_ewma
+        commit_latency = self.commit_latency()
+        drain_seconds = backlog * item_latency / max(workers, 1)
+
+        delta = 0
+        reason = None
+        if workers < self.min_workers:
+            delta = self.min_workers - workers
+            reason = "최소 워커 수 보장"
+        elif backlog > workers * SCALE_UP_BACKLOG_PER_WORKER or drain_seconds > SCALE_UP_DRAIN_SECONDS:
+            self.idle_rounds = 0
+            if commit_latency > MAX_COMMIT_LATENCY:
+                reason = f"증설 보류 (DB 커밋 지연 {commit_latency:.2f}s)"
+            elif workers < self.max_workers:
+                delta = min(SCALE_UP_STEP, self.max_workers - workers)
+                reason = "대기 증가"
+        elif backlog == 0:
+            self.idle_rounds += 1
+            if self.idle_rounds >= SCALE_DOWN_IDLE_ROUNDS and workers > self.min_workers:
+                delta = -1
+                reason = "유휴"
+                self.idle_rounds = 0
+        else:
+            self.idle_rounds = 0
+
+        if delta > 0:
+            self.pool.add_workers(delta)
+            self.scale_ups += 1
+        elif delta < 0:
+            delta = -self.pool.retire_workers(-delta)
+            self.scale_downs += 1
+
+        if reason:
+            decision = {
+                "at": time.time(),
+                "workers": workers,
+                "delta": delta,
+                "reason": reason,
+                "backlog": backlog,
+                "item_latency": item_latency,
+                "commit_latency": commit_latency,
+            }
+            self.decisions.append(decision)
+            log.info(
+                "[📈 Autoscaler] {reason}: 워커 {workers} → {target} "
+                "(대기 {backlog}, 처리 {item_latency_ms:.0f}ms, 커밋 {commit_latency_ms:.0f}ms)",
+                reason=reason, workers=workers, target=workers + delta, backlog=backlog,
+                item_latency_ms=item_latency * 1000, commit_latency_ms=commit_latency * 1000,
+            )
+        return delta
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.pool.size(),
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            "backlog": self.pool.scheduler.qsize(),
+            "item_latency_ewma": self.pool.item_latency_ewma,
+            "commit_latency_ewma": self.commit_latency(),
+            "processed": self.pool.processed_count,
+            "scale_ups": self.scale_ups,
+            "scale_downs": self.scale_downs,
+            "recent_decisions": list(self.decisions),
+        }
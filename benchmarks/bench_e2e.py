@@ -0,0 +1,269 @@
+# benchmarks/bench_e2e.py
+# python -m benchmarks.bench_e2e --symbols 200 --messages 400 --latency-ms 20 --json e2e.json
+#
+# 실제 파이프라인 클래스로 처리량 / 지연 시간 측정 (외부 서비스 없음)
+# - Kafka: tests/fakes.py의 FakeBroker / FakeConsumer (KafkaSimpleConsumer는 그대로 사용)
+# - Google News / 기사: benchmarks.news_stub_server (로컬 HTTP)
+# - DB: 임시 SQLite (--database-url로 로컬 MySQL 지정 가능)
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from app.kafka.test_producer import (
+    PROFILES,
+    SymbolUniverse,
+    generate_schedule,
+    load_replay,
+    parse_score_distribution,
+    run_load,
+)
+from benchmarks.news_stub_server import NewsStubServer, add_arguments, config_from_args
+from benchmarks.results import build_report, metric, percentile, write_report
+
+
+class LatencyCollector:
+    """
+    tracer.exporter 자리에 두는 수집기 (완료된 trace마다 상태 / 소요 시간 기록)
+    - 소요 시간: 메시지 createdAt(발행 시각)부터 종료까지 (없으면 수신부터)
+    """
+
+    def __init__(self):
+        self.durations: dict[str, list[float]] = {}
+        self.last_finished_at = 0.0
+        self.finished = threading.Semaphore(0)
+        self._lock = threading.Lock()
+
+    def export(self, trace):
+        with self._lock:
+            latency = trace.latency if trace.created_at is not None else trace.duration
+            self.durations.setdefault(trace.status, []).append(latency)
+            self.last_finished_at = time.perf_counter()
+        self.finished.release()
+
+    def stop(self):
+        pass
+
+    def statuses(self) -> dict:
+        with self._lock:
+            return {status: len(values) for status, values in self.durations.items()}
+
+
+def run_pipeline(args, stub: NewsStubServer) -> dict:
+    # app.database.connection은 import 시점에 DATABASE_URL로 엔진을 만들므로 여기서 import
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crawler import bfs_url_extractor
+    from app.crawler.dedup_index import dedup_index
+    from app.crawler.downloader import content_writer
+    from app.crawler.politeness import politeness
+    from app.database.connection import engine
+    from app.kafka.kafka_simple_consumer import KafkaSimpleConsumer
+    from app.models.base import Base
+    from app.models.content import Content
+    from app.monitoring.tracing import tracer
+    from app.queue.priority_scheduler import PriorityScheduler
+    from app.queue.symbol_coalescer import SymbolCoalescer
+    from app.queue.symbol_to_url_router import SymbolToUrlQueueRouter, MAX_URL_QUEUE_SIZE
+    from app.ranking.symbol_priority_classifier import SymbolPriorityClassifier, MAX_QUEUE_SIZE
+    from app.worker.content_worker_pool import ContentWorkerPool
+    from tests.fakes import FakeBroker, FakeConsumer
+
+    # ✅ 대역 서버 / 도메인 속도 제한 / BFS 모드
+    bfs_url_extractor.RSS_URL_TEMPLATE = stub.rss_url_template
+    bfs_url_extractor.BFS_MODE = args.bfs_mode
+    politeness.rate = args.domain_rate
+    politeness.burst = args.domain_burst
+
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    dedup_index.load(session_factory)
+
+    def count_contents() -> int:
+        with session_factory() as session:
+            return session.execute(select(func.count()).select_from(Content)).scalar_one()
+
+    # ✅ main.py와 같은 구성 (스케줄러 / 병합기 / 분류기 / 라우터 / 워커 풀)
+    symbol_scheduler = PriorityScheduler(maxsize=MAX_QUEUE_SIZE)
+    url_scheduler = PriorityScheduler(maxsize=MAX_URL_QUEUE_SIZE)
+    coalescer = SymbolCoalescer(ttl=args.ttl)
+    classifier = SymbolPriorityClassifier(
+        symbol_scheduler.tier("TOP"), symbol_scheduler.tier("MID"), symbol_scheduler.tier("BOT"),
+        use_threadsafe_queue=True,
+        coalescer=coalescer,
+    )
+    routers = [
+        SymbolToUrlQueueRouter(
+            symbol_scheduler.tier("TOP"), symbol_scheduler.tier("MID"), symbol_scheduler.tier("BOT"),
+            url_scheduler.tier("TOP"), url_scheduler.tier("MID"), url_scheduler.tier("BOT"),
+            use_threadsafe_queue=True,
+            symbol_scheduler=symbol_scheduler,
+            coalescer=coalescer,
+        )
+        for _ in range(args.routers)
+    ]
+    pool = ContentWorkerPool(
+        db_session_factory=session_factory,
+        use_threadsafe_queue=True,
+        scheduler=url_scheduler,
+        worker_count=args.workers,
+    )
+
+    # ✅ 메시지마다 trace 1개 → 완료(수집 / 병합 / 건너뜀 / 실패) 개수로 종료 판단
+    collector = LatencyCollector()
+    tracer.sample_rate = 1.0
+    tracer.exporter = collector
+
+    broker = FakeBroker(args.partitions)
+    schedule = build_schedule(args)
+    total = len(schedule)
+    paced = bool(args.rate or args.replay)
+
+    def produce():
+        """부하 도구(app.kafka.test_producer)의 전송 계획대로 대역 브로커에 발행"""
+        run_load(schedule, lambda message: broker.produce(message["symbol"], message["score"], message["createdAt"]))
+
+    if not paced:
+        produce()
+    consumer = KafkaSimpleConsumer(classifier, consumer_factory=lambda: FakeConsumer(broker, "bench"))
+
+    contents_before = count_contents()
+    classifier.start()
+    for router in routers:
+        threading.Thread(target=router.start, daemon=True).start()
+    pool.start()
+
+    started = time.perf_counter()
+    if paced:
+        threading.Thread(target=produce, daemon=True).start()
+    consumer.start()
+    finished = 0
+    deadline = started + args.timeout
+    while finished < total and time.perf_counter() < deadline:
+        if collector.finished.acquire(timeout=0.5):
+            finished += 1
+    timed_out = finished < total
+    elapsed = (collector.last_finished_at or time.perf_counter()) - started
+
+    consumer.stop()
+    consumer.join(timeout=5)
+    pool.stop()
+    content_writer.stop()
+    classifier.stop()
+    articles = count_contents() - contents_before
+
+    done = collector.durations.get("done", [])
+    all_durations = [value for values in collector.durations.values() for value in values]
+    metrics = {
+        "symbols_per_sec": metric(finished / elapsed, "symbols/s"),
+        "articles_per_sec": metric(articles / elapsed, "articles/s"),
+        "latency_p50_s": metric(percentile(done, 50), "s", better="lower"),
+        "latency_p99_s": metric(percentile(done, 99), "s", better="lower"),
+    }
+    details = {
+        "elapsed_s": round(elapsed, 3),
+        "timed_out": timed_out,
+        "messages_sent": total,
+        "messages_finished": finished,
+        "articles_saved": articles,
+        "trace_statuses": collector.statuses(),
+        "latency_all_p50_s": round(percentile(all_durations, 50), 6),
+        "latency_all_p99_s": round(percentile(all_durations, 99), 6),
+        "stages": tracer.summary()["stages"],
+        "stub_requests": stub.stats(),
+        "politeness": {key: value for key, value in politeness.stats().items() if key != "backing_off"},
+        "offsets_committed": broker.committed,
+    }
+    return {"metrics": metrics, "details": details}
+
+
+def build_schedule(args) -> list[tuple[float, str, int]]:
+    """
+    발행 계획 (시작 후 초, 심볼, 점수)
+    - --replay: 기록 재생 / --rate: Zipf 심볼 + 점수 분포 + 부하 형태로 messages / rate초 동안 발행
+    - 둘 다 없으면 심볼을 순환하며 messages건을 시작 전에 모두 발행 (최대 처리량)
+    """
+    if args.replay:
+        return load_replay(args.replay, args.speed)
+
+    universe = SymbolUniverse(args.symbols, args.zipf, symbols=[])
+    score = parse_score_distribution(args.score)
+    if args.rate:
+        return list(generate_schedule(
+            args.rate, args.messages / args.rate, universe, score,
+            profile=args.profile, burst=args.burst, burst_seconds=args.burst_seconds, seed=args.seed,
+        ))
+
+    rng = random.Random(args.seed)
+    return [
+        (0.0, universe.symbols[i % args.symbols], score(rng, i % args.symbols, args.symbols))
+        for i in range(args.messages)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 end-to-end 벤치마크 (Kafka 대역 → 분류기 → BFS → 워커 → DB)")
+    parser.add_argument("--symbols", type=int, default=200, help="고유 심볼 수")
+    parser.add_argument("--messages", type=int, default=400, help="Kafka 메시지 수 (심볼을 순환하며 생성)")
+    parser.add_argument("--rate", type=float, default=0, help="초당 발행 메시지 수 (0이면 미리 모두 발행 → 최대 처리량)")
+    parser.add_argument("--zipf", type=float, default=0, help="--rate 사용 시 심볼 인기 Zipf 지수 (0이면 균등)")
+    parser.add_argument("--score", default="normal:50:20", help="점수 분포 (app.kafka.test_producer 형식)")
+    parser.add_argument("--profile", choices=PROFILES, default="steady")
+    parser.add_argument("--burst", type=float, default=5.0)
+    parser.add_argument("--burst-seconds", type=float, default=10)
+    parser.add_argument("--replay", default=None, help="기록된 메시지 파일 재생 (--symbols / --messages / --rate 무시)")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--partitions", type=int, default=6)
+    parser.add_argument("--routers", type=int, default=4, help="라우터 스레드 수 (심볼 동시 BFS 수)")
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--ttl", type=float, default=60, help="최근 수집 심볼 건너뜀 시간 (초)")
+    parser.add_argument("--bfs-mode", choices=("async", "sync"), default="async")
+    parser.add_argument("--domain-rate", type=float, default=1000.0, help="도메인별 초당 요청 수 (운영 기본값 1.0)")
+    parser.add_argument("--domain-burst", type=int, default=1000)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--json", default=None, help="결과 JSON 경로 (- 이면 stdout)")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 로그 출력")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory(prefix="bench-e2e-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+
+    stub = NewsStubServer(config_from_args(args), domains=args.domains).start()
+    try:
+        # 파이프라인 로그(stdout)는 측정에서 제외
+        with contextlib.ExitStack() as stack:
+            if not args.verbose:
+                devnull = stack.enter_context(open(os.devnull, "w"))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+            result = run_pipeline(args, stub)
+    finally:
+        stub.stop()
+        tmpdir.cleanup()
+
+    config = {key: value for key, value in vars(args).items() if key not in ("json", "verbose", "database_url")}
+    config["database"] = args.database_url.split("://")[0] if args.database_url else "sqlite"
+    report = build_report("e2e", config, result["metrics"], result["details"])
+
+    details = result["details"]
+    print(
+        f"메시지 {details['messages_finished']}/{details['messages_sent']}건, 기사 {details['articles_saved']}건, "
+        f"{details['elapsed_s']}s{' (시간 초과)' if details['timed_out'] else ''}"
+    )
+    for name, value in result["metrics"].items():
+        print(f"  {name:<18} {value['value']:>12.4f} {value['unit']}")
+    print(f"  trace 상태 {details['trace_statuses']}  요청 {details['stub_requests']}")
+    if args.json:
+        write_report(report, args.json)
+    return 1 if details["timed_out"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
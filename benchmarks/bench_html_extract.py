@@ -0,0 +1,67 @@
+# benchmarks/bench_html_extract.py
+# python -m benchmarks.bench_html_extract --pages 200 --links 300
+
+import argparse
+import random
+import time
+
+from app.crawler.bfs_url_extractor import extract_links, extract_title_summary
+from app.crawler.html_extractor import extract_page
+
+
+def make_page(index: int, link_count: int, filler_paragraphs: int) -> str:
+    """기사 페이지와 비슷한 구조의 테스트용 HTML 생성"""
+    rng = random.Random(index)
+    links = "".join(
+        f'<li><a href="/news/{index}-{i}">기사 {i}</a></li>' if i % 3
+        else f'<li><a href="https://example{rng.randint(1, 50)}.com/news/{i}">외부 {i}</a></li>'
+        for i in range(link_count)
+    )
+    body = "".join(f"<p>{'본문 내용 ' * 30}</p>" for _ in range(filler_paragraphs))
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>테스트 기사 {index}</title>"
+        '<meta charset="utf-8">'
+        f'<meta name="description" content="기사 {index} 요약">'
+        f'<meta property="og:description" content="기사 {index} OG 요약">'
+        '<link rel="stylesheet" href="/style.css"><script>var x = 1;</script>'
+        f"</head><body><nav><ul>{links}</ul></nav><article>{body}</article></body></html>"
+    )
+
+
+def run(label: str, pages: list[str], func) -> float:
+    start = time.perf_counter()
+    for i, html in enumerate(pages):
+        func(html, f"https://news.example.com/article/{i}")
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {elapsed * 1000:9.1f} ms  {len(pages) / elapsed:9.1f} pages/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 추출 벤치마크 (BeautifulSoup 2회 파싱 vs 단일 패스)")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--links", type=int, default=300)
+    parser.add_argument("--paragraphs", type=int, default=50)
+    args = parser.parse_args()
+
+    pages = [make_page(i, args.links, args.paragraphs) for i in range(args.pages)]
+    print(f"pages={args.pages} links/page={args.links} avg size={sum(map(len, pages)) // len(pages)} chars\n")
+
+    baseline = run(
+        "extract_title_summary + extract_links",
+        pages,
+        lambda html, url: (extract_title_summary("BENCH", html, url), extract_links(html, url)),
+    )
+    single = run("extract_page (links)", pages, lambda html, url: extract_page(html, url))
+    head_only = run(
+        "extract_page (head only)",
+        pages,
+        lambda html, url: extract_page(html, url, follow_links=False),
+    )
+
+    print(f"\nspeedup: links x{baseline / single:.1f}, head only x{baseline / head_only:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# benchmarks/bench_html_storage.py
+# python -m benchmarks.bench_html_storage --articles 2000 --page-kb 50 --json storage.json
+#
+# 원본 HTML 저장 방식별 DB 크기 / 목록 조회 지연 시간 (임시 SQLite 파일)
+# - inline: contents.html에 그대로 저장 (분리 전)
+# - split: content_bodies에 압축 저장 (HTML_STORAGE 기본값)
+# - inline_eager: inline DB를 분리 전 조회 방식(select(Content)가 html까지 읽음)으로 조회
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker, undefer
+
+from app.crawler.content_writer import BatchedContentWriter, ContentRecord
+from app.crawler.html_storage import CODECS, HTML_COMPRESSION, compress, pack_html, zstandard
+from app.models.base import Base
+from app.models.content import Content
+from app.services.content_service import (
+    get_content_html,
+    get_contents_by_cursor,
+    get_contents_by_symbol,
+    get_contents_paginated,
+)
+from benchmarks.results import build_report, metric, percentile, write_report
+
+WORDS = (
+    "주가 실적 발표 매출 영업이익 전망 투자자 시장 금리 인플레이션 반도체 전기차 "
+    "market shares earnings revenue guidance analyst quarter growth supply demand "
+    "Fed rate inflation chip battery demand outlook forecast said according report"
+).split()
+
+
+def make_article(rng: random.Random, page_kb: int, links: int) -> str:
+    """
+    실제 기사 페이지와 비슷하게 압축되는 HTML (고정 틀 + 무작위 문장 + 스크립트 / 링크)
+    """
+    nav = "".join(
+        f'<li class="nav-item"><a href="https://news.example{rng.randint(1, 50)}.com/news/{rng.getrandbits(40):x}">'
+        f"{' '.join(rng.choices(WORDS, k=4))}</a></li>"
+        for _ in range(links)
+    )
+    head = (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+        f"<title>{' '.join(rng.choices(WORDS, k=8))}</title>"
+        f'<meta name="description" content="{" ".join(rng.choices(WORDS, k=20))}">'
+        f'<script>window.__STATE__={{"id":"{rng.getrandbits(64):x}","ts":{rng.randint(10**9, 2 * 10**9)}}};</script>'
+        f'</head><body><header><nav><ul class="menu">{nav}</ul></nav></header><article class="story-body">'
+    )
+    paragraphs = []
+    size = len(head.encode("utf-8"))
+    while size < page_kb * 1024:
+        paragraph = f'<p class="para">{" ".join(rng.choices(WORDS, k=rng.randint(30, 80)))}.</p>'
+        paragraphs.append(paragraph)
+        size += len(paragraph.encode("utf-8"))
+    return head + "".join(paragraphs) + "</article></body></html>"
+
+
+def bench_compression(pages: list[str], repeat: int) -> dict:
+    """압축 방식별 압축 속도 (MB/s, 압축 전 기준) / 압축률"""
+    raw = [page.encode("utf-8") for page in pages]
+    raw_bytes = sum(len(data) for data in raw)
+    results = {}
+    for codec in CODECS:
+        if codec == "none" or (codec == "zstd" and zstandard is None):
+            continue
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            stored = sum(len(compress(data, codec)[1]) for data in raw)
+            best = min(best, time.perf_counter() - started)
+        results[codec] = {"mb_per_sec": raw_bytes / best / 1e6, "ratio": raw_bytes / stored}
+    return results
+
+
+def load(path: str, mode: str, args, pages: list[str]) -> dict:
+    """
+    임시 SQLite 파일에 articles건 저장 (저장 스레드 처리량만 측정)
+    - split이면 워커처럼 미리 압축한 본문을 넘김 (압축 속도는 bench_compression)
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    writer = BatchedContentWriter(session_factory, html_storage=mode)
+    bodies = [pack_html(page) for page in pages] if mode == "split" else [None] * len(pages)
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    futures = []
+    for i in range(args.articles):
+        symbol = f"SYM{rng.randrange(args.symbols)}"
+        url = f"https://news.example.com/news/{symbol}/{i}"
+        html = pages[i % len(pages)]
+        body = bodies[i % len(pages)]
+        futures.append(writer.submit(ContentRecord(
+            symbol, url, f"{symbol} 기사 {i}", "요약 " * 20, html if body is None else "", "news.example.com",
+            f"{i:064x}", body=body,
+        )))
+    for future in futures:
+        future.result()
+    writer.stop()
+    elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+    engine.dispose()
+    return {"engine": create_engine(f"sqlite:///{path}"), "load_s": elapsed, "db_bytes": os.path.getsize(path)}
+
+
+def legacy_page(session, page: int, size: int) -> list:
+    """분리 전 목록 조회 (html 컬럼까지 읽음)"""
+    stmt = (
+        select(Content)
+        .options(undefer(Content.html))
+        .order_by(Content.crawled_at.desc(), Content.id.desc())
+        .offset((page - 1) * size)
+        .limit(size)
+    )
+    return session.execute(stmt).scalars().all()
+
+
+def time_queries(session_factory, queries: list) -> list[float]:
+    """쿼리마다 새 세션 (ORM identity map 재사용 없이) 소요 시간 (ms)"""
+    durations = []
+    for query in queries:
+        with session_factory() as session:
+            started = time.perf_counter()
+            query(session)
+            durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def bench_listing(engine, args, legacy: bool = False) -> dict:
+    """페이지 / 심볼 / 커서 목록 조회 + 원본 1건 조회 지연 시간 (ms)"""
+    session_factory = sessionmaker(bind=engine)
+    rng = random.Random(args.seed)
+    max_page = max(args.articles // args.page_size, 1)
+    pages = [rng.randint(1, min(max_page, 50)) for _ in range(args.queries)]
+
+    if legacy:
+        return {"list": time_queries(session_factory, [
+            lambda session, page=page: legacy_page(session, page, args.page_size) for page in pages
+        ])}
+
+    symbols = [f"SYM{rng.randrange(args.symbols)}" for _ in range(args.queries)]
+    ids = [rng.randint(1, args.articles) for _ in range(args.queries)]
+    return {
+        "list": time_queries(session_factory, [
+            lambda session, page=page: get_contents_paginated(session, page, args.page_size) for page in pages
+        ]),
+        "symbol": time_queries(session_factory, [
+            lambda session, symbol=symbol: get_contents_by_symbol(session, symbol, 1, args.page_size) for symbol in symbols
+        ]),
+        "cursor": time_queries(session_factory, [
+            lambda session: get_contents_by_cursor(session, "", args.page_size) for _ in range(args.queries)
+        ]),
+        "html": time_queries(session_factory, [
+            lambda session, content_id=content_id: get_content_html(session, content_id) for content_id in ids
+        ]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="원본 HTML 저장 방식별 DB 크기 / 목록 조회 지연 시간")
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--page-kb", type=int, default=50, help="기사 HTML 크기 (KB)")
+    parser.add_argument("--links", type=int, default=150, help="기사 페이지 링크 수")
+    parser.add_argument("--distinct-pages", type=int, default=50, help="생성해서 돌려 쓰는 기사 HTML 수")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=300, help="조회 종류별 실행 횟수")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="결과 JSON 경로 (- 이면 stdout)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [make_article(rng, args.page_kb, args.links) for _ in range(args.distinct_pages)]
+
+    metrics = {}
+    details = {"compression": bench_compression(pages, args.repeat), "default_codec": HTML_COMPRESSION}
+    for codec, result in details["compression"].items():
+        metrics[f"compress_{codec}_mb_per_sec"] = metric(result["mb_per_sec"], "MB/s")
+        metrics[f"compress_{codec}_ratio"] = metric(result["ratio"], "x")
+
+    # 저장 스레드 로그는 측정에서 제외
+    with tempfile.TemporaryDirectory(prefix="bench-html-storage-") as tmpdir, \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for mode in ("inline", "split"):
+            loaded = load(os.path.join(tmpdir, f"{mode}.db"), mode, args, pages)
+            timings = bench_listing(loaded["engine"], args)
+            if mode == "inline":
+                timings["eager_list"] = bench_listing(loaded["engine"], args, legacy=True)["list"]
+            loaded["engine"].dispose()
+
+            metrics[f"{mode}_db_bytes_per_article"] = metric(loaded["db_bytes"] / args.articles, "bytes", better="lower")
+            metrics[f"{mode}_articles_per_sec"] = metric(args.articles / loaded["load_s"], "articles/s")
+            for name, durations in timings.items():
+                metrics[f"{mode}_{name}_p50_ms"] = metric(percentile(durations, 50), "ms", better="lower")
+                metrics[f"{mode}_{name}_p99_ms"] = metric(percentile(durations, 99), "ms", better="lower")
+            details[f"{mode}_db_bytes"] = loaded["db_bytes"]
+
+    details["raw_html_bytes_per_article"] = round(sum(len(page.encode("utf-8")) for page in pages) / len(pages))
+    print(f"기사 {args.articles}건 × {details['raw_html_bytes_per_article'] / 1024:.1f}KB, 목록 {args.page_size}개씩")
+    for name, value in metrics.items():
+        print(f"  {name:<36} {value['value']:>14.3f} {value['unit']}")
+
+    config = {key: value for key, value in vars(args).items() if key != "json"}
+    if args.json:
+        write_report(build_report("html_storage", config, metrics, details), args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# benchmarks/bench_micro.py
+# python -m benchmarks.bench_micro --json micro.json
+#
+# 핫 패스 함수별 처리량 (링크 / 제목·요약 추출, 중복 확인, 분류기 receive)
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crawler import deduplicator
+from app.crawler.bfs_url_extractor import extract_links, extract_title_summary
+from app.crawler.content_writer import BatchedContentWriter, ContentRecord
+from app.crawler.dedup_index import DedupIndex, FingerprintSet, dedup_index, fingerprint
+from app.crawler.html_extractor import extract_page
+from app.models.base import Base
+from app.queue.priority_scheduler import PriorityScheduler
+from app.ranking.symbol_priority_classifier import SymbolPriorityClassifier
+from benchmarks.bench_html_extract import make_page
+from benchmarks.results import build_report, metric, write_report
+
+
+def measure(func, items: list, repeat: int) -> float:
+    """
+    items 전체에 func를 repeat번 실행해서 가장 빠른 회차 기준 초당 호출 수
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def bench_html(args) -> dict:
+    pages = [(make_page(i, args.links, args.paragraphs), f"https://news.example.com/article/{i}") for i in range(args.pages)]
+    return {
+        "extract_links": measure(lambda page: extract_links(page[0], page[1]), pages, args.repeat),
+        "extract_title_summary": measure(lambda page: extract_title_summary("BENCH", page[0], page[1]), pages, args.repeat),
+        "extract_page": measure(lambda page: extract_page(page[0], page[1]), pages, args.repeat),
+        "extract_page_head_only": measure(lambda page: extract_page(page[0], page[1], follow_links=False), pages, args.repeat),
+    }
+
+
+def bench_dedup(args) -> dict:
+    rng = random.Random(args.seed)
+    stored = [f"https://news.example{rng.randint(1, 50)}.com/article/{i}" for i in range(args.stored)]
+    unseen = [f"https://news.example{rng.randint(1, 50)}.com/new/{i}" for i in range(args.lookups)]
+    hits = rng.sample(stored, min(args.lookups, len(stored)))
+    hashes = [deduplicator.get_content_hash(url) for url in stored]
+
+    fingerprints = FingerprintSet()
+    fingerprints.bulk_load(fingerprint(url) for url in stored)
+    index = DedupIndex()
+    index.urls.bulk_load(fingerprint(url) for url in stored)
+    index.ready = True
+
+    results = {
+        "is_valid_url": measure(deduplicator.is_valid_url, unseen, args.repeat),
+        "get_url_hash": measure(deduplicator.get_url_hash, unseen, args.repeat),
+        "get_content_hash": measure(deduplicator.get_content_hash, unseen, args.repeat),
+        "fingerprint": measure(fingerprint, unseen, args.repeat),
+        "fingerprint_set_hit": measure(fingerprints.__contains__, hits, args.repeat),
+        "fingerprint_set_miss": measure(fingerprints.__contains__, unseen, args.repeat),
+        "index_might_contain_url": measure(index.might_contain_url, unseen, args.repeat),
+    }
+
+    # DB 조회 경로 (SQLite 메모리 DB, 실제 배치 저장 스레드로 적재)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    writer = BatchedContentWriter(session_factory)
+    futures = [
+        writer.submit(ContentRecord("BENCH", url, "제목", "요약", "<html></html>", "news.example.com", content_hash))
+        for url, content_hash in zip(stored[:args.db_rows], hashes)
+    ]
+    for future in futures:
+        future.result()
+    writer.stop()
+
+    db_hits = stored[:min(args.db_rows, args.lookups)]
+    with session_factory() as session:
+        # 중복 인덱스 없이 DB만 조회
+        dedup_index.ready = False
+        results["is_duplicate_url_db_hit"] = measure(lambda url: deduplicator.is_duplicate_url(session, url), db_hits, args.repeat)
+        results["is_duplicate_url_db_miss"] = measure(lambda url: deduplicator.is_duplicate_url(session, url), unseen, args.repeat)
+        results["is_duplicate_hash_db"] = measure(
+            lambda content_hash: deduplicator.is_duplicate_hash(session, content_hash), hashes[:len(db_hits)], args.repeat
+        )
+        batches = [unseen[i:i + 50] for i in range(0, len(unseen), 50)]
+        results["filter_and_deduplicate_url"] = measure(
+            lambda batch: deduplicator.filter_and_deduplicate(session, batch), batches, args.repeat
+        ) * 50
+
+        # 중복 인덱스 로드 후 (새 URL은 DB 조회 없이 통과)
+        dedup_index.load(session_factory)
+        results["is_duplicate_url_indexed_miss"] = measure(lambda url: deduplicator.is_duplicate_url(session, url), unseen, args.repeat)
+    return results
+
+
+def bench_classifier(args) -> dict:
+    rng = random.Random(args.seed)
+    scores = [int(rng.gauss(50, 15)) for _ in range(args.messages)]
+    symbols = [f"SYM{i}" for i in range(args.messages)]
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        scheduler = PriorityScheduler()
+        classifier = SymbolPriorityClassifier(
+            scheduler.tier("TOP"), scheduler.tier("MID"), scheduler.tier("BOT"),
+            use_threadsafe_queue=True,
+            max_queue_size=args.messages,
+        )
+        receive = classifier.receive
+        start = time.perf_counter()
+        for symbol, score in zip(symbols, scores):
+            if not receive(symbol, score):
+                classifier.try_flush()
+                receive(symbol, score)
+        classifier.try_flush()
+        best = min(best, time.perf_counter() - start)
+    return {"classifier_receive": args.messages / best}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핫 패스 마이크로 벤치마크")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--links", type=int, default=300)
+    parser.add_argument("--paragraphs", type=int, default=50)
+    parser.add_argument("--stored", type=int, default=200_000, help="중복 인덱스에 적재할 URL 수")
+    parser.add_argument("--db-rows", type=int, default=20_000, help="DB에 적재할 기사 수")
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--messages", type=int, default=100_000, help="분류기 receive 호출 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="결과 JSON 경로 (- 이면 stdout)")
+    args = parser.parse_args()
+
+    # 분류기 / 저장 스레드 로그는 측정에서 제외
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        rates = {**bench_html(args), **bench_dedup(args), **bench_classifier(args)}
+
+    metrics = {name: metric(rate, "ops/s") for name, rate in rates.items()}
+    for name, rate in rates.items():
+        print(f"{name:<32} {rate:14.0f} ops/s  {1e6 / rate:10.2f} us/op")
+
+    config = {key: value for key, value in vars(args).items() if key != "json"}
+    if args.json:
+        write_report(build_report("micro", config, metrics), args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
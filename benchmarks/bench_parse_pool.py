@@ -0,0 +1,89 @@
+# benchmarks/bench_parse_pool.py
+# python -m benchmarks.bench_parse_pool --pages 400 --threads 10
+# python -m benchmarks.bench_parse_pool --corpus ./html_samples   (*.html 파일 사용)
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.bench_html_extract import make_page
+from app.crawler.parse_pool import ParsePool, PARSE_PROCESSES
+
+
+def load_corpus(args) -> list[bytes]:
+    """고정 코퍼스: --corpus 디렉터리의 *.html 또는 시드 고정 생성 페이지"""
+    if args.corpus:
+        return [path.read_bytes() for path in sorted(Path(args.corpus).glob("*.html"))]
+    return [make_page(i, args.links, args.paragraphs).encode("utf-8") for i in range(args.pages)]
+
+
+def busy_loop(stop: threading.Event, counter: list):
+    """같은 프로세스에서 GIL을 쓰는 다른 작업 (워커 / 라우터 스레드 역할)"""
+    while not stop.is_set():
+        sum(range(1000))
+        counter[0] += 1
+
+
+def run(label: str, pool: ParsePool, pages: list[bytes], threads: int, background: int):
+    stop = threading.Event()
+    counter = [0]
+    busy = [threading.Thread(target=busy_loop, args=(stop, counter), daemon=True) for _ in range(background)]
+    for thread in busy:
+        thread.start()
+
+    # 수집 스레드 역할: 원본 bytes를 파싱 단계에 넘기고 결과만 받음
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(
+            lambda item: pool.parse(item[1], f"https://news.example.com/article/{item[0]}"),
+            enumerate(pages),
+        ))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for thread in busy:
+        thread.join()
+
+    links = sum(len(page.links) for page in results)
+    print(
+        f"{label:<28} {elapsed * 1000:9.1f} ms  {len(pages) / elapsed:9.1f} pages/s"
+        f"  links={links}  background loops={counter[0]}"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 파싱 단계 벤치마크 (스레드 vs 프로세스 풀)")
+    parser.add_argument("--corpus", help="*.html 파일 디렉터리 (없으면 생성 페이지 사용)")
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--links", type=int, default=300)
+    parser.add_argument("--paragraphs", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=10, help="수집 스레드 수")
+    parser.add_argument("--processes", type=int, default=PARSE_PROCESSES)
+    parser.add_argument("--background", type=int, default=2, help="GIL을 경쟁하는 다른 스레드 수")
+    args = parser.parse_args()
+
+    pages = load_corpus(args)
+    print(
+        f"pages={len(pages)} avg size={sum(map(len, pages)) // max(len(pages), 1)} bytes "
+        f"threads={args.threads} processes={args.processes} background={args.background}\n"
+    )
+
+    thread_pool = ParsePool(mode="thread")
+    process_pool = ParsePool(mode="process", processes=args.processes)
+    try:
+        # 프로세스 생성 / import 비용은 측정에서 제외
+        process_pool.parse(pages[0], "https://news.example.com/warmup")
+
+        thread_only = run("thread", thread_pool, pages, args.threads, args.background)
+        process = run("process pool", process_pool, pages, args.threads, args.background)
+    finally:
+        process_pool.shutdown()
+
+    print(f"\nspeedup: x{thread_only / process:.1f}")
+
+
+if __name__ == "__main__":
+    main()
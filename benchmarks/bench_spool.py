@@ -0,0 +1,92 @@
+# benchmarks/bench_spool.py
+# python -m benchmarks.bench_spool --items 50000
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from app.queue.priority_scheduler import PriorityScheduler, TIERS
+from app.queue.spool import SqliteSpool
+
+
+def make_item(i: int) -> dict:
+    """워커 URL 큐 메시지와 같은 형태"""
+    return {
+        "symbol": "AAPL",
+        "title": f"테스트 기사 {i}",
+        "summary": "요약 " * 20,
+        "url": f"https://news.example.com/article/{i}",
+    }
+
+
+def run(label: str, scheduler: PriorityScheduler, items: int, consumers: int) -> float:
+    """생산자 1개 + 소비자 N개로 put → get → ack 처리량 측정"""
+    done = threading.Semaphore(0)
+
+    def consume():
+        while True:
+            _, item = scheduler.get()
+            if item is None:
+                return
+            scheduler.ack(item)
+            done.release()
+
+    threads = [threading.Thread(target=consume, daemon=True) for _ in range(consumers)]
+    for thread in threads:
+        thread.start()
+
+    start = time.perf_counter()
+    for i in range(items):
+        scheduler.put(make_item(i), TIERS[i % 3], block=True)
+    for _ in range(items):
+        done.acquire()
+    elapsed = time.perf_counter() - start
+
+    for _ in threads:
+        scheduler.put(None, "BOT", block=True)
+    for thread in threads:
+        thread.join()
+
+    print(f"{label:<22} {items / elapsed:10.0f} items/s  {elapsed * 1000:8.0f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="디스크 스풀 vs 메모리 큐 처리량 / 복구 시간")
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--consumers", type=int, default=10)
+    parser.add_argument("--maxsize", type=int, default=1000)
+    parser.add_argument("--backlog", type=int, default=20_000, help="복구 측정용 미처리 항목 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory = run("memory", PriorityScheduler(maxsize=args.maxsize), args.items, args.consumers)
+
+        spool = SqliteSpool(os.path.join(directory, "bench.db"))
+        spooled = run("sqlite spool", PriorityScheduler(maxsize=args.maxsize, spool=spool), args.items, args.consumers)
+        spool.close()
+        print(f"\nspool overhead: x{spooled / memory:.1f}")
+
+        # 미처리 항목이 남은 상태에서 재시작 → 복구 시간
+        path = os.path.join(directory, "recover.db")
+        spool = SqliteSpool(path)
+        scheduler = PriorityScheduler(spool=spool)
+        for i in range(args.backlog):
+            scheduler.put(make_item(i), TIERS[i % 3])
+        spool.close()
+
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        recovered = PriorityScheduler(spool=SqliteSpool(path))
+        elapsed = time.perf_counter() - start
+        print(
+            f"recovery: {recovered.qsize()} items in {elapsed * 1000:.0f} ms "
+            f"(file {size / 1024 / 1024:.1f} MB)"
+        )
+        recovered.spool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_symbol_classifier.py
+# python -m benchmarks.bench_symbol_classifier --messages 100000
+
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+from app.queue.priority_scheduler import PriorityScheduler
+from app.ranking.symbol_priority_classifier import SymbolPriorityClassifier
+
+
+def run(label: str, messages: int, drain: bool, seed: int = 0) -> float:
+    """
+    :param drain: True면 소비 스레드가 등급 큐를 계속 비움 (False면 큐 무제한)
+    """
+    rng = random.Random(seed)
+    scores = [int(rng.gauss(50, 15)) for _ in range(messages)]
+
+    scheduler = PriorityScheduler()
+    classifier = SymbolPriorityClassifier(
+        scheduler.tier("TOP"),
+        scheduler.tier("MID"),
+        scheduler.tier("BOT"),
+        use_threadsafe_queue=True,
+        max_queue_size=100 if drain else messages,
+    )
+
+    consumed = Counter()
+    stop = threading.Event()
+
+    def consume():
+        while not stop.is_set() or not scheduler.empty():
+            try:
+                tier, _ = scheduler.get(timeout=0.05)
+                consumed[tier] += 1
+            except Exception:
+                pass
+
+    consumer = threading.Thread(target=consume, daemon=True) if drain else None
+    if consumer:
+        consumer.start()
+    classifier.start()
+
+    # 메시지마다 출력되는 로그(LOG_LEVEL=DEBUG)는 측정에서 제외
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for i, score in enumerate(scores):
+            while classifier.available_credits() == 0:
+                # Kafka consumer처럼 수신을 멈춘 동안에도 버퍼를 비움 (타이머 flush만 기다리지 않음)
+                classifier.try_flush()
+                time.sleep(0.0005)
+            classifier.receive(f"SYM{i}", score)
+        elapsed = time.perf_counter() - start
+
+        while classifier.buffer:
+            time.sleep(0.01)
+        classifier.stop()
+        stop.set()
+        if consumer:
+            consumer.join()
+
+    if not drain:
+        consumed = Counter({tier: scheduler.qsize(tier) for tier in ("TOP", "MID", "BOT")})
+
+    print(
+        f"{label:<24} {messages / elapsed:11.0f} msg/s  {elapsed / messages * 1e6:6.1f} us/msg  "
+        f"TOP/MID/BOT={consumed['TOP']}/{consumed['MID']}/{consumed['BOT']}  "
+        f"thresholds={classifier.thresholds()}"
+    )
+    return messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="심볼 분류기 처리량 벤치마크")
+    parser.add_argument("--messages", type=int, default=100_000)
+    args = parser.parse_args()
+
+    run("unbounded queues", args.messages, drain=False)
+    run("bounded + consumer", args.messages, drain=True)
+
+
+if __name__ == "__main__":
+    main()
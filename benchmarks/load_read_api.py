@@ -0,0 +1,105 @@
+# benchmarks/load_read_api.py
+# DATABASE_URL=mysql+pymysql://... python -m benchmarks.load_read_api --clients 100 --seconds 30
+#
+# 조회 API 부하 테스트: uvicorn으로 content_router를 띄우고 동시 요청을 보내면서
+# 커넥션 풀 사용량(checked-out 연결 수)을 주기적으로 기록한다.
+# 요청이 끝난 뒤 checked-out 연결 수가 0으로 돌아오고 최대값이 pool_size + max_overflow를
+# 넘지 않으면 연결 누수가 없는 것.
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import uvicorn
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app.database.connection import read_engine, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from app.routes import content_router
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(content_router.router)
+    return app
+
+
+def sample_pool(stop: threading.Event, samples: list, interval: float):
+    while not stop.is_set():
+        samples.append(read_engine.pool.checkedout())
+        time.sleep(interval)
+
+
+def server_connections():
+    """MySQL 서버 측 연결 수 (MySQL이 아니면 None)"""
+    if read_engine.dialect.name != "mysql":
+        return None
+    with read_engine.connect() as conn:
+        return int(conn.execute(text("SHOW STATUS LIKE 'Threads_connected'")).all()[0][1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조회 API 부하 테스트 (커넥션 풀 사용량 확인)")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--symbol", default="AAPL")
+    args = parser.parse_args()
+
+    server = uvicorn.Server(uvicorn.Config(build_app(), port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.1)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    paths = ["/contents?page=1&size=20", f"/contents/{args.symbol}?page=1&size=20", "/contents?cursor=&size=20"]
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + args.seconds
+    lock = threading.Lock()
+
+    def client(index: int):
+        nonlocal errors
+        session = requests.Session()
+        i = index
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                ok = session.get(base_url + paths[i % len(paths)], timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                errors += 0 if ok else 1
+            i += 1
+
+    before = server_connections()
+    samples = []
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_pool, args=(stop, samples, 0.1), daemon=True)
+    sampler.start()
+
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        list(pool.map(client, range(args.clients)))
+
+    time.sleep(0.5)
+    stop.set()
+    sampler.join()
+
+    latencies.sort()
+    print(f"requests={len(latencies)} errors={errors} rps={len(latencies) / args.seconds:.0f}")
+    print(f"latency p50={statistics.median(latencies) * 1000:.1f}ms p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+    print(f"pool checked-out max={max(samples)} (limit {DB_POOL_SIZE + DB_MAX_OVERFLOW}) after={read_engine.pool.checkedout()}")
+    print(f"pool status: {read_engine.pool.status()}")
+    if before is not None:
+        print(f"MySQL Threads_connected before={before} after={server_connections()}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
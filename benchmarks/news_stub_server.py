@@ -0,0 +1,261 @@
+# benchmarks/news_stub_server.py
+# python -m benchmarks.news_stub_server --domains 4 --items 10 --links 30 --page-kb 40 --latency-ms 20
+# → RSS_URL_TEMPLATE="http://127.0.0.1:8900/rss/search?q={symbol}" 로 크롤러 실행
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from email.utils import formatdate
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+ROBOTS_TXT = b"User-agent: *\nAllow: /\n"
+
+# 기사 발행 시각 기준 (RSS pubDate, 항목 번호마다 1분씩 최신)
+BASE_PUBLISHED_AT = 1_700_000_000
+
+
+@dataclass
+class StubConfig:
+    """
+    :param items: 심볼별 RSS 항목 수
+    :param links: 기사 페이지의 링크 수 (BFS fan-out)
+    :param external_ratio: 다른 도메인(포트)으로 가는 링크 비율
+    :param page_kb: 기사 페이지 크기 (KB, 본문 문단으로 채움)
+    :param latency_ms: 응답 지연 평균 (ms)
+    :param jitter_ms: 응답 지연 표준편차 (ms)
+    :param error_rate: 500 응답 비율 (robots.txt 제외)
+    :param throttle_rate: 429 응답 비율 (Retry-After: 1)
+    """
+
+    items: int = 10
+    links: int = 30
+    external_ratio: float = 0.3
+    page_kb: int = 40
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    seed: int = 0
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # 동시 연결이 많아도 연결 거부 없이 대기
+
+
+class NewsStubServer:
+    """
+    Google News RSS / 기사 페이지 대역 (로컬 HTTP)
+    - /rss/search?q=SYMBOL: 심볼별 RSS (항목 링크는 도메인에 골고루 분배, ETag → 304)
+    - /news/SYMBOL/ID: 기사 페이지 (제목 / description / og:description / 링크 / 본문)
+    - /robots.txt: 전체 허용
+    - 도메인 = 포트 (politeness 정책은 host:port 단위로 적용)
+    - 같은 경로는 항상 같은 본문 (지연 / 오류만 요청마다 무작위)
+    """
+
+    def __init__(self, config: StubConfig = None, domains: int = 1, host: str = "127.0.0.1", port: int = 0):
+        """
+        :param domains: 실행할 서버(도메인) 수
+        :param port: 첫 서버 포트 (0이면 빈 포트, 나머지 도메인은 port + 1, + 2 ...)
+        """
+        self.config = config or StubConfig()
+        self.host = host
+        self.ports = [port + i if port else 0 for i in range(domains)]
+        self.base_urls: list[str] = []
+        self.requests = Counter()
+        self._servers: list[_StubHTTPServer] = []
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def rss_url_template(self) -> str:
+        """bfs_url_extractor.RSS_URL_TEMPLATE 값"""
+        return f"{self.base_urls[0]}/rss/search?q={{symbol}}"
+
+    def start(self) -> "NewsStubServer":
+        handler = self._handler_class()
+        for port in self.ports:
+            server = _StubHTTPServer((self.host, port), handler)
+            self._servers.append(server)
+            self.base_urls.append(f"http://{self.host}:{server.server_address[1]}")
+            threading.Thread(target=server.serve_forever, daemon=True, name=f"news-stub-{port}").start()
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.requests)
+
+    def _count(self, key: str):
+        with self._lock:
+            self.requests[key] += 1
+
+    def _draw(self) -> tuple[float, int]:
+        """요청 하나의 (지연 초, 강제 응답 코드 또는 0)"""
+        config = self.config
+        with self._lock:
+            delay = max(self._rng.gauss(config.latency_ms, config.jitter_ms), 0.0) / 1000 if config.latency_ms else 0.0
+            roll = self._rng.random()
+        if roll < config.error_rate:
+            return delay, 500
+        if roll < config.error_rate + config.throttle_rate:
+            return delay, 429
+        return delay, 0
+
+    def _article_url(self, symbol: str, article_id: str) -> str:
+        index = int(hashlib.md5(article_id.encode()).hexdigest()[:8], 16)
+        return f"{self.base_urls[index % len(self.base_urls)]}/news/{symbol}/{article_id}"
+
+    def rss(self, symbol: str) -> bytes:
+        return _render_rss(symbol, tuple(
+            (self._article_url(symbol, str(i)), i) for i in range(self.config.items)
+        ))
+
+    def article(self, symbol: str, article_id: str) -> bytes:
+        return _render_article(symbol, article_id, tuple(self.base_urls), self.config.links,
+                               self.config.external_ratio, self.config.page_kb)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive (크롤러 http_client 연결 재사용)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path == "/robots.txt":
+                    stub._count("robots")
+                    return self._send(200, ROBOTS_TXT, "text/plain")
+
+                delay, forced_status = stub._draw()
+                if delay:
+                    time.sleep(delay)
+                if forced_status:
+                    stub._count(str(forced_status))
+                    headers = {"Retry-After": "1"} if forced_status == 429 else {}
+                    return self._send(forced_status, b"", "text/plain", headers)
+
+                if parsed.path == "/rss/search":
+                    symbol = parse_qs(parsed.query).get("q", [""])[0]
+                    etag = f'"{symbol}-{stub.config.items}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        stub._count("rss_304")
+                        return self._send(304, b"", "application/rss+xml", {"ETag": etag})
+                    stub._count("rss")
+                    return self._send(200, stub.rss(symbol), "application/rss+xml; charset=utf-8", {"ETag": etag})
+
+                parts = parsed.path.strip("/").split("/")
+                if len(parts) == 3 and parts[0] == "news":
+                    stub._count("article")
+                    return self._send(200, stub.article(parts[1], parts[2]), "text/html; charset=utf-8")
+
+                stub._count("404")
+                self._send(404, b"", "text/plain")
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@lru_cache(maxsize=10_000)
+def _render_rss(symbol: str, items: tuple) -> bytes:
+    entries = "".join(
+        f"<item><title>{escape(symbol)} 뉴스 {i}</title><link>{escape(url)}</link>"
+        f"<guid>{escape(url)}</guid><pubDate>{formatdate(BASE_PUBLISHED_AT + i * 60, usegmt=True)}</pubDate></item>"
+        for url, i in items
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{escape(symbol)}</title>{entries}</channel></rss>"
+    ).encode("utf-8")
+
+
+@lru_cache(maxsize=10_000)
+def _render_article(symbol: str, article_id: str, base_urls: tuple, links: int, external_ratio: float, page_kb: int) -> bytes:
+    rng = random.Random(f"{symbol}/{article_id}")
+    anchors = []
+    for i in range(links):
+        target = f"/news/{symbol}/{article_id}-{i}"
+        if rng.random() < external_ratio:
+            target = rng.choice(base_urls) + target
+        anchors.append(f'<li><a href="{target}">관련 기사 {i}</a></li>')
+
+    head = (
+        "<!DOCTYPE html><html><head>"
+        '<meta charset="utf-8">'
+        f"<title>{symbol} 기사 {article_id}</title>"
+        f'<meta name="description" content="{symbol} 기사 {article_id} 요약">'
+        f'<meta property="og:description" content="{symbol} 기사 {article_id} OG 요약">'
+        '<link rel="stylesheet" href="/style.css"><script>var x = 1;</script>'
+        f"</head><body><nav><ul>{''.join(anchors)}</ul></nav><article>"
+    )
+    paragraph = f"<p>{'본문 내용 ' * 30}</p>"
+    remaining = max(page_kb * 1024 - len(head.encode("utf-8")), 0)
+    body = paragraph * (remaining // len(paragraph.encode("utf-8")) + 1)
+    return (head + body + "</article></body></html>").encode("utf-8")
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """StubConfig / 도메인 수 옵션 (bench_e2e와 공유)"""
+    defaults = StubConfig()
+    parser.add_argument("--domains", type=int, default=4, help="도메인(포트) 수")
+    parser.add_argument("--items", type=int, default=defaults.items, help="심볼별 RSS 항목 수")
+    parser.add_argument("--links", type=int, default=defaults.links, help="기사 페이지 링크 수")
+    parser.add_argument("--external-ratio", type=float, default=defaults.external_ratio)
+    parser.add_argument("--page-kb", type=int, default=defaults.page_kb)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_args(args) -> StubConfig:
+    return StubConfig(**{name: getattr(args, name) for name in asdict(StubConfig())})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 뉴스 / RSS 대역 서버")
+    add_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    server = NewsStubServer(config_from_args(args), domains=args.domains, host=args.host, port=args.port).start()
+    print(f"✅ 뉴스 대역 서버 실행 중: {', '.join(server.base_urls)}")
+    print(f'   RSS_URL_TEMPLATE="{server.rss_url_template}"')
+    try:
+        while True:
+            time.sleep(10)
+            print(f"[📊 요청 수] {server.stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/otlp_collector.py
+# python -m benchmarks.otlp_collector --port 4318
+# → OTEL_EXPORTER_OTLP_ENDPOINT=http://localhost:4318 으로 크롤러 실행
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _attributes(span: dict) -> dict:
+    values = {}
+    for attribute in span.get("attributes", []):
+        value = attribute["value"]
+        values[attribute["key"]] = next(iter(value.values())) if value else None
+    return values
+
+
+def print_traces(request: dict):
+    """trace별로 단계 구간 소요 시간 출력"""
+    spans_by_trace: dict[str, list[dict]] = {}
+    for resource_spans in request.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                spans_by_trace.setdefault(span["traceId"], []).append(span)
+
+    for trace_id, spans in spans_by_trace.items():
+        spans.sort(key=lambda span: int(span["startTimeUnixNano"]))
+        root = next((span for span in spans if not span.get("parentSpanId")), spans[0])
+        root_attributes = _attributes(root)
+        total_ms = (int(root["endTimeUnixNano"]) - int(root["startTimeUnixNano"])) / 1e6
+        print(f"[🧵 {trace_id[:8]}] {root_attributes.get('symbol')} {root_attributes.get('status')} {total_ms:.1f}ms")
+        for span in spans:
+            if span is root:
+                continue
+            start_ms = (int(span["startTimeUnixNano"]) - int(root["startTimeUnixNano"])) / 1e6
+            duration_ms = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+            print(f"    +{start_ms:8.1f}ms {span['name']:<24} {duration_ms:8.1f}ms")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != "/v1/traces":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            print_traces(json.loads(body))
+        except (ValueError, KeyError) as e:
+            print(f"[❌ 잘못된 요청] {e}")
+            self.send_response(400)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OTLP/HTTP(JSON) trace 수신 확인용 collector")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), _Handler)
+    print(f"✅ OTLP collector 대기 중: http://{args.host}:{args.port}/v1/traces")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/results.py
+# 벤치마크 결과 JSON (회귀 추적용) 작성 / 비교
+
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+
+
+def metric(value: float, unit: str, better: str = "higher") -> dict:
+    """
+    :param better: "higher" (처리량) / "lower" (지연 시간)
+    """
+    return {"value": round(value, 6), "unit": unit, "better": better}
+
+
+def percentile(values: list[float], q: float) -> float:
+    """q: 0 ~ 100 (nearest-rank, 값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def build_report(name: str, config: dict, metrics: dict, details: dict = None) -> dict:
+    """
+    :param metrics: 지표 이름 → metric()
+    :param details: 비교하지 않는 참고 정보 (단계별 시간, 요청 수 등)
+    """
+    return {
+        "benchmark": name,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "metrics": metrics,
+        "details": details or {},
+    }
+
+
+def write_report(report: dict, path: str):
+    """path가 "-"면 stdout"""
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if path == "-":
+        print(text)
+        return
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text + "\n")
+
+
+def load_metrics(path: str) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return flatten_metrics(json.load(file))
+
+
+def flatten_metrics(report: dict) -> dict:
+    """
+    결과의 지표 (run_suite 결과면 "벤치마크.지표" 이름으로 합침)
+    """
+    if "reports" not in report:
+        return report["metrics"]
+    return {
+        f"{name}.{metric_name}": value
+        for name, sub_report in report["reports"].items()
+        for metric_name, value in sub_report["metrics"].items()
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[dict]:
+    """
+    기준 대비 tolerance(비율) 이상 나빠진 지표
+
+    :return: [{"metric", "baseline", "current", "change"}] (change: 좋아지면 +, 나빠지면 -)
+    """
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if before is None or not before["value"]:
+            continue
+        change = (now["value"] - before["value"]) / before["value"]
+        if now["better"] == "lower":
+            change = -change
+        if change < -tolerance:
+            regressions.append({
+                "metric": name,
+                "baseline": before["value"],
+                "current": now["value"],
+                "change": round(change, 4),
+            })
+    return regressions
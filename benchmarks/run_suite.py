@@ -0,0 +1,79 @@
+# benchmarks/run_suite.py
+# python -m benchmarks.run_suite --output bench.json
+# python -m benchmarks.run_suite --output bench.json --baseline bench-main.json --tolerance 0.15
+#
+# 마이크로 + end-to-end + HTML 저장 방식 벤치마크를 각각 별도 프로세스로 실행해서 결과를 하나의 JSON으로 합침
+# --baseline 지정 시 tolerance 이상 나빠진 지표가 있으면 종료 코드 1
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.results import compare, flatten_metrics, load_metrics, write_report
+
+# 스위트 구성: 이름 → (모듈, 인자)
+SUITES = {
+    "micro": ("benchmarks.bench_micro", []),
+    "e2e": ("benchmarks.bench_e2e", ["--symbols", "200", "--messages", "400", "--latency-ms", "10"]),
+    "e2e_paced": ("benchmarks.bench_e2e", ["--symbols", "200", "--messages", "200", "--rate", "20", "--latency-ms", "10"]),
+    "html_storage": ("benchmarks.bench_html_storage", []),
+}
+
+
+def run_suite(name: str, workdir: str) -> dict:
+    module, suite_args = SUITES[name]
+    path = os.path.join(workdir, f"{name}.json")
+    command = [sys.executable, "-m", module, *suite_args, "--json", path]
+    # 진행 출력은 stderr (--output - 이면 stdout에는 결과 JSON만)
+    print(f"[▶️ {name}] {' '.join(command[2:])}", file=sys.stderr, flush=True)
+    completed = subprocess.run(command, stdout=sys.stderr)
+    if completed.returncode != 0 or not os.path.exists(path):
+        raise RuntimeError(f"{name} 실패 (종료 코드 {completed.returncode})")
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 스위트 실행 / 기준 결과와 비교")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"쉼표 구분 ({', '.join(SUITES)})")
+    parser.add_argument("--output", default="-", help="합친 결과 JSON 경로 (- 이면 stdout)")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON (run_suite 또는 개별 벤치마크 결과)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="허용하는 성능 저하 비율")
+    parser.add_argument("--compare-only", default=None, help="실행하지 않고 이 결과 파일을 baseline과 비교")
+    args = parser.parse_args()
+
+    if args.compare_only:
+        current = load_metrics(args.compare_only)
+    else:
+        reports = {}
+        with tempfile.TemporaryDirectory(prefix="bench-suite-") as workdir:
+            for name in args.suites.split(","):
+                reports[name] = run_suite(name.strip(), workdir)
+        report = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "reports": reports}
+        write_report(report, args.output)
+        if args.output != "-":
+            print(f"[💾 저장] {args.output}", file=sys.stderr)
+        current = flatten_metrics(report)
+
+    if not args.baseline:
+        return 0
+
+    regressions = compare(load_metrics(args.baseline), current, args.tolerance)
+    if not regressions:
+        print(f"[✅ 회귀 없음] 기준 대비 {args.tolerance:.0%} 이상 나빠진 지표 없음")
+        return 0
+    print(f"[❌ 성능 회귀] {len(regressions)}개 지표")
+    for regression in regressions:
+        print(
+            f"  {regression['metric']:<40} {regression['baseline']:>14.4f} → {regression['current']:>14.4f} "
+            f"({regression['change']:+.1%})"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
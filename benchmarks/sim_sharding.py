@@ -0,0 +1,238 @@
+# benchmarks/sim_sharding.py
+# python -m benchmarks.sim_sharding --instances 3 --partitions 6
+#
+# 한 프로세스 안에서 크롤러 인스턴스 여러 개를 가짜 브로커 + 로컬 SQLite DB로 실행
+# - 인스턴스마다 consumer / 분류기 / 심볼 스케줄러 / 라우터 / 배치 저장 스레드를 따로 가짐
+# - 실행 도중 인스턴스 추가 / 종료 → 파티션 재분배
+# - 확인: 모든 메시지 커밋, 담당하지 않는 심볼 수집 건수, DB 중복 행 없음 (실패하면 exit 1)
+# - 가짜 브로커 / consumer: tests/fakes.py (tests/test_sharding.py도 같은 시뮬레이션 사용)
+
+import argparse
+import contextlib
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from queue import Queue
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.crawler.content_writer import BatchedContentWriter, ContentRecord, SAVED
+from app.kafka.kafka_simple_consumer import KafkaSimpleConsumer
+from app.kafka.symbol_sharding import ShardOwnership, partition_for
+from app.models.base import Base
+from app.models.content import Content
+from app.models.content_url import ContentUrl
+from app.queue.priority_scheduler import PriorityScheduler
+from app.queue.symbol_coalescer import SymbolCoalescer
+from app.queue.symbol_to_url_router import SymbolToUrlQueueRouter
+from app.ranking.symbol_priority_classifier import SymbolPriorityClassifier
+from tests.fakes import FakeBroker, FakeConsumer
+
+
+class SimRouter(SymbolToUrlQueueRouter):
+    """BFS / 다운로드 대신 심볼마다 고정된 기사 N개를 바로 저장"""
+
+    def __init__(self, instance: "Instance", articles: int, crawl_seconds: float, **kwargs):
+        super().__init__(**kwargs)
+        self.instance = instance
+        self.articles = articles
+        self.crawl_seconds = crawl_seconds
+
+    def _route_urls(self, priority: str, url_queue, symbol: str, trace=None, completion_id=None) -> bool:
+        owned = partition_for(symbol, self.instance.num_partitions) in self.instance.ownership.owned()
+        self.instance.crawls.append((symbol, owned))
+        time.sleep(self.crawl_seconds)
+
+        futures = []
+        for i in range(self.articles):
+            url = f"https://news.example.com/{symbol}/{i}"
+            futures.append(self.instance.writer.submit(ContentRecord(
+                symbol=symbol,
+                url=url,
+                title=f"{symbol} 기사 {i}",
+                summary="요약",
+                html="<html></html>",
+                source="news.example.com",
+                content_hash=hashlib.sha256(url.encode("utf-8")).hexdigest(),
+            )))
+        saved = sum(future.result() == SAVED for future in futures)
+        with self.instance.lock:
+            self.instance.saved += saved
+        return True
+
+
+class Instance:
+    """app.main 하나에 해당하는 파이프라인 (Kafka consumer → 분류기 → 라우터 → 저장)"""
+
+    def __init__(self, name: str, broker: FakeBroker, session_factory, args):
+        self.name = name
+        self.num_partitions = broker.num_partitions
+        self.crawls: list[tuple[str, bool]] = []
+        self.saved = 0
+        self.lock = threading.Lock()
+
+        self.coalescer = SymbolCoalescer(ttl=args.ttl)
+        self.scheduler = PriorityScheduler(maxsize=10)
+        self.classifier = SymbolPriorityClassifier(
+            self.scheduler.tier("TOP"), self.scheduler.tier("MID"), self.scheduler.tier("BOT"),
+            use_threadsafe_queue=True,
+            coalescer=self.coalescer,
+        )
+        self.ownership = ShardOwnership(self.classifier, self.scheduler, self.coalescer)
+        self.writer = BatchedContentWriter(session_factory, flush_interval=0.05)
+        self.routers = [
+            SimRouter(
+                self, args.articles, args.crawl_ms / 1000,
+                symbol_queue_top=None, symbol_queue_mid=None, symbol_queue_bot=None,
+                url_queue_top=Queue(), url_queue_mid=Queue(), url_queue_bot=Queue(),
+                use_threadsafe_queue=True,
+                symbol_scheduler=self.scheduler,
+                coalescer=self.coalescer,
+            )
+            for _ in range(args.routers)
+        ]
+        self.consumer = KafkaSimpleConsumer(
+            self.classifier,
+            consumer_factory=lambda: FakeConsumer(broker, name),
+            ownership=self.ownership,
+        )
+        self.consumer.name = f"{name}-consumer"
+
+    def start(self):
+        self.classifier.start()
+        for router in self.routers:
+            threading.Thread(target=router.start, daemon=True).start()
+        self.consumer.start()
+
+    def stop(self):
+        self.consumer.stop()
+        self.consumer.join()
+        self.classifier.stop()
+
+
+def produce_waves(broker: FakeBroker, symbols: list[str], waves: int, interval: float):
+    for wave in range(waves):
+        for index, symbol in enumerate(symbols):
+            broker.produce(symbol, (index * 37 + wave) % 100)
+        time.sleep(interval)
+
+
+def wait_until_committed(broker: FakeBroker, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with broker.lock:
+            if all(broker.committed[p] == len(broker.logs[p]) for p in range(broker.num_partitions)):
+                return True
+        time.sleep(0.05)
+    return False
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="여러 크롤러 인스턴스 샤딩 / 리밸런스 시뮬레이션")
+    parser.add_argument("--instances", type=int, default=3)
+    parser.add_argument("--partitions", type=int, default=6)
+    parser.add_argument("--symbols", type=int, default=120)
+    parser.add_argument("--waves", type=int, default=6)
+    parser.add_argument("--wave-interval", type=float, default=0.5)
+    parser.add_argument("--articles", type=int, default=5, help="심볼당 기사 수")
+    parser.add_argument("--routers", type=int, default=4, help="인스턴스당 라우터 스레드 수")
+    parser.add_argument("--crawl-ms", type=float, default=5)
+    parser.add_argument("--ttl", type=float, default=60, help="최근 수집 심볼 건너뛰기 시간 (초)")
+    return parser.parse_args(argv)
+
+
+def simulate(args) -> dict:
+    """
+    인스턴스 args.instances개 실행 → 1개 추가 → 첫 번째 종료 후 결과 집계
+
+    :return: {"all_committed", "contents", "distinct_hashes", "content_urls", "crawled_symbols",
+              "expected_contents", "not_owned", "instances", "elapsed"}
+    """
+    db_path = os.path.join(tempfile.mkdtemp(prefix="sim-sharding-"), "contents.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"timeout": 30, "check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    broker = FakeBroker(args.partitions)
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    instances = [Instance(f"crawler-{i}", broker, session_factory, args) for i in range(args.instances + 1)]
+
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for instance in instances[:-1]:
+            instance.start()
+        producer = threading.Thread(target=produce_waves, args=(broker, symbols, args.waves, args.wave_interval))
+        producer.start()
+
+        # 실행 중 인스턴스 추가 → 첫 번째 인스턴스 종료
+        time.sleep(args.wave_interval * args.waves / 3)
+        instances[-1].start()
+        time.sleep(args.wave_interval * args.waves / 3)
+        instances[0].stop()
+
+        producer.join()
+        all_committed = wait_until_committed(broker, timeout=30)
+        for instance in instances:
+            instance.writer.stop()
+    elapsed = time.perf_counter() - started
+
+    with session_factory() as session:
+        contents = session.scalar(select(func.count()).select_from(Content))
+        distinct_hashes = session.scalar(select(func.count(func.distinct(Content.content_hash))))
+        content_urls = session.scalar(select(func.count()).select_from(ContentUrl))
+        crawled_symbols = session.scalar(select(func.count(func.distinct(Content.symbol))))
+    engine.dispose()
+
+    return {
+        "all_committed": all_committed,
+        "contents": contents,
+        "distinct_hashes": distinct_hashes,
+        "content_urls": content_urls,
+        "crawled_symbols": crawled_symbols,
+        "expected_contents": args.symbols * args.articles,
+        "not_owned": sum(not owned for instance in instances for _, owned in instance.crawls),
+        "instances": instances,
+        "elapsed": elapsed,
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    result = simulate(args)
+    instances = result["instances"]
+
+    print(f"인스턴스 {args.instances} (+1 추가, 1 종료), 파티션 {args.partitions}, "
+          f"메시지 {args.symbols * args.waves}건, {result['elapsed']:.1f}s")
+    for instance in instances:
+        not_owned = sum(not owned for _, owned in instance.crawls)
+        stats = instance.ownership.stats()
+        print(f"  {instance.name:<10} 수집 {len(instance.crawls):4}  담당 외 {not_owned:3}  "
+              f"저장 {instance.saved:4}  리밸런스 {stats['rebalances']:2}  "
+              f"재분배로 제거 {stats['dropped_on_rebalance']:3}")
+
+    crawled_by = {}
+    for instance in instances:
+        for symbol, _ in instance.crawls:
+            crawled_by.setdefault(symbol, set()).add(instance.name)
+    moved = Counter(len(names) for names in crawled_by.values())
+    print(f"  심볼별 수집 인스턴스 수: {dict(sorted(moved.items()))} (리밸런스로 담당이 바뀐 심볼만 2 이상)")
+    print(f"  모든 offset 커밋: {result['all_committed']}")
+    print(f"  contents {result['contents']}행 / 고유 content_hash {result['distinct_hashes']} / "
+          f"content_urls {result['content_urls']}행 / 기대값 {result['expected_contents']} "
+          f"(심볼 {result['crawled_symbols']}/{args.symbols})")
+
+    ok = (
+        result["all_committed"]
+        and result["not_owned"] == 0
+        and result["contents"] == result["distinct_hashes"] == result["expected_contents"]
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# tests/fakes.py
+#
+# 테스트 / 벤치마크용 가짜 Kafka 브로커 / consumer (KafkaSimpleConsumer는 그대로 사용)
+
+import json
+import threading
+import time
+from collections import namedtuple
+
+from kafka.structs import TopicPartition
+
+from app.kafka.kafka_simple_consumer import KAFKA_TOPIC
+from app.kafka.symbol_sharding import partition_for
+
+FakeRecord = namedtuple("FakeRecord", ["offset", "value"])
+
+
+class FakeBroker:
+    """
+    파티션 로그 + 그룹 offset + eager 리밸런스
+    - 멤버가 들어오거나 나가면 세대 증가 → 모든 멤버가 회수(커밋)를 마친 뒤에 새 할당 (range 방식)
+    """
+
+    def __init__(self, num_partitions: int):
+        self.num_partitions = num_partitions
+        self.logs = [[] for _ in range(num_partitions)]
+        self.committed = [0] * num_partitions
+        self.members: list[str] = []
+        self.generation = 0
+        self._revoked: set[str] = set()
+        self._assignment: dict[str, set[int]] = {}
+        self.lock = threading.Lock()
+
+    def produce(self, symbol: str, score: int, created_at: str = None):
+        partition = partition_for(symbol, self.num_partitions)
+        message = {"symbol": symbol, "score": score}
+        if created_at is not None:
+            message["createdAt"] = created_at
+        value = json.dumps(message).encode("utf-8")
+        with self.lock:
+            self.logs[partition].append(value)
+
+    def join(self, member: str):
+        with self.lock:
+            self.members.append(member)
+            self._next_generation()
+
+    def leave(self, member: str):
+        with self.lock:
+            if member in self.members:
+                self.members.remove(member)
+                self._next_generation()
+
+    def mark_revoked(self, member: str, generation: int):
+        with self.lock:
+            if generation == self.generation:
+                self._revoked.add(member)
+
+    def assignment_for(self, member: str, generation: int):
+        """모든 멤버가 회수를 마쳤으면 할당 파티션, 아니면 None"""
+        with self.lock:
+            if generation != self.generation or not set(self.members) <= self._revoked:
+                return None
+            if not self._assignment:
+                members = sorted(self.members)
+                for index, name in enumerate(members):
+                    self._assignment[name] = {
+                        p for p in range(self.num_partitions) if p % len(members) == index
+                    }
+            return self._assignment.get(member, set())
+
+    def _next_generation(self):
+        self.generation += 1
+        self._revoked = set()
+        self._assignment = {}
+
+
+class FakeConsumer:
+    """KafkaSimpleConsumer가 사용하는 KafkaConsumer 메서드만 구현"""
+
+    def __init__(self, broker: FakeBroker, member: str):
+        self.broker = broker
+        self.member = member
+        self.listener = None
+        self.generation = 0
+        self._assignment: set[int] = set()
+        self._paused: set[int] = set()
+        self._positions: dict[int, int] = {}
+
+    def subscribe(self, topics, listener=None):
+        self.listener = listener
+        self.broker.join(self.member)
+
+    def partitions_for_topic(self, topic):
+        return set(range(self.broker.num_partitions))
+
+    def assignment(self):
+        return {TopicPartition(KAFKA_TOPIC, p) for p in self._assignment or ()}
+
+    def paused(self):
+        return {TopicPartition(KAFKA_TOPIC, p) for p in self._paused}
+
+    def pause(self, *partitions):
+        self._paused.update(tp.partition for tp in partitions)
+
+    def resume(self, *partitions):
+        self._paused.difference_update(tp.partition for tp in partitions)
+
+    def seek(self, partition, offset: int):
+        self._positions[partition.partition] = offset
+
+    def commit(self, offsets):
+        with self.broker.lock:
+            for tp, meta in offsets.items():
+                self.broker.committed[tp.partition] = meta.offset
+
+    def close(self):
+        self.broker.leave(self.member)
+
+    def poll(self, timeout_ms: int = 0, max_records: int = 500):
+        if not self._rebalance():
+            time.sleep(0.01)
+            return {}
+
+        records = {}
+        with self.broker.lock:
+            for p in sorted(self._assignment - self._paused):
+                if max_records <= 0:
+                    break
+                log = self.broker.logs[p]
+                position = self._positions[p]
+                batch = [FakeRecord(offset, log[offset]) for offset in range(position, min(len(log), position + max_records))]
+                if batch:
+                    records[TopicPartition(KAFKA_TOPIC, p)] = batch
+                    self._positions[p] = position + len(batch)
+                    max_records -= len(batch)
+        if not records:
+            time.sleep(min(timeout_ms, 10) / 1000)
+        return records
+
+    def _rebalance(self) -> bool:
+        generation = self.broker.generation
+        if generation == self.generation:
+            return True
+
+        if self._assignment is not None:
+            self.listener.on_partitions_revoked(self.assignment())
+            self._assignment = None
+        # 회수 중에 세대가 다시 바뀔 수 있으므로 매번 현재 세대에 참여 표시
+        self.broker.mark_revoked(self.member, generation)
+
+        assignment = self.broker.assignment_for(self.member, generation)
+        if assignment is None:
+            return False
+        self.generation = generation
+        self._assignment = assignment
+        self._paused &= assignment
+        with self.broker.lock:
+            self._positions = {p: self.broker.committed[p] for p in assignment}
+        self.listener.on_partitions_assigned(self.assignment())
+        return True
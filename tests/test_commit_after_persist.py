@@ -0,0 +1,138 @@
+# tests/test_commit_after_persist.py
+# PYTHONPATH=. python -m pytest -q tests
+#
+# 가짜 브로커로 KafkaSimpleConsumer → 분류기 → 라우터 → 워커를 실행하고
+# 저장 결과(Future)가 나오기 전에 종료(장애)했을 때 커밋되는 offset 확인
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import threading
+import time
+from concurrent.futures import Future
+
+from app.crawler.content_writer import DUPLICATE, FAILED, SAVED
+from app.kafka.kafka_simple_consumer import KafkaSimpleConsumer
+from app.queue import symbol_to_url_router
+from app.queue.priority_scheduler import PriorityScheduler
+from app.queue.symbol_completion import symbol_completion
+from app.queue.symbol_to_url_router import SymbolToUrlQueueRouter
+from app.ranking.symbol_priority_classifier import SymbolPriorityClassifier
+from app.worker import content_worker
+from app.worker.content_worker import ContentWorker
+from tests.fakes import FakeBroker, FakeConsumer
+
+URLS_PER_SYMBOL = 2
+
+
+def wait_for(condition, timeout: float = 10) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class Pipeline:
+    """consumer / 분류기 / 라우터 / 워커 (다운로드와 DB 저장은 테스트가 Future로 대신함)"""
+
+    def __init__(self, broker: FakeBroker, name: str, futures: dict):
+        self.symbol_scheduler = PriorityScheduler()
+        self.url_scheduler = PriorityScheduler()
+        self.classifier = SymbolPriorityClassifier(
+            self.symbol_scheduler.tier("TOP"), self.symbol_scheduler.tier("MID"), self.symbol_scheduler.tier("BOT"),
+            use_threadsafe_queue=True,
+        )
+        self.router = SymbolToUrlQueueRouter(
+            symbol_queue_top=None, symbol_queue_mid=None, symbol_queue_bot=None,
+            url_queue_top=self.url_scheduler.tier("TOP"),
+            url_queue_mid=self.url_scheduler.tier("MID"),
+            url_queue_bot=self.url_scheduler.tier("BOT"),
+            use_threadsafe_queue=True,
+            symbol_scheduler=self.symbol_scheduler,
+        )
+        self.worker = ContentWorker(self.url_scheduler, None, use_threadsafe_queue=True)
+        self.consumer = KafkaSimpleConsumer(self.classifier, consumer_factory=lambda: FakeConsumer(broker, name))
+        self.futures = futures
+
+    def start(self):
+        self.classifier.start()
+        threading.Thread(target=self.router.start, daemon=True).start()
+        self.worker.start()
+        self.consumer.start()
+
+    def crash(self):
+        """consumer 종료 (종료 시 마지막 커밋) 후 나머지 스레드 중지"""
+        self.consumer.stop()
+        self.consumer.join(timeout=10)
+        self.worker.stop()
+        self.classifier.stop()
+
+
+def fake_pipeline(monkeypatch, broker: FakeBroker, name: str) -> Pipeline:
+    futures: dict[str, Future] = {}
+
+    def fake_bfs(symbol: str) -> list[dict]:
+        return [
+            {"symbol": symbol, "title": f"{symbol} {i}", "summary": "", "url": f"https://news.example.com/{symbol}/{i}"}
+            for i in range(URLS_PER_SYMBOL)
+        ]
+
+    def fake_download(symbol, url, title, summary, content_hash, trace=None) -> Future:
+        future = futures[url] = Future()
+        return future
+
+    monkeypatch.setattr(symbol_to_url_router, "bfs_extract_urls", fake_bfs)
+    monkeypatch.setattr(content_worker, "download_and_process", fake_download)
+    # 스풀이 없으면 재시도 횟수를 넘겨도 계속 재시도하는지 확인 (재시도 간격은 짧게)
+    monkeypatch.setattr(content_worker, "MAX_URL_RETRIES", 0)
+    monkeypatch.setattr(content_worker, "URL_RETRY_DELAY", 0.2)
+    return Pipeline(broker, name, futures)
+
+
+def test_offsets_commit_only_after_every_url_is_stored(monkeypatch):
+    broker = FakeBroker(1)
+    for symbol in ("AAA", "BBB", "CCC"):
+        broker.produce(symbol, 50)
+
+    pipeline = fake_pipeline(monkeypatch, broker, "crawler-0")
+    pipeline.start()
+    futures = pipeline.futures
+    assert wait_for(lambda: len(futures) == 3 * URLS_PER_SYMBOL)
+
+    # 라우터가 URL을 모두 넘겼어도 저장 결과가 없으면 커밋하지 않음
+    time.sleep(1.5)
+    assert broker.committed[0] == 0
+
+    futures["https://news.example.com/AAA/0"].set_result(SAVED)
+    futures["https://news.example.com/AAA/1"].set_result(DUPLICATE)
+    futures["https://news.example.com/BBB/0"].set_result(SAVED)  # BBB/1은 저장 중에 장애
+    futures["https://news.example.com/CCC/0"].set_result(SAVED)
+    futures["https://news.example.com/CCC/1"].set_result(SAVED)
+    assert wait_for(lambda: broker.committed[0] == 1)
+    assert symbol_completion.pending() >= 1
+
+    pipeline.crash()
+    assert broker.committed[0] == 1
+
+    # 재시작하면 저장을 마치지 못한 BBB부터 다시 수신
+    restarted = fake_pipeline(monkeypatch, broker, "crawler-1")
+    restarted.start()
+    assert wait_for(lambda: len(restarted.futures) == 2 * URLS_PER_SYMBOL)
+    assert {url.split("/")[-2] for url in restarted.futures} == {"BBB", "CCC"}
+
+    # 스풀 없이 저장에 실패한 URL은 재시도 횟수를 넘겨도 offset을 진행하지 않고 다시 저장 시도
+    failed_url = "https://news.example.com/BBB/1"
+    failed = restarted.futures[failed_url]
+    for url, future in list(restarted.futures.items()):
+        future.set_result(FAILED if url == failed_url else SAVED)
+    assert wait_for(lambda: restarted.futures[failed_url] is not failed)
+    time.sleep(1.5)
+    assert broker.committed[0] == 1
+
+    # 재시도가 저장되면 나머지 offset까지 커밋
+    restarted.futures[failed_url].set_result(SAVED)
+    assert wait_for(lambda: broker.committed[0] == 3)
+    restarted.crash()
@@ -0,0 +1,25 @@
+# tests/test_sharding.py
+# PYTHONPATH=. python -m pytest -q tests
+#
+# 크롤러 인스턴스 여러 개를 가짜 브로커 + 로컬 SQLite DB로 실행 (benchmarks.sim_sharding과 같은 시뮬레이션)
+# - 실행 중 인스턴스 추가 / 종료로 리밸런스가 일어나도 모든 offset 커밋, 중복 행 없음, 담당 외 파티션 수집 없음
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from benchmarks.sim_sharding import parse_args, simulate
+
+
+def test_instances_share_partitions_without_duplicates():
+    args = parse_args([
+        "--instances", "2", "--partitions", "4", "--symbols", "40",
+        "--waves", "3", "--wave-interval", "0.3", "--articles", "3", "--routers", "2",
+    ])
+    result = simulate(args)
+
+    assert result["all_committed"]
+    assert result["contents"] == result["distinct_hashes"] == args.symbols * args.articles
+    assert result["content_urls"] == args.symbols * args.articles
+    assert result["crawled_symbols"] == args.symbols
+    assert result["not_owned"] == 0